@@ -0,0 +1,89 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Microbenchmark of IpDictView.view on a design with a block design
+container (BDC) holding hundreds of cores. Flattening the BDC asks every
+port of every core inside it for its destinations, so this exercises the
+cached Port.destinations().
+
+    python benchmarks/ip_dict_view_bench.py --bdc-cores 400
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_bdc_hwh, synthetic_hwh
+
+from pynqmetadata import Module, Port
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+from pynqmetadata.views.runtime import IpDictView
+
+
+def build_design(n_ip: int, n_bdc_cores: int) -> Module:
+    """Parses a synthetic design and merges in the content of its BDC"""
+    md = HwhFrontend(_hwhfile=synthetic_hwh(n_ip=n_ip, bdc=True))
+    for b in md.blocks.values():
+        if isinstance(b, Module) and "bdc" in b.ext:
+            bdc_md = HwhFrontend(_hwhfile=synthetic_bdc_hwh(n_ip=n_bdc_cores))
+            mod = JsonFrontend(bdc_md.json().replace(bdc_md.name, b.name))
+            mod.hierarchy_name = b.hierarchy_name
+            b.merge(
+                mod,
+                skip_external=True,
+                inherit_signal_width=True,
+                inherit_addr_info=True,
+            )
+            b.refresh()
+    return md
+
+
+def all_ports(md: Module) -> List[Port]:
+    ports = list(md.ports.values())
+    for b in md.blocks.values():
+        ports.extend(b.ports.values())
+        if isinstance(b, Module):
+            ports.extend(all_ports(b))
+    return ports
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=16, help="cores in the top level")
+    parser.add_argument("--bdc-cores", type=int, default=400, help="cores in the BDC")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    md = build_design(args.cores, args.bdc_cores)
+    ports = all_ports(md)
+    view = IpDictView(md)
+
+    def uncached() -> None:
+        for p in ports:
+            p._invalidate_destinations()
+        view.view
+
+    t_uncached = best_of(uncached, args.repeat)
+    t_cached = best_of(lambda: view.view, args.repeat)
+    print(f"{args.bdc_cores} BDC cores, {len(ports)} ports, {len(view.view)} IP")
+    print(f"IpDictView.view destinations recomputed : {t_uncached * 1e3:8.2f} ms")
+    print(f"IpDictView.view destinations cached     : {t_cached * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
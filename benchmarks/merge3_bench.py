@@ -0,0 +1,86 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of refreshing a design after a small change to the hardware with
+Module.merge3(). Ours is the design as loaded and annotated, base the
+design it was loaded from and theirs a new version of it in which one core
+has a changed parameter and another one has been added. Times the three-way
+merge, and a diff of base against theirs for comparison.
+
+    python benchmarks/merge3_bench.py --cores 10000
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_hwh
+
+from pynqmetadata import Core, Module, Parameter
+from pynqmetadata.frontends import HwhFrontend
+
+
+def versions(cores: int) -> Tuple[Module, Module, Module]:
+    """Ours, base and theirs, see the module docstring"""
+    base = HwhFrontend(_hwhfile=synthetic_hwh(n_ip=cores, n_hier=4))
+    data = pickle.dumps(base)
+    ours, theirs = pickle.loads(data), pickle.loads(data)
+    for block in list(ours.blocks.values())[::10]:
+        block.ext["annotation"] = {"owner": "me"}
+    block = list(theirs.blocks.values())[cores // 2]
+    name = next(iter(block.parameters))
+    block.parameters[name].value = "changed"
+    new = Core(name="new_core", vlnv=block.vlnv)
+    new.add(Parameter(name="WIDTH", value="32"))
+    theirs.add(new)
+    return ours, base, theirs
+
+
+def best_of(
+    make: Callable[[], Tuple[Module, Module, Module]],
+    run: Callable[[Module, Module, Module], object],
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        ours, base, theirs = make()
+        start = time.perf_counter()
+        run(ours, base, theirs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = pickle.dumps(versions(args.cores))
+    make = lambda: pickle.loads(data)
+
+    ours, base, theirs = make()
+    ours.merge3(base, theirs)
+    assert "new_core" in ours.blocks
+    annotated = sum("annotation" in b.ext for b in ours.blocks.values())
+    assert len(ours.diff(make()[2]).changed) == annotated
+
+    results: List[Tuple[str, float]] = []
+    for name, run in [
+        ("merge3", lambda o, b, t: o.merge3(b, t)),
+        ("diff base theirs", lambda o, b, t: b.diff(t)),
+    ]:
+        results.append((name, best_of(make, run, args.repeat)))
+    for name, t in results:
+        print(f"{name:>24} : {t * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
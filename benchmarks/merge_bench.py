@@ -0,0 +1,96 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of merging a block design container (BDC) into its parent, as
+done when loading a design with BDCs. Times the first merge of the BDC
+into the empty container of the parent, then merging the same BDC again
+into the merged design, where every block is the same on both sides and
+is skipped by comparing content hashes, and merging a copy of the whole
+merged design into itself.
+Finally merges a BDC whose signal widths all changed, collecting every
+conflict instead of stopping at the first one.
+
+    python benchmarks/merge_bench.py --cores 1000
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_bdc_hwh, synthetic_hwh
+
+from pynqmetadata import Module
+from pynqmetadata.errors import MergeConflict
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+
+MERGE_OPTIONS = dict(
+    skip_external=True, inherit_signal_width=True, inherit_addr_info=True
+)
+
+
+def parent_and_bdc(cores: int) -> Tuple[Module, Module]:
+    """The parent design and its BDC, renamed to the container of the parent"""
+    parent = HwhFrontend(_hwhfile=synthetic_hwh(n_ip=8, bdc=True))
+    container = parent.blocks["bdc_0"]
+    bdc = HwhFrontend(_hwhfile=synthetic_bdc_hwh(n_ip=cores))
+    bdc = JsonFrontend(bdc.json().replace(bdc.name, container.name))
+    bdc.hierarchy_name = container.hierarchy_name
+    return parent, bdc
+
+
+def time_merges(
+    make: Callable[[], Tuple[Module, Module]], repeat: int
+) -> Tuple[float, Module]:
+    """Best time of merging the BDC into the container of the parent"""
+    best = float("inf")
+    for _ in range(repeat):
+        parent, bdc = make()
+        container = parent.blocks["bdc_0"]
+        start = time.perf_counter()
+        container.merge(bdc, **MERGE_OPTIONS)
+        best = min(best, time.perf_counter() - start)
+    return best, parent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=1000, help="cores in the BDC")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    parent, bdc = parent_and_bdc(args.cores)
+    empty = pickle.dumps((parent, bdc))
+    t_first, merged = time_merges(lambda: pickle.loads(empty), args.repeat)
+    merged.blocks["bdc_0"].refresh()
+    remerge = pickle.dumps((merged, bdc))
+    bdc_copy = merged.blocks["bdc_0"].copy()
+    bdc_copy._parent = None
+    itself = pickle.dumps((merged, bdc_copy))
+
+    results: List[Tuple[str, float]] = [("first merge", t_first)]
+    for name, data in [("re-merge", remerge), ("merge into itself", itself)]:
+        t, remerged = time_merges(lambda: pickle.loads(data), args.repeat)
+        assert remerged.json() == merged.json()
+        results.append((name, t))
+    for name, t in results:
+        print(f"{name:>28} : {t * 1e3:8.1f} ms")
+
+    # Every signal width of the BDC differs from the merged design
+    changed = JsonFrontend(bdc.json().replace('"width": 1,', '"width": 2,'))
+    parent, changed = pickle.loads(pickle.dumps((merged, changed)))
+    try:
+        parent.blocks["bdc_0"].merge(changed, collect_conflicts=True)
+    except MergeConflict as e:
+        print(f"{'collected conflicts':>28} : {len(e.errors)}")
+        print(f"{'first':>28} : {e.errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of loading several block design containers (BDCs) into a design
+with Module.merge_blocks(). Each BDC is parsed from its HWH and merged
+into its container block. Times doing this one BDC at a time, then with
+merge_blocks() parsing on a thread pool and on a process pool.
+
+    python benchmarks/merge_blocks_bench.py --bdcs 4 --cores 300
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_bdc_hwh
+
+from pynqmetadata import Module
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+
+MERGE_OPTIONS = dict(
+    skip_external=True, inherit_signal_width=True, inherit_addr_info=True
+)
+
+
+def load_bdc(hwh: str, name: str) -> Module:
+    """Parses a BDC, renamed to its container block"""
+    bdc = HwhFrontend(_hwhfile=hwh)
+    return JsonFrontend(bdc.json().replace(bdc.name, name))
+
+
+def design(bdcs: int) -> Module:
+    """A design with bdcs empty container blocks"""
+    md = Module(name="top")
+    for i in range(bdcs):
+        md.add(Module(name=f"bdc_{i}"))
+    md.refresh()
+    return md
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bdcs", type=int, default=4)
+    parser.add_argument("--cores", type=int, default=300, help="cores in each BDC")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    hwhs: Dict[str, str] = {}
+    for i in range(args.bdcs):
+        path = os.path.join(tmp, f"bdc_{i}.hwh")
+        with open(path, "w") as f:
+            f.write(synthetic_bdc_hwh(name=f"bdc_design_{i}", n_ip=args.cores))
+        hwhs[f"bdc_{i}"] = path
+    empty = pickle.dumps(design(args.bdcs))
+
+    md = pickle.loads(empty)
+    start = time.perf_counter()
+    for name, hwh in hwhs.items():
+        md.blocks[name].merge(load_bdc(hwh, name), **MERGE_OPTIONS)
+        md.blocks[name].refresh()
+    results = [("one at a time", time.perf_counter() - start)]
+    expected = md.json()
+
+    for label, processes in [("threads", False), ("processes", True)]:
+        md = pickle.loads(empty)
+        start = time.perf_counter()
+        md.merge_blocks(
+            {n: partial(load_bdc, h, n) for n, h in hwhs.items()},
+            processes=processes,
+            **MERGE_OPTIONS,
+        )
+        results.append((f"merge_blocks, {label}", time.perf_counter() - start))
+        assert md.json() == expected
+    for name, t in results:
+        print(f"{name:>26} : {t * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of pickling a parsed design, comparing the flat table used by
+MetadataObject.__reduce_ex__ against the default recursive pickling of the
+object graph. Reports the pickle size, dump time and load time, then the
+length of a chain of connected cores each can pickle before running into
+the recursion limit.
+
+    python benchmarks/pickle_bench.py --cores 400
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_hwh
+
+from pynqmetadata import Core, MetadataObject, Module, Port, Signal, Vlnv
+from pynqmetadata.frontends import HwhFrontend
+
+
+def default_dumps(obj: object) -> bytes:
+    """Pickles obj as pickle does without MetadataObject.__reduce_ex__"""
+    reduce_ex = MetadataObject.__reduce_ex__
+    del MetadataObject.__reduce_ex__
+    try:
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    finally:
+        MetadataObject.__reduce_ex__ = reduce_ex
+
+
+def flat_dumps(obj: object) -> bytes:
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best = float("inf")
+    ret = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ret = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, ret
+
+
+def chain(n: int) -> Module:
+    """A module of n cores, each driving the next"""
+    vlnv = Vlnv.intern("c", "i", "p", (1, 0))
+    md = Module(name="chain")
+    for i in range(n):
+        c = Core(name=f"c{i}", vlnv=vlnv)
+        for name, driver in [("p_in", False), ("p_out", True)]:
+            p = Port(name=name)
+            p.add(Signal(name="data", width=8, driver=driver))
+            c.add(p)
+        md.add(c)
+    for i in range(n - 1):
+        src = md.blocks[f"c{i}"].ports["p_out"].signals["data"]
+        src.connect(md.blocks[f"c{i + 1}"].ports["p_in"].signals["data"])
+    md.refresh()
+    return md
+
+
+def longest_chain(dumps: Callable[[object], bytes], limit: int) -> int:
+    """The longest chain (in steps of 50 cores, up to limit) that can be pickled"""
+    ok = 0
+    for n in range(50, limit + 1, 50):
+        try:
+            pickle.loads(dumps(chain(n)))
+        except RecursionError:
+            break
+        ok = n
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=400, help="cores in the design")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chain", type=int, default=1000, help="longest chain tried")
+    args = parser.parse_args()
+
+    # The default pickling of a whole design recurses far deeper than the
+    # default limit allows, the chain lengths below use the default limit
+    limit = sys.getrecursionlimit()
+    md = HwhFrontend(_hwhfile=synthetic_hwh(n_ip=args.cores, n_hier=8))
+    for mode, dumps in [("default", default_dumps), ("flat", flat_dumps)]:
+        sys.setrecursionlimit(1000000)
+        t_dump, data = best_of(lambda: dumps(md), args.repeat)
+        t_load, loaded = best_of(lambda: pickle.loads(data), args.repeat)
+        assert loaded.json() == md.json()
+        sys.setrecursionlimit(limit)
+        longest = longest_chain(dumps, args.chain)
+        print(
+            f"{mode:>8} : {len(data) / 1e6:6.2f} MB, dump {t_dump * 1e3:7.1f} ms, "
+            f"load {t_load * 1e3:7.1f} ms, longest chain {longest} cores"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of creating the runtime dictionaries of a design with
+RuntimeMetadataParser, as done when an overlay is loaded. Reports the time
+to create the parser, the memory it allocates (traced with tracemalloc) and
+the time of a first full read of ip_dict and hierarchy_dict, which copies
+every value.
+
+    python benchmarks/runtime_parser_bench.py --cores 1000
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_hwh
+
+from pynqmetadata.frontends import HwhFrontend
+from pynqmetadata.views.runtime import RuntimeMetadataParser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    md = HwhFrontend(_hwhfile=synthetic_hwh(n_ip=args.cores, n_hier=8))
+    # The views assign drivers and interrupt indexes into the model the first time
+    RuntimeMetadataParser(md)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        rt = RuntimeMetadataParser(md)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    rt = RuntimeMetadataParser(md)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    copy.deepcopy(rt.ip_dict)
+    copy.deepcopy(rt.hierarchy_dict)
+    read = time.perf_counter() - start
+
+    print(f"{'ip_dict entries':>24} : {len(rt.ip_dict)}")
+    print(f"{'parser':>24} : {best * 1e3:8.1f} ms")
+    print(f"{'allocated':>24} : {allocated / 2**20:8.1f} MiB")
+    print(f"{'first full read':>24} : {read * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Generators for synthetic HWH files.
+
+The test HWHs are downloaded at install time, so the benchmarks build
+their own designs of an arbitrary size. The generated XML follows the
+layout that the HwhFrontend expects: a Zynq PS driving an AXI
+interconnect, a set of AXI-Lite IP cores (optionally grouped into
+hierarchies), an interrupt controller fed by a concat block, a GPIO
+slice, a BRAM controller and optionally a block design container (BDC).
+"""
+
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+AXI_SIGNALS: List[Tuple[str, str, int]] = [
+    # (logical name, direction from the manager side, width)
+    ("ARADDR", "O", 32),
+    ("ARVALID", "O", 1),
+    ("ARREADY", "I", 1),
+    ("RDATA", "I", 32),
+    ("RVALID", "I", 1),
+    ("AWADDR", "O", 32),
+    ("WDATA", "O", 32),
+    ("BVALID", "I", 1),
+]
+
+AXIS_SIGNALS: List[Tuple[str, str, int]] = [
+    ("TDATA", "O", 32),
+    ("TVALID", "O", 1),
+    ("TREADY", "I", 1),
+]
+
+
+def _flip(direction: str) -> str:
+    return "I" if direction == "O" else "O"
+
+
+class _HwhBuilder:
+    """Accumulates modules and their physical port connections"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.root = ET.Element("EDKSYSTEM")
+        sysinfo = ET.SubElement(self.root, "SYSTEMINFO")
+        sysinfo.set("NAME", name)
+        self.external_ports = ET.SubElement(self.root, "EXTERNALPORTS")
+        self.external_interfaces = ET.SubElement(self.root, "EXTERNALINTERFACES")
+        self.modules = ET.SubElement(self.root, "MODULES")
+        self._mods: Dict[str, ET.Element] = {}
+        self._ports: Dict[Tuple[str, str], ET.Element] = {}
+
+    def module(
+        self,
+        instance: str,
+        vlnv: str,
+        fullname: Optional[str] = None,
+        modtype: Optional[str] = None,
+        is_pl: bool = True,
+        params: Optional[Dict[str, str]] = None,
+        bdc: Optional[str] = None,
+    ) -> ET.Element:
+        m = ET.SubElement(self.modules, "MODULE")
+        m.set("INSTANCE", instance)
+        m.set("VLNV", vlnv)
+        m.set("FULLNAME", fullname if fullname is not None else f"/{instance}")
+        m.set("MODTYPE", modtype if modtype is not None else vlnv.split(":")[2])
+        m.set("IS_PL", "TRUE" if is_pl else "FALSE")
+        if bdc is not None:
+            m.set("BDTYPE", "BLOCK_CONTAINER")
+            m.set("BD", bdc)
+        p = ET.SubElement(m, "PARAMETERS")
+        for pname, pval in (params or {}).items():
+            e = ET.SubElement(p, "PARAMETER")
+            e.set("NAME", pname)
+            e.set("VALUE", pval)
+        ET.SubElement(m, "PORTS")
+        ET.SubElement(m, "BUSINTERFACES")
+        ET.SubElement(m, "MEMORYMAP")
+        ET.SubElement(m, "ADDRESSBLOCKS")
+        self._mods[instance] = m
+        return m
+
+    def port(
+        self,
+        instance: str,
+        name: str,
+        direction: str,
+        width: int = 1,
+        sigis: Optional[str] = None,
+    ) -> ET.Element:
+        p = ET.SubElement(self._mods[instance].find("PORTS"), "PORT")
+        p.set("NAME", name)
+        p.set("DIR", direction)
+        if width > 1:
+            p.set("LEFT", str(width - 1))
+            p.set("RIGHT", "0")
+        if sigis is not None:
+            p.set("SIGIS", sigis)
+        ET.SubElement(p, "CONNECTIONS")
+        self._ports[(instance, name)] = p
+        return p
+
+    def busif(
+        self,
+        instance: str,
+        name: str,
+        btype: str,
+        vlnv: str,
+        signals: List[Tuple[str, str, int]],
+        manager: bool,
+    ) -> None:
+        b = ET.SubElement(self._mods[instance].find("BUSINTERFACES"), "BUSINTERFACE")
+        b.set("NAME", name)
+        b.set("TYPE", btype)
+        b.set("VLNV", vlnv)
+        ET.SubElement(b, "PARAMETER").attrib.update({"NAME": "FREQ_HZ", "VALUE": "100000000"})
+        pms = ET.SubElement(b, "PORTMAPS")
+        for logical, direction, width in signals:
+            phys = f"{name}_{logical}"
+            self.port(instance, phys, direction if manager else _flip(direction), width)
+            pm = ET.SubElement(pms, "PORTMAP")
+            pm.set("LOGICAL", logical)
+            pm.set("PHYSICAL", phys)
+            if width > 1:
+                pm.set("LEFT", str(width - 1))
+                pm.set("RIGHT", "0")
+
+    def connect(self, a: Tuple[str, str], b: Tuple[str, str]) -> None:
+        """Connects two physical ports, both ends record the connection"""
+        for src, dst in ((a, b), (b, a)):
+            if src[0] == "External_Ports":
+                continue
+            cons = self._ports[src].find("CONNECTIONS")
+            c = ET.SubElement(cons, "CONNECTION")
+            c.set("INSTANCE", dst[0])
+            c.set("PORT", dst[1])
+
+    def connect_bus(self, a: Tuple[str, str], b: Tuple[str, str], signals) -> None:
+        for logical, _, _ in signals:
+            self.connect((a[0], f"{a[1]}_{logical}"), (b[0], f"{b[1]}_{logical}"))
+
+    def memrange(
+        self,
+        manager: Tuple[str, str],
+        target: Tuple[str, str],
+        base: int,
+        size: int,
+        memtype: str = "REGISTER",
+    ) -> None:
+        for owner in (manager[0], target[0]):
+            mr = ET.SubElement(self._mods[owner].find("MEMORYMAP"), "MEMRANGE")
+            mr.set("ADDRESSBLOCK", "Reg" if memtype == "REGISTER" else "Mem0")
+            mr.set("BASENAME", "C_BASEADDR")
+            mr.set("BASEVALUE", hex(base))
+            mr.set("HIGHNAME", "C_HIGHADDR")
+            mr.set("HIGHVALUE", hex(base + size - 1))
+            mr.set("INSTANCE", target[0])
+            mr.set("IS_DATA", "TRUE")
+            mr.set("IS_INSTRUCTION", "TRUE")
+            mr.set("MASTERBUSINTERFACE", manager[1])
+            mr.set("MEMTYPE", memtype)
+            mr.set("SLAVEBUSINTERFACE", target[1])
+
+    def registers(self, instance: str, interface: str, n_regs: int) -> None:
+        ab = ET.SubElement(self._mods[instance].find("ADDRESSBLOCKS"), "ADDRESSBLOCK")
+        ab.set("NAME", "Reg")
+        ab.set("INTERFACE", interface)
+        ab.set("USAGE", "register")
+        regs = ET.SubElement(ab, "REGISTERS")
+        for r in range(n_regs):
+            reg = ET.SubElement(regs, "REGISTER")
+            reg.set("NAME", f"REG_{r}")
+            props = ET.SubElement(reg, "PROPERTIES")
+            for pname, pval in (
+                ("DESCRIPTION", f"Register {r}"),
+                ("ADDRESS_OFFSET", hex(r * 4)),
+                ("SIZE", "32"),
+                ("ACCESS", "read-write"),
+                ("IS_ENABLED", "true"),
+            ):
+                ET.SubElement(props, "PROPERTY").attrib.update({"NAME": pname, "VALUE": pval})
+            fields = ET.SubElement(reg, "FIELDS")
+            f = ET.SubElement(fields, "FIELD")
+            f.set("NAME", f"FIELD_{r}")
+            fprops = ET.SubElement(f, "PROPERTIES")
+            for pname, pval in (
+                ("DESCRIPTION", "a field"),
+                ("BIT_OFFSET", "0"),
+                ("BIT_WIDTH", "8"),
+                ("ACCESS", "read-write"),
+            ):
+                ET.SubElement(fprops, "PROPERTY").attrib.update({"NAME": pname, "VALUE": pval})
+
+    def external_port(
+        self, name: str, direction: str, width: int = 1, sigis: Optional[str] = None
+    ) -> None:
+        p = ET.SubElement(self.external_ports, "PORT")
+        p.set("NAME", name)
+        p.set("DIR", direction)
+        if sigis is not None:
+            p.set("SIGIS", sigis)
+        if width > 1:
+            p.set("LEFT", str(width - 1))
+            p.set("RIGHT", "0")
+
+    def external_busif(self, name: str, btype: str, signals, manager: bool) -> None:
+        b = ET.SubElement(self.external_interfaces, "BUSINTERFACE")
+        b.set("NAME", name)
+        b.set("TYPE", btype)
+        ET.SubElement(b, "PARAMETER").attrib.update({"NAME": "HAS_QOS", "VALUE": "0"})
+        pms = ET.SubElement(b, "PORTMAPS")
+        for logical, direction, width in signals:
+            phys = f"{name}_{logical}"
+            self.external_port(phys, direction if manager else _flip(direction), width)
+            pm = ET.SubElement(pms, "PORTMAP")
+            pm.set("LOGICAL", logical)
+            pm.set("PHYSICAL", phys)
+
+    def tostring(self) -> str:
+        return ET.tostring(self.root, encoding="unicode")
+
+
+def synthetic_hwh(
+    name: str = "synth",
+    n_ip: int = 8,
+    n_hier: int = 2,
+    n_ps_params: int = 200,
+    n_regs: int = 4,
+    bdc: bool = False,
+) -> str:
+    """
+    Returns the XML for a synthetic top-level design with n_ip AXI-Lite
+    cores spread across n_hier hierarchies. When bdc is True a block design
+    container called bdc_0 (BD name bdc_design) is placed behind the
+    interconnect; its content is generated with synthetic_bdc_hwh().
+    """
+    h = _HwhBuilder(name)
+    aximm = "xilinx.com:interface:aximm:1.0"
+    axis = "xilinx.com:interface:axis:1.0"
+    ps = "processing_system7_0"
+
+    ps_params = {}
+    for i in range(4):
+        ps_params[f"PCW_FPGA_FCLK{i}_ENABLE"] = "1" if i == 0 else "0"
+        ps_params[f"PCW_FCLK{i}_PERIPHERAL_DIVISOR0"] = str(5 + i)
+        ps_params[f"PCW_FCLK{i}_PERIPHERAL_DIVISOR1"] = str(1 + i)
+    for i in range(n_ps_params):
+        ps_params[f"PCW_SYNTH_PARAM_{i}"] = hex(i) if i % 3 == 0 else str(i)
+    h.module(
+        ps,
+        "xilinx.com:ip:processing_system7:5.5",
+        modtype="processing_system7",
+        is_pl=False,
+        params=ps_params,
+    )
+    h.port(ps, "FCLK_CLK0", "O", sigis="clk")
+    h.port(ps, "FCLK_RESET0_N", "O", sigis="rst")
+    h.port(ps, "IRQ_F2P", "I")
+    h.busif(ps, "M_AXI_GP0", "MASTER", aximm, AXI_SIGNALS, manager=True)
+    h.busif(ps, "GPIO_0", "MASTER", "xilinx.com:interface:gpio:1.0", [("TRI_O", "O", 1)], manager=True)
+
+    targets: List[Tuple[str, str, str]] = []  # (instance, bus, memtype)
+
+    ic = "axi_interconnect_0"
+    h.module(ic, "xilinx.com:ip:axi_interconnect:2.1")
+    h.port(ic, "ACLK", "I", sigis="clk")
+    h.port(ic, "ARESETN", "I", sigis="rst")
+    h.busif(ic, "S00_AXI", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+    h.connect((ps, "FCLK_CLK0"), (ic, "ACLK"))
+    h.connect((ps, "FCLK_RESET0_N"), (ic, "ARESETN"))
+    h.connect_bus((ps, "M_AXI_GP0"), (ic, "S00_AXI"), AXI_SIGNALS)
+
+    concat = "xlconcat_0"
+    h.module(concat, "xilinx.com:ip:xlconcat:2.1", params={"NUM_PORTS": str(n_ip)})
+    h.port(concat, "dout", "O", width=n_ip)
+
+    intc = "axi_intc_0"
+    h.module(intc, "xilinx.com:ip:axi_intc:4.1")
+    h.port(intc, "intr", "I", width=n_ip)
+    h.port(intc, "irq", "O")
+    h.busif(intc, "s_axi", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+    h.connect((concat, "dout"), (intc, "intr"))
+    h.connect((intc, "irq"), (ps, "IRQ_F2P"))
+    targets.append((intc, "s_axi", "REGISTER"))
+
+    slc = "xlslice_0"
+    h.module(slc, "xilinx.com:ip:xlslice:1.0", params={"DIN_FROM": "0", "DIN_TO": "0"})
+    h.port(slc, "Din", "I")
+    h.port(slc, "Dout", "O")
+    h.connect((ps, "GPIO_0_TRI_O"), (slc, "Din"))
+
+    bram = "axi_bram_ctrl_0"
+    h.module(bram, "xilinx.com:ip:axi_bram_ctrl:4.1")
+    h.busif(bram, "S_AXI", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+    targets.append((bram, "S_AXI", "MEMORY"))
+
+    prev_stream: Optional[str] = None
+    for k in range(n_ip):
+        inst = f"ip_{k}"
+        fullname = f"/hier_{k % n_hier}/{inst}" if n_hier > 0 else f"/{inst}"
+        vlnv = "xilinx.com:ip:axi_dma:7.1" if k % 2 == 0 else "xilinx.com:hls:accel:1.0"
+        h.module(inst, vlnv, fullname=fullname, params={"C_ID": str(k), "C_EN": "true"})
+        h.port(inst, "aclk", "I", sigis="clk")
+        h.port(inst, "aresetn", "I", sigis="rst")
+        h.port(inst, "interrupt", "O", sigis="INTERRUPT")
+        h.busif(inst, "S_AXI_LITE", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+        h.busif(inst, "M_AXIS", "MASTER", axis, AXIS_SIGNALS, manager=True)
+        h.busif(inst, "S_AXIS", "SLAVE", axis, AXIS_SIGNALS, manager=False)
+        h.registers(inst, "S_AXI_LITE", n_regs)
+        h.connect((ps, "FCLK_CLK0"), (inst, "aclk"))
+        h.connect((ps, "FCLK_RESET0_N"), (inst, "aresetn"))
+        h.port(concat, f"In{k}", "I")
+        h.connect((inst, "interrupt"), (concat, f"In{k}"))
+        if prev_stream is not None:
+            h.connect_bus((prev_stream, "M_AXIS"), (inst, "S_AXIS"), AXIS_SIGNALS)
+        prev_stream = inst
+        targets.append((inst, "S_AXI_LITE", "REGISTER"))
+
+    # A GPIO pin driving the first core
+    h.port("ip_0", "gpio_in", "I")
+    h.connect((slc, "Dout"), ("ip_0", "gpio_in"))
+
+    # An external scalar port
+    h.external_port("led", "O")
+    h.port("ip_0", "led", "O")
+    h.connect(("ip_0", "led"), ("External_Ports", "led"))
+
+    if bdc:
+        b = "bdc_0"
+        h.module(b, "xilinx.com:module_ref:bdc:1.0", bdc="bdc_design", fullname=f"/{b}")
+        h.busif(b, "S_AXI", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+        h.port(b, "aclk", "I", sigis="clk")
+        h.connect((ps, "FCLK_CLK0"), (b, "aclk"))
+        targets.append((b, "S_AXI", "REGISTER"))
+
+    base = 0x40000000
+    for idx, (inst, bus, memtype) in enumerate(targets):
+        mport = f"M{idx:02d}_AXI"
+        h.busif(ic, mport, "MASTER", aximm, AXI_SIGNALS, manager=True)
+        h.connect_bus((ic, mport), (inst, bus), AXI_SIGNALS)
+        h.memrange((ps, "M_AXI_GP0"), (inst, bus), base + idx * 0x10000, 0x10000, memtype)
+
+    return h.tostring()
+
+
+def synthetic_bdc_hwh(name: str = "bdc_design", n_ip: int = 100, n_regs: int = 2) -> str:
+    """
+    Returns the XML for the content of a block design container, n_ip
+    AXI-Lite cores behind an interconnect that is fed from the external
+    S_AXI interface of the container.
+    """
+    h = _HwhBuilder(name)
+    aximm = "xilinx.com:interface:aximm:1.0"
+    h.external_busif("S_AXI", "SLAVE", AXI_SIGNALS, manager=False)
+    h.external_port("aclk", "I", sigis="clk")
+
+    ic = "bdc_interconnect"
+    h.module(ic, "xilinx.com:ip:axi_interconnect:2.1")
+    h.port(ic, "ACLK", "I", sigis="clk")
+    h.busif(ic, "S00_AXI", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+    for logical, _, _ in AXI_SIGNALS:
+        h.connect((ic, f"S00_AXI_{logical}"), ("External_Ports", f"S_AXI_{logical}"))
+    h.connect((ic, "ACLK"), ("External_Ports", "aclk"))
+
+    for k in range(n_ip):
+        inst = f"bdc_ip_{k}"
+        h.module(inst, "xilinx.com:hls:bdc_accel:1.0", params={"C_ID": str(k)})
+        h.port(inst, "ap_clk", "I", sigis="clk")
+        h.busif(inst, "s_axi_control", "SLAVE", aximm, AXI_SIGNALS, manager=False)
+        h.registers(inst, "s_axi_control", n_regs)
+        mport = f"M{k:02d}_AXI"
+        h.busif(ic, mport, "MASTER", aximm, AXI_SIGNALS, manager=True)
+        h.connect_bus((ic, mport), (inst, "s_axi_control"), AXI_SIGNALS)
+
+    return h.tostring()
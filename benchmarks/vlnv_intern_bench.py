@@ -0,0 +1,111 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Memory and time benchmark of interned VLNVs when parsing a HWH file.
+The HWH frontend shares one Vlnv instance per distinct VLNV, this compares
+it against creating a new Vlnv for every MODULE and BUSINTERFACE.
+
+    python benchmarks/vlnv_intern_bench.py --cores 400
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_hwh import synthetic_hwh
+
+from pynqmetadata import Module, Vlnv
+from pynqmetadata.frontends import HwhFrontend
+from pynqmetadata.frontends import hwh_frontend
+
+
+def uninterned_vlnv_creator(vlnv_str: str) -> Vlnv:
+    """The previous behaviour, a new Vlnv for every call"""
+    split_str = vlnv_str.split(":")
+    version_str = split_str[3].split(".")
+    version = (int(version_str[0]), int(version_str[1]))
+    return Vlnv(
+        vendor=split_str[0], library=split_str[1], name=split_str[2], version=version
+    )
+
+
+def all_vlnvs(md: Module) -> List[Vlnv]:
+    ret = []
+    for p in md.ports.values():
+        if p.vlnv is not None:
+            ret.append(p.vlnv)
+    for b in md.blocks.values():
+        if getattr(b, "vlnv", None) is not None:
+            ret.append(b.vlnv)
+        for p in b.ports.values():
+            if p.vlnv is not None:
+                ret.append(p.vlnv)
+        if isinstance(b, Module):
+            ret.extend(all_vlnvs(b))
+    return ret
+
+
+def parse(hwh: str, repeat: int) -> Tuple[float, int, Module]:
+    """Returns the best parse time, the memory retained by the design and the design"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        HwhFrontend(_hwhfile=hwh)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    md = HwhFrontend(_hwhfile=hwh)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return best, retained, md
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cores", type=int, default=400, help="cores in the design")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hwh = synthetic_hwh(n_ip=args.cores, n_hier=8)
+    for mode, creator in [
+        ("uninterned", uninterned_vlnv_creator),
+        ("interned", hwh_frontend.vlnv_creator),
+    ]:
+        original = hwh_frontend.vlnv_creator
+        hwh_frontend.vlnv_creator = creator
+        try:
+            t_parse, retained, md = parse(hwh, args.repeat)
+        finally:
+            hwh_frontend.vlnv_creator = original
+        vlnvs = all_vlnvs(md)
+        drivers = {v.str: None for v in vlnvs[::7]}
+        t_lookup = best_of(lambda: [v.str in drivers for v in vlnvs], args.repeat)
+        n_objs = len({id(v) for v in vlnvs})
+        print(
+            f"{mode:>10} : parse {t_parse * 1e3:8.1f} ms, design {retained / 1e6:7.2f} MB, "
+            f"{len(vlnvs)} VLNV refs in {n_objs} objects, "
+            f"str lookups {t_lookup * 1e6:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
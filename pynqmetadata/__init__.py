@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from . import errors
+from .models.batch import Batch
 from .models.bit_field import BitField
 from .models.block import Block
 from .models.core import Core
 from .models.dfx_core import DFXCore
+from .models.diff import ModelDiff
+from .models.gc_tuning import freeze_gc, unfreeze_gc
 from .models.hierarchy import Hierarchy
 from .models.interrupt_signal import InterruptSignal
 from .models.ip_core import IPCore
@@ -55,4 +55,8 @@ from .query_errors import (
     PortSignalNotFound,
     RegisterNotFound,
 )
-from .validation_errors import ImmutableClassModifiedError, NotValidPmdError
+from .validation_errors import (
+    FrozenModuleModified,
+    ImmutableClassModifiedError,
+    NotValidPmdError,
+)
@@ -13,3 +13,8 @@ class ImmutableClassModifiedError(Exception):
         super().__init__(message)
         self.errors = errors
 
+
+class FrozenModuleModified(ImmutableClassModifiedError):
+    """ Raise an exception when a frozen snapshot of a module is modified """
+    def __init__(self, message=None, errors=None):
+        super().__init__(message, errors)
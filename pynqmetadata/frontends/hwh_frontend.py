@@ -3,7 +3,7 @@
 
 import os
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import ClassVar, Optional, Tuple
 from xml.etree import ElementTree
 import warnings
 
@@ -18,7 +18,7 @@ from ..models.ip_core import IPCore
 from ..models.manager_port import ManagerPort
 from ..models.metadata_extension import MetadataExtension
 from ..models.module import Module
-from ..models.parameter import Parameter
+from ..models.parameter import Parameter, parse_int
 from ..models.port import Port
 from ..models.proc_sys_core import ProcSysCore
 from ..models.register import Register
@@ -35,19 +35,14 @@ from ..models.rst_port import RstPort
 
 def string2int(a: str) -> int:
     """Convert a hex or decimal string into an int."""
-    return int(a, 16 if a.startswith("0x") else 10)
+    return parse_int(a)
 
 
 def vlnv_creator(vlnv_str: str) -> Vlnv:
     """
-    When given a VLNV string, return a VLNV model
+    When given a VLNV string, return the shared (interned) VLNV model
     """
-    split_str = vlnv_str.split(":")
-    version_str = split_str[3].split(".")
-    version = (int(version_str[0]), int(version_str[1]))
-    return Vlnv(
-        vendor=split_str[0], library=split_str[1], name=split_str[2], version=version
-    )
+    return Vlnv.from_str(vlnv_str)
 
 
 class BDNameExtension(MetadataExtension):
@@ -65,7 +60,9 @@ def core_factory(module: ElementTree) -> Block:
     name = module.get("INSTANCE")
 
     if module.get("BDTYPE") == "BLOCK_CONTAINER":
-        vlnv = Vlnv(vendor="xilinx", library="bdc", name="bdc", version=(1, 0))
+        vlnv = Vlnv.intern(
+            vendor="xilinx", library="bdc", name="bdc", version=(1, 0)
+        )
     else:
         vlnv = vlnv_creator(module.get("VLNV"))
 
@@ -94,13 +91,7 @@ def core_factory(module: ElementTree) -> Block:
 
     # Populate the parameters
     for param in module.iter("PARAMETER"):
-        core.add(
-            Parameter(
-                name=param.get("NAME"),
-                value=param.get("VALUE"),
-                # hierarchy_name=fullname,
-            )
-        )
+        core.parameters.add_value(param.get("NAME"), param.get("VALUE"))
 
     return core
 
@@ -166,7 +157,9 @@ def external_port_factory(b_itf: ElementTree) -> Port:
             porttype = "axis"
 
     driver = b_itf.get("TYPE") == "INITIATOR" or b_itf.get("TYPE") == "MASTER"
-    vlnv = Vlnv(vendor="extern", library="extern", name=porttype, version=(1, 0))
+    vlnv = Vlnv.intern(
+        vendor="extern", library="extern", name=porttype, version=(1, 0)
+    )
     if vlnv.name == "aximm":
         if driver:
             port = ManagerPort(name=bname, vlnv=vlnv, external=True)
@@ -198,6 +191,9 @@ class HwhFrontend(Module):
     _element_tree: object = None
     _root: object = None
 
+    # Only needed while parsing, the XML can be parsed again from _hwhfile
+    _pickle_exclude: ClassVar[Tuple[str, ...]] = ("_element_tree", "_root")
+
     _logical2physical_portmap: dict = field(default_factory=lambda: ({}))
     _physical2logical_portmap: dict = field(default_factory=lambda: ({}))
     _logical2physical_extern_pm: dict = field(default_factory=lambda: ({}))
@@ -639,7 +635,7 @@ class HwhFrontend(Module):
 
                         # Infect the external ports VLNV with the internal ports VLNV
                         if signal._parent.vlnv is not None:
-                            dst_signal._parent.vlnv = signal._parent.vlnv.copy()
+                            dst_signal._parent.vlnv = signal._parent.vlnv
 
                     else:
                         dst_core = self.lookup(f"{con.get('INSTANCE')}[block]")
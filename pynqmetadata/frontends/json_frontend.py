@@ -44,7 +44,7 @@ def _block_factory(j: Dict) -> Block:
     """Create a block from a json description"""
     vlnv = None
     if "vlnv" in j:
-        vlnv = Vlnv(
+        vlnv = Vlnv.intern(
             vendor=j["vlnv"]["vendor"],
             library=j["vlnv"]["library"],
             name=j["vlnv"]["name"],
@@ -70,11 +70,7 @@ def _block_factory(j: Dict) -> Block:
         core = IPCore(name=j["name"], vlnv=vlnv, hierarchy_name=j["hierarchy_name"])
 
     for p in j["parameters"].values():
-        if "value" in p:
-            param = Parameter(name=p["name"], value=p["value"])
-        else:
-            param = Parameter(name=p["name"])
-        core.add(param)
+        core.parameters.add_value(p["name"], p.get("value"))
 
     for p in j["ports"].values():
         core.add(_port_factory(p))
@@ -86,7 +82,7 @@ def _port_factory(j: Dict) -> Port:
     """constructs a port from a JSON description of the port"""
     vlnv = None
     if j["vlnv"] is not None:
-        vlnv = Vlnv(
+        vlnv = Vlnv.intern(
             vendor=j["vlnv"]["vendor"],
             library=j["vlnv"]["library"],
             name=j["vlnv"]["name"],
@@ -176,7 +172,7 @@ def _relink_objects(md: Module) -> None:
 
             for sig in port.signals.values():
                 for con in sig.con_refs:
-                    sig._connections[con] = md.lookup(con)
+                    sig._set_connection(con, md.lookup(con))
 
 
 def _module_factory(j: Dict) -> Module:
@@ -5,7 +5,9 @@ from .hwh_frontend import HwhFrontend
 from .json_frontend import JsonFrontend
 from ..models.metadata_object import MetadataObject
 from ..models.module import Module
-from typing import Optional
+from ..models.parallel_merge import load_models
+from functools import partial
+from typing import List, Optional
 from pydantic import Field
 from ..models.metadata_extension import MetadataExtension
 
@@ -13,33 +15,50 @@ class XsaObjectExtension(MetadataExtension):
     """Extends the metadata to include an XSA parser object"""
     xsa: Optional[object] = Field(default=None, exclude=True)
 
-def XsaFrontend(input: str) -> MetadataObject:
-    """ 
+def _load_bdc(hwh_fp: str, name: str) -> Module:
+    """Parses the HWH of a BDC, renamed to the container block it is merged into"""
+    bdc_md = HwhFrontend(_hwhfile=hwh_fp)
+    bdc_md_json = bdc_md.json().replace(bdc_md.name, name)
+    return JsonFrontend(bdc_md_json)
+
+def _bdc_hwh_paths(b: Module, xsa) -> List[str]:
+    """The reference HWHs to merge into the BDC container block b"""
+    bd = b.ext["bdc"]
+    bdc_filename = f"{bd.bd_name}.hwh"
+    return [fp for fp in xsa.referenceHwhPaths if fp.endswith(bdc_filename)]
+
+def XsaFrontend(input: str, processes: bool = False) -> MetadataObject:
+    """
     Convert an XSA into a metadata object. The XSA may contain
     multiple hwh files / BDC descriptions / or Metadata json files.
+
+    The HWHs of the BDCs are all parsed first, on a pool of threads or of
+    processes if processes is True, then merged into the design in order.
     """
     from pynqutils.build_utils import XsaParser
     xsa = XsaParser(input)
     xsa.load_bdc_metadata()
     md = HwhFrontend(_hwhfile=xsa.defaultHwhPaths[0])
     md.ext["xsa"] = XsaObjectExtension(xsa=xsa)
+    loaders = {}
     for b in md.blocks.values():
         if isinstance(b, Module):
             if "bdc" in b.ext:
-                bd = b.ext["bdc"]
-                bdc_filename = f"{bd.bd_name}.hwh"
-                for hwh_fp in xsa.referenceHwhPaths:
-                    if hwh_fp.endswith(bdc_filename):
-                        bdc_md = HwhFrontend(_hwhfile=hwh_fp)
-                        bdc_md_json = bdc_md.json().replace(bdc_md.name, b.name)
-                        mod_bdc_md = JsonFrontend(bdc_md_json)
-                        mod_bdc_md.hierarchy_name = b.hierarchy_name
-                        b.merge(
-                            mod_bdc_md,
-                            skip_external=True,
-                            inherit_signal_width=True,
-                            inherit_addr_info=True,
-                        )
+                for hwh_fp in _bdc_hwh_paths(b, xsa):
+                    loaders[(b.name, hwh_fp)] = partial(_load_bdc, hwh_fp, b.name)
+    bdcs = load_models(loaders, processes=processes)
+    for b in md.blocks.values():
+        if isinstance(b, Module):
+            if "bdc" in b.ext:
+                for hwh_fp in _bdc_hwh_paths(b, xsa):
+                    mod_bdc_md = bdcs[(b.name, hwh_fp)]
+                    mod_bdc_md.hierarchy_name = b.hierarchy_name
+                    b.merge(
+                        mod_bdc_md,
+                        skip_external=True,
+                        inherit_signal_width=True,
+                        inherit_addr_info=True,
+                    )
                 for merge_obj_file in xsa.mergeableMetadataObjects:
                     if merge_obj_file.endswith(".hwh"):
                         merge_obj = HwhFrontend(_hwhfile=merge_obj_file)
@@ -58,4 +77,4 @@ def XsaFrontend(input: str) -> MetadataObject:
                             f"Aborting more than one object matches name {merge_obj.name} = {name_matches}"
                         )
                 b.refresh()
-    return md
\ No newline at end of file
+    return md
@@ -2,10 +2,12 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from .addrmap import AddressMap
+from .batch import Batch
 from .bit_field import BitField
 from .block import Block
 from .bus_connection import BusConnection
 from .core import Core
+from .diff import ModelDiff
 from .dfx_core import DFXCore
 from .interrupt_signal import InterruptSignal
 from .ip_core import IPCore
@@ -0,0 +1,117 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+
+from .metadata_object import MetadataObject
+from .module import Module
+
+if TYPE_CHECKING:
+    from .port import Port
+
+
+@dataclass(repr=False)
+class Adjacency:
+    """
+    The connectivity of a module as a directed graph in CSR form (requires numpy):
+        * indptr/indices : the neighbours of node i are
+          indices[indptr[i]:indptr[i+1]]
+        * refs : the reference of each node, indexed by node
+        * index : maps a reference back to its node index
+        * objects : the port or signal object of each node
+    Connections to objects outside the module are not included.
+    """
+
+    indptr: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64))
+    indices: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    refs: List[str] = field(default_factory=lambda: ([]))
+    index: Dict[str, int] = field(default_factory=lambda: ({}))
+    objects: List[MetadataObject] = field(default_factory=lambda: ([]))
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __repr__(self) -> str:
+        return f"Adjacency(nodes={len(self.refs)}, edges={len(self.indices)})"
+
+    def neighbours(self, ref: str) -> List[str]:
+        """The references of the nodes that ref connects to"""
+        i = self.index[ref]
+        return [self.refs[j] for j in self.indices[self.indptr[i] : self.indptr[i + 1]]]
+
+    def fan_out(self) -> np.ndarray:
+        """The number of connections leaving each node"""
+        return np.diff(self.indptr)
+
+    def fan_in(self) -> np.ndarray:
+        """The number of connections arriving at each node"""
+        return np.bincount(self.indices, minlength=len(self.refs))
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (source, destination) index arrays of every connection"""
+        src = np.repeat(np.arange(len(self.refs), dtype=np.int32), self.fan_out())
+        return src, self.indices
+
+    def to_scipy(self):
+        """
+        Returns the graph as a scipy.sparse.csr_matrix (requires scipy), so
+        that scipy.sparse.csgraph can be used for components, reachability
+        and shortest paths
+        """
+        from scipy.sparse import csr_matrix
+
+        n = len(self.refs)
+        data = np.ones(len(self.indices), dtype=np.int8)
+        return csr_matrix((data, self.indices, self.indptr), shape=(n, n))
+
+
+def _module_ports(module: Module) -> List[Port]:
+    """The ports of the module, its blocks and any modules within it"""
+    ports = list(module.ports.values())
+    for block in module.blocks.values():
+        if isinstance(block, Module):
+            ports.extend(_module_ports(block))
+        else:
+            ports.extend(block.ports.values())
+    return ports
+
+
+def _build(nodes: List[MetadataObject], rows: List[List[MetadataObject]]) -> Adjacency:
+    """Builds the CSR arrays from a node list and the neighbour objects of each node"""
+    index = {id(obj): i for i, obj in enumerate(nodes)}
+    counts: List[int] = []
+    flat: List[int] = []
+    for row in rows:
+        start = len(flat)
+        for dst in row:
+            j = index.get(id(dst))
+            if j is not None:
+                flat.append(j)
+        counts.append(len(flat) - start)
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    refs = [obj.ref for obj in nodes]
+    return Adjacency(
+        indptr=indptr,
+        indices=np.array(flat, dtype=np.int32),
+        refs=refs,
+        index={r: i for i, r in enumerate(refs)},
+        objects=nodes,
+    )
+
+
+def port_adjacency(module: Module) -> Adjacency:
+    """The port-level (bus) connectivity of a module and the modules within it"""
+    ports = _module_ports(module)
+    return _build(ports, [list(p._destination_ports().values()) for p in ports])
+
+
+def signal_adjacency(module: Module) -> Adjacency:
+    """The signal-level connectivity of a module and the modules within it"""
+    sigs = [s for p in _module_ports(module) for s in p.signals.values()]
+    return _build(sigs, [list(s._connections.values()) for s in sigs])
@@ -0,0 +1,189 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from ..errors import WrongPolarityConnection
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+    from .module import Module
+    from .port import Port
+    from .signal import Signal
+
+
+class Batch:
+    """
+    A transaction of structural edits on a Module, used through Module.batch()
+
+        with md.batch():
+            md.add(core)
+            sig_a.connect(sig_b)
+            md.blocks["old"].remove()
+
+    While the batch is open:
+        * refresh() requests are deferred
+        * polarity checks on Signal.connect are deferred and performed in
+          bulk when the batch is committed
+        * additions, removals, connections and disconnections are recorded
+          in an undo journal
+    On a clean exit the connections are validated and a single incremental
+    refresh is performed. If the block raises, or validation fails, the
+    journal is replayed backwards to restore the module and the error is
+    re-raised. Edits that are not journaled (merges, assignments to fields)
+    are not rolled back, a merge also makes the commit do a full refresh.
+    On a module with locking enabled the batch holds the write lock, so
+    readers never see a partially applied batch.
+    """
+
+    def __init__(self, module: Module) -> None:
+        self.module = module
+        self._journal: List[Callable[[], None]] = []
+        self._connections: List[Tuple[Signal, Signal]] = []
+        self._dirty_ports: Dict[int, Port] = {}
+        self._removed_ports: Dict[int, Port] = {}
+        self._blocks_changed: bool = False
+        self.full_refresh: bool = False
+        self._outer: Optional[Batch] = None
+        self._lock = None
+
+    def __enter__(self) -> Batch:
+        # A batch on a locked module holds the write lock until it is committed
+        self._lock = self.module._active_lock()
+        if self._lock is not None:
+            self._lock.acquire_write()
+        active = self.module._active_batch()
+        if active is not None:
+            # Nested batches join the transaction that is already open
+            self._outer = active
+            return active
+        self.module._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            return self._exit(exc_type)
+        finally:
+            if self._lock is not None:
+                self._lock.release_write()
+
+    def _exit(self, exc_type) -> bool:
+        if self._outer is not None:
+            return False
+        self.module._batch = None
+        if exc_type is not None:
+            self.rollback()
+            return False
+        try:
+            self.validate()
+        except WrongPolarityConnection:
+            self.rollback()
+            raise
+        self.module._commit_batch(self)
+        return False
+
+    def record(self, undo: Callable[[], None]) -> None:
+        """Adds an undo action to the journal"""
+        self._journal.append(undo)
+
+    def _mark_dirty(self, port: Optional[MetadataObject]) -> None:
+        if port is not None:
+            self._dirty_ports[id(port)] = port
+
+    def connected(self, src: Signal, dst: Signal) -> None:
+        """Records a new connection from src to dst"""
+        self._connections.append((src, dst))
+        self._mark_dirty(src._parent)
+        self.record(lambda: src._remove_con_ref(dst.ref))
+
+    def disconnected(self, src: Signal, dst: Signal) -> None:
+        """Records the removal of the connection from src to dst"""
+        self._mark_dirty(src._parent)
+        self.record(lambda: src._connect(dst))
+
+    def inserted(self, owner: MetadataObject, container: Dict, item: MetadataObject) -> None:
+        """Records item being added to container (a dict of owner)"""
+        key = item.name
+
+        def _undo() -> None:
+            del container[key]
+            owner._children.pop(f"{key}[{item.generic_type}]", None)
+            if item.generic_type == "signal":
+                owner._invalidate_destinations()
+            owner._invalidate_hash()
+            owner._bump_generation()
+
+        self.record(_undo)
+        self._track(item)
+
+    def deleted(
+        self, owner: MetadataObject, container: Dict, item: MetadataObject, pos: int
+    ) -> None:
+        """Records item being removed from container (a dict of owner)"""
+        key = item.name
+
+        def _undo() -> None:
+            if isinstance(container, dict):
+                items = list(container.items())
+                items.insert(pos, (key, item))
+                container.clear()
+                container.update(items)
+            else:
+                container._restore(item)
+            if item.generic_type == "signal":
+                owner._invalidate_destinations()
+            owner._add_child(item)
+            owner._bump_generation()
+
+        self.record(_undo)
+        if item.generic_type == "port":
+            self._removed_ports[id(item)] = item
+        elif item.generic_type == "block":
+            self._blocks_changed = True
+
+    def _track(self, item: MetadataObject) -> None:
+        """Marks the ports affected by a newly added item as dirty"""
+        if item.generic_type == "block":
+            self._blocks_changed = True
+            for port in getattr(item, "ports", {}).values():
+                self._mark_dirty(port)
+        elif item.generic_type == "port":
+            self._mark_dirty(item)
+        elif item.generic_type == "signal":
+            self._mark_dirty(item._parent)
+
+    def validate(self) -> None:
+        """Checks the polarity of every connection made in this batch"""
+        errors: List[str] = []
+        for src, dst in self._connections:
+            if src.connection_exists(dst):
+                try:
+                    src._check_polarity(dst)
+                except WrongPolarityConnection as e:
+                    errors.append(str(e))
+        if len(errors) > 0:
+            raise WrongPolarityConnection("\n".join(errors))
+
+    def rollback(self) -> None:
+        """Undoes every journaled edit, most recent first"""
+        for undo in reversed(self._journal):
+            undo()
+        self._journal = []
+
+    def dirty_ports(self) -> List[Port]:
+        """The ports whose bus level connections need to be recomputed"""
+        return [p for i, p in self._dirty_ports.items() if i not in self._removed_ports]
+
+    def removed_ports(self) -> List[Port]:
+        """The ports removed in this batch"""
+        return list(self._removed_ports.values())
+
+    def blocks_changed(self) -> bool:
+        """True if blocks were added to or removed from a module"""
+        return self._blocks_changed
+
+    def empty(self) -> bool:
+        """True if nothing was journaled"""
+        return len(self._journal) == 0
@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from .metadata_object import MetadataObject
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class BitField(MetadataObject):
     """
     Model that describes a bit field
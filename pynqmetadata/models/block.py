@@ -4,16 +4,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from ..errors import (FeatureNotYetImplemented, MergeConflict,
-                      UnexpectedMetadataObjectType, UnexpectedPmdObject)
+from ..errors import (FeatureNotYetImplemented, UnexpectedMetadataObjectType,
+                      UnexpectedPmdObject)
+from .copy_on_write import CowContext
 from .metadata_object import MetadataObject
 from .parameter import Parameter
+from .parameter_table import ParameterTable
 from .port import Port
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Block(MetadataObject):
     """
     The block class that is used to describe core in the design or modules
@@ -25,6 +27,20 @@ class Block(MetadataObject):
     ports: Dict[str, Port] = field(default_factory=lambda: ({}))
     parameters: Dict[str, Parameter] = field(default_factory=lambda: ({}))
 
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        The parameters of a block are always held in a ParameterTable owned
+        by it. Assigning a type or VLNV to a block of a module marks the
+        block index of the module (see Module.select) as out of date.
+        """
+        if name == "parameters" and not (
+            isinstance(value, ParameterTable) and value._owner is self
+        ):
+            value = ParameterTable(self, value)
+        super().__setattr__(name, value)
+        if (name == "type" or name == "vlnv") and self._parent is not None:
+            self._bump_generation()
+
     def _block_merge(
         self,
         a: Block,
@@ -48,7 +64,7 @@ class Block(MetadataObject):
 
         if self.hierarchy_name is not None and a.hierarchy_name is not None:
             if self.hierarchy_name != a.hierarchy_name:
-                raise MergeConflict(
+                self._merge_conflict(
                     f"{self.hierarchy_name=} conflicts with {a.hierarchy_name=}"
                 )
         else:
@@ -56,6 +72,8 @@ class Block(MetadataObject):
 
         for p in a.ports:
             if p in self.ports:
+                if self.ports[p]._same_content(a.ports[p]):
+                    continue
                 self.ports[p].merge(
                     a.ports[p],
                     skip_external=skip_external,
@@ -66,11 +84,7 @@ class Block(MetadataObject):
             else:
                 self.ports[p] = a.ports[p]
 
-        for param in a.parameters:
-            if param in self.parameters:
-                self.parameters[param].merge(a.parameters[param])
-            else:
-                self.parameters[param] = a.parameters[param]
+        self.parameters.merge(a.parameters)
 
     def merge(
         self,
@@ -119,12 +133,10 @@ class Block(MetadataObject):
         """
         if isinstance(item, Port):
             if not self._exists(item):
-                self.ports[item.name] = item
-                item.set_parent(self)
+                self._insert_child(self.ports, item)
         elif isinstance(item, Parameter):
             if not self._exists(item):
-                self.parameters[item.name] = item
-                item.set_parent(self)
+                self._insert_child(self.parameters, item)
         else:
             raise UnexpectedPmdObject(
                 f"unable to add {item} to {self.ref} was expecting either a parameter or a port"
@@ -136,7 +148,7 @@ class Block(MetadataObject):
         for port in self.ports.values():
             port.set_parent(self)
             port._update_parents()
-        for param in self.parameters.values():
+        for param in self.parameters._materialised():
             param.set_parent(self)
 
     def _update_parents(self) -> None:
@@ -144,6 +156,40 @@ class Block(MetadataObject):
         This is usually performed when we do an update, merge, or parse some json metadata"""
         self._update_parents_base()
 
+    def _packed(self) -> bool:
+        """Returns true if the signals of any port are packed into a SignalStore"""
+        return any(p._packed() for p in self.ports.values())
+
+    def _lookup(self, ref_levels: List[str]) -> Optional[MetadataObject]:
+        """
+        helper used for recursively looking down the object tree.
+        Parameters that have not been looked up yet are not held in
+        _children so fall back to the parameter table for those.
+        """
+        obj = super()._lookup(ref_levels)
+        if obj is None and len(ref_levels) == 1:
+            return self.parameters.lookup(ref_levels[-1])
+        return obj
+
+    def _cow_clone(self, ctx: CowContext, parent: Optional[MetadataObject]):
+        """The parameter table is copied rather than shared with the original"""
+        ret = super()._cow_clone(ctx, parent)
+        ret.parameters = self.parameters._cow_copy(ctx, ret)
+        return ret
+
+    def _dispose(self) -> None:
+        super()._dispose()
+        self.parameters._owner = None
+
+    def _freeze(self) -> None:
+        """The parameter table is frozen along with the block"""
+        super()._freeze()
+        self.parameters._frozen = True
+
+    def _thaw(self) -> None:
+        super()._thaw()
+        self.parameters._frozen = False
+
     def _get_root(self) -> MetadataObject:
         """Gets the root module for this block"""
         module = self._parent
@@ -166,7 +212,7 @@ class Block(MetadataObject):
                 self.ports[p].remove(refresh=False)
 
             if isinstance(self._parent, MetadataObject):
-                del self._parent.blocks[self.name]
+                self._parent._delete_child(self._parent.blocks, self)
             else:
                 raise UnexpectedMetadataObjectType(
                     f"Expecting the parent of Core {self.ref} to be of type Module"
@@ -0,0 +1,125 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Type
+
+from .block import Block
+
+if TYPE_CHECKING:
+    from .module import Module
+
+
+def _vlnv_str(block: Block) -> Optional[str]:
+    vlnv = getattr(block, "vlnv", None)
+    return None if vlnv is None else vlnv.str
+
+
+def _versionless(vlnv: str) -> str:
+    return vlnv.rsplit(":", 1)[0]
+
+
+class BlockIndex:
+    """
+    Secondary indexes over the blocks of a module, used by Module.select():
+        * by_class : every class in the MRO of each block
+        * by_type : the type string of each block
+        * by_vlnv / by_versionless : the full and versionless VLNV strings
+        * by_parameter : the names of the parameters of each block
+    Each index maps to the blocks in the order they appear in Module.blocks.
+    The index is rebuilt when the structure generation of the module
+    changes: adding or removing blocks or parameters, or assigning a type
+    or VLNV to a block, advance it. Parameter values are only checked
+    against the blocks when selecting.
+    """
+
+    def __init__(self) -> None:
+        self.generation: int = -1
+        self.position: Dict[int, int] = {}
+        self.by_class: Dict[type, List[Block]] = {}
+        self.by_type: Dict[str, List[Block]] = {}
+        self.by_vlnv: Dict[str, List[Block]] = {}
+        self.by_versionless: Dict[str, List[Block]] = {}
+        self.by_parameter: Dict[str, List[Block]] = {}
+
+    def __getstate__(self) -> Dict:
+        # The positions are keyed on object ids, which do not survive a copy
+        return {}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__()
+
+    def build(self, module: Module, generation: int) -> None:
+        self.__init__()
+        self.generation = generation
+        for pos, block in enumerate(module.blocks.values()):
+            self.position[id(block)] = pos
+            for cls in type(block).__mro__:
+                self.by_class.setdefault(cls, []).append(block)
+            self.by_type.setdefault(block.type, []).append(block)
+            vlnv = _vlnv_str(block)
+            if vlnv is not None:
+                self.by_vlnv.setdefault(vlnv, []).append(block)
+                self.by_versionless.setdefault(_versionless(vlnv), []).append(block)
+            for param in block.parameters:
+                self.by_parameter.setdefault(param, []).append(block)
+
+    def _vlnv_candidates(self, pattern: str) -> List[Block]:
+        """Blocks whose VLNV matches pattern, a full or versionless VLNV or a glob"""
+        if not any(c in pattern for c in "*?["):
+            if pattern.count(":") == 2:
+                return self.by_versionless.get(pattern, [])
+            return self.by_vlnv.get(pattern, [])
+        if pattern.endswith(":*") and not any(c in pattern[:-2] for c in "*?["):
+            return self.by_versionless.get(pattern[:-2], [])
+        ret: List[Block] = []
+        for vlnv, blocks in self.by_vlnv.items():
+            if fnmatchcase(vlnv, pattern):
+                ret.extend(blocks)
+        return sorted(ret, key=lambda b: self.position[id(b)])
+
+    def select(
+        self,
+        cls: Optional[Type[Block]] = None,
+        type: Optional[str] = None,
+        vlnv: Optional[str] = None,
+        parameters: Optional[Dict[str, object]] = None,
+    ) -> List[Block]:
+        """Returns the blocks matching every one of the given criteria"""
+        candidates: List[Iterable[Block]] = []
+        if cls is not None:
+            candidates.append(self.by_class.get(cls, []))
+        if type is not None:
+            candidates.append(self.by_type.get(type, []))
+        if vlnv is not None:
+            candidates.append(self._vlnv_candidates(vlnv))
+        for name in parameters or {}:
+            candidates.append(self.by_parameter.get(name, []))
+        if len(candidates) == 0:
+            return sorted(
+                (b for blocks in self.by_type.values() for b in blocks),
+                key=lambda b: self.position[id(b)],
+            )
+
+        ret: List[Block] = []
+        for block in min(candidates, key=len):
+            if cls is not None and not isinstance(block, cls):
+                continue
+            if type is not None and block.type != type:
+                continue
+            if vlnv is not None:
+                full = _vlnv_str(block)
+                if full is None or not (
+                    fnmatchcase(full, vlnv) or fnmatchcase(_versionless(full), vlnv)
+                ):
+                    continue
+            if parameters is not None and not all(
+                name in block.parameters
+                and (value is None or block.parameters.value(name) == value)
+                for name, value in parameters.items()
+            ):
+                continue
+            ret.append(block)
+        return ret
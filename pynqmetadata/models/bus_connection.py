@@ -8,7 +8,7 @@ from .metadata_object import MetadataObject
 from .port import Port
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class BusConnection(MetadataObject):
     """
     A Metadata model that describes a bus
@@ -21,3 +21,8 @@ class BusConnection(MetadataObject):
     dst_port: str = ""
     _src_port: Optional[Port] = None
     _dst_port: Optional[Port] = None
+
+    def _dispose(self) -> None:
+        super()._dispose()
+        self.__dict__["_src_port"] = None
+        self.__dict__["_dst_port"] = None
@@ -0,0 +1,160 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+
+from .bus_connection import BusConnection
+from .port import Port
+
+if TYPE_CHECKING:
+    from .module import Module
+
+Edge = Tuple[Port, Port]
+
+
+class BusMap(Mapping):
+    """
+    The live bus-level connections of a Module, keyed on
+    "<src port ref>-><dst port ref>", returned by Module.bus_map().
+
+    Busses are not stored, the edges are the cached Port.destinations() of
+    each port in the module. These are recomputed per port, only when one of
+    the signals of that port is connected or disconnected, so the map is
+    always up to date and never holds stale entries. A BusConnection object
+    is only created when a bus is looked up (reusing the one in
+    Module.busses for the same edge) and is then reused for as long as the
+    edge exists. Iterating edges() avoids creating them at all.
+    """
+
+    def __init__(self, module: Module) -> None:
+        self._module = module
+        self._index: Dict[str, Edge] = {}
+        self._objs: Dict[Tuple[int, int], BusConnection] = {}
+
+    def __getstate__(self) -> Dict:
+        # The cached objects are keyed on object ids, which do not survive a copy
+        return {"_module": self._module}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["_module"])
+
+    def _ports(self) -> Iterator[Port]:
+        """The ports that busses can start from: block ports then external ports"""
+        for block in self._module.blocks.values():
+            yield from block.ports.values()
+        yield from self._module.ports.values()
+
+    def edges(self) -> Iterator[Edge]:
+        """Yields (source port, destination port) for every bus"""
+        for p in self._ports():
+            for d in p._destination_ports().values():
+                yield p, d
+
+    def _owns(self, port: Port) -> bool:
+        """True if port is currently an external port or a block port of the module"""
+        md = self._module
+        owner = port._parent
+        if owner is md:
+            return md.ports.get(port.name) is port
+        return (
+            owner is not None
+            and owner._parent is md
+            and md.blocks.get(owner.name) is owner
+            and owner.ports.get(port.name) is port
+        )
+
+    def _edge(self, ref: str) -> Optional[Edge]:
+        """Finds the edge for a bus reference, rebuilding the index on a miss"""
+        edge = self._index.get(ref)
+        if edge is not None:
+            src, dst = edge
+            if (
+                self._owns(src)
+                and src._destination_ports().get(dst.name) is dst
+                and ref == f"{src.ref}->{dst.ref}"
+            ):
+                return edge
+        self._reindex()
+        return self._index.get(ref)
+
+    def _reindex(self) -> None:
+        """Rebuilds the index of every edge, dropping cached objects for edges that are gone"""
+        index = {f"{p.ref}->{d.ref}": (p, d) for p, d in self.edges()}
+        self._prune({(id(p), id(d)) for p, d in index.values()})
+        self._index = index
+
+    def _prune(self, live: Set[Tuple[int, int]]) -> None:
+        """
+        Drops the cached objects of edges that are not live. The dict is
+        modified in place so that an object another reader is creating
+        at the same time is not lost.
+        """
+        for key in [k for k in self._objs if k not in live]:
+            self._objs.pop(key, None)
+
+    def _bus(self, src: Port, dst: Port) -> BusConnection:
+        """Returns the BusConnection for an edge, creating it on first use"""
+        key = (id(src), id(dst))
+        ref = f"{src.ref}->{dst.ref}"
+        bus = self._objs.get(key)
+        if bus is None:
+            # Reuse the one refresh() put in Module.busses, e.g. after a copy
+            bus = self._module.busses.get(ref)
+            if not (
+                isinstance(bus, BusConnection)
+                and bus._src_port is src
+                and bus._dst_port is dst
+            ):
+                bus = BusConnection(
+                    name=ref,
+                    ref=ref,
+                    src_port=src.ref,
+                    dst_port=dst.ref,
+                    _src_port=src,
+                    _dst_port=dst,
+                )
+                bus._parent = self._module
+                if self._module.__dict__.get("_frozen"):
+                    bus._freeze()
+            bus = self._objs.setdefault(key, bus)
+        elif bus.ref != ref:
+            # The ports have been renamed or moved since the bus was created
+            bus.name = ref
+            bus.ref = ref
+            bus.src_port = src.ref
+            bus.dst_port = dst.ref
+        return bus
+
+    def __getitem__(self, ref: str) -> BusConnection:
+        edge = self._edge(ref)
+        if edge is None:
+            raise KeyError(ref)
+        return self._bus(*edge)
+
+    def __contains__(self, ref: object) -> bool:
+        return isinstance(ref, str) and self._edge(ref) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for p, d in self.edges():
+            yield f"{p.ref}->{d.ref}"
+
+    def __len__(self) -> int:
+        return sum(len(p._destination_ports()) for p in self._ports())
+
+    def _all(self) -> List[BusConnection]:
+        """Every bus in order, dropping cached objects for edges that are gone"""
+        ret = [self._bus(p, d) for p, d in self.edges()]
+        self._prune({(id(b._src_port), id(b._dst_port)) for b in ret})
+        return ret
+
+    def values(self) -> List[BusConnection]:
+        return self._all()
+
+    def items(self) -> List[Tuple[str, BusConnection]]:
+        return [(bus.ref, bus) for bus in self._all()]
+
+    def __repr__(self) -> str:
+        return f"BusMap({list(self)})"
@@ -0,0 +1,142 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Set, Tuple
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+
+
+class CowContext:
+    """
+    Shared state for a single structural sharing copy. Maps the id() of every
+    object of the source model that has been cloned to its clone so that an
+    object reached through two containers (e.g. Block.ports and
+    Block._children), or through a link from another object (e.g.
+    Signal._connections), is only cloned once.
+    """
+
+    def __init__(self) -> None:
+        self._memo: Dict[int, Tuple[MetadataObject, MetadataObject]] = {}
+
+    def clone(self, obj: MetadataObject, parent: MetadataObject) -> MetadataObject:
+        """Returns the clone of obj in this copy, creating it if needed"""
+        entry = self._memo.get(id(obj))
+        if entry is None:
+            entry = (obj, obj._cow_clone(self, parent))
+            self._memo[id(obj)] = entry
+        return entry[1]
+
+    def link(self, obj: MetadataObject) -> MetadataObject:
+        """
+        Returns the object that stands for obj in this copy: its clone when
+        obj is below the copied object, cloning the objects on the path down
+        to it if needed, otherwise obj itself
+        """
+        entry = self._memo.get(id(obj))
+        if entry is not None:
+            return entry[1]
+        parent = obj._parent
+        if parent is None:
+            return obj
+        cloned = self.link(parent)
+        if cloned is parent:
+            return obj
+        return self.clone(obj, cloned)
+
+
+class CopyOnReadDict(dict):
+    """
+    A dict whose values start out shared with the dict it was made from.
+    A value is replaced with copy_value(value) the first time it is read
+    through this dict, so values that are never read are never copied.
+    Values set through this dict are never copied.
+    """
+
+    def __init__(self, src: Dict, copy_value: Callable[[object], object]) -> None:
+        super().__init__(src)
+        self._shared: Set[str] = set(src.keys())
+        self._copy_value = copy_value
+
+    def _materialise(self, key: str) -> None:
+        if key in self._shared:
+            self._shared.discard(key)
+            value = self._copy_value(dict.__getitem__(self, key))
+            dict.__setitem__(self, key, value)
+
+    def _materialise_all(self) -> None:
+        for key in list(self._shared):
+            self._materialise(key)
+
+    def __getitem__(self, key: str) -> object:
+        self._materialise(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key: str, value: object) -> None:
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key: str, *args):
+        if key in self:
+            self._materialise(key)
+        self._shared.discard(key)
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key: str, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def values(self):
+        self._materialise_all()
+        return dict.values(self)
+
+    def items(self):
+        self._materialise_all()
+        return dict.items(self)
+
+    def popitem(self):
+        self._materialise_all()
+        return dict.popitem(self)
+
+    def copy(self) -> Dict:
+        self._materialise_all()
+        return dict(dict.items(self))
+
+    def __iter__(self) -> Iterator[str]:
+        return dict.__iter__(self)
+
+    def __reduce__(self):
+        """Pickled and deep copied as a plain dict of the copied values"""
+        return (dict, (self.copy(),))
+
+
+class CowDict(CopyOnReadDict):
+    """
+    A dict of child metadata objects for a structural sharing copy.
+
+    Initially the values are the objects of the source model. A value is
+    replaced with its (shallow) clone the first time it is read through
+    this dict, so subtrees that are never touched are never copied and
+    remain shared with the source model.
+    """
+
+    def __init__(self, ctx: CowContext, owner: MetadataObject, src: Dict) -> None:
+        super().__init__(src, partial(ctx.clone, parent=owner))
@@ -5,14 +5,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from pynqmetadata.errors.construction_errors import MergeConflict
-
 from .block import Block
 from .metadata_object import MetadataObject
 from .vlnv import Vlnv
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Core(Block):
     """
     The base model class for a metadata core object
@@ -46,7 +44,7 @@ class Core(Block):
             ignore_addr_info=ignore_addr_info,
         )
         if self.vlnv.dict() != a.vlnv.dict():
-            raise MergeConflict(f"{self.vlnv=} confilcts with {a.vlnv=}")
+            self._merge_conflict(f"{self.vlnv=} confilcts with {a.vlnv=}")
 
     def merge(
         self,
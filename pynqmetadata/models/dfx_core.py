@@ -7,7 +7,7 @@ from .core import Core
 from .vlnv import Vlnv
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class DFXCore(Core):
     """
     A core to define a dynamic function exchange (DFX) region (treated like a core)
@@ -0,0 +1,147 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Set, Tuple
+
+from .bus_connection import BusConnection
+from .metadata_object import MetadataObject
+from .signal import Signal
+
+
+@dataclass(repr=False)
+class ModelDiff:
+    """
+    The structural differences between two metadata objects, all keyed on
+    the object reference:
+        * added : objects only present in the new model
+        * removed : objects only present in the old model
+        * changed : objects in both models whose own fields differ,
+          mapped to the names of the fields that changed
+        * connections_added / connections_removed : signal level
+          connections as (source signal ref, destination signal ref)
+    Busses that appear or disappear are reported in added/removed.
+    """
+
+    added: Dict[str, MetadataObject] = field(default_factory=lambda: ({}))
+    removed: Dict[str, MetadataObject] = field(default_factory=lambda: ({}))
+    changed: Dict[str, List[str]] = field(default_factory=lambda: ({}))
+    connections_added: Set[Tuple[str, str]] = field(default_factory=set)
+    connections_removed: Set[Tuple[str, str]] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """True if there are any differences"""
+        return any(len(getattr(self, f.name)) > 0 for f in fields(self))
+
+    def of_type(self, generic_type: str) -> ModelDiff:
+        """
+        Returns the subset of this diff for one kind of object, e.g. "block",
+        "port", "signal", "parameter", "register" or "bus". Signal level
+        connections are kept for "signal".
+        """
+        ret = ModelDiff()
+        ret.added = {
+            r: o for r, o in self.added.items() if _generic_type(o) == generic_type
+        }
+        ret.removed = {
+            r: o for r, o in self.removed.items() if _generic_type(o) == generic_type
+        }
+        ret.changed = {
+            r: f for r, f in self.changed.items() if _ref_type(r) == generic_type
+        }
+        if generic_type == "signal":
+            ret.connections_added = set(self.connections_added)
+            ret.connections_removed = set(self.connections_removed)
+        return ret
+
+    def dict(self) -> Dict:
+        """renders the diff as a dictionary of references"""
+        return {
+            "added": sorted(self.added.keys()),
+            "removed": sorted(self.removed.keys()),
+            "changed": {r: list(f) for r, f in sorted(self.changed.items())},
+            "connections_added": sorted(self.connections_added),
+            "connections_removed": sorted(self.connections_removed),
+        }
+
+
+def _generic_type(obj: MetadataObject) -> str:
+    if isinstance(obj, BusConnection):
+        return "bus"
+    return obj.generic_type
+
+
+def _ref_type(ref: str) -> str:
+    """The generic type encoded at the end of a reference, e.g. a:b[port] -> port"""
+    if ref.endswith("]"):
+        return ref[ref.rfind("[") + 1 : -1]
+    if "->" in ref:
+        return "bus"
+    return "block"
+
+
+def _is_child_container(value: object) -> bool:
+    return isinstance(value, Mapping) and any(
+        isinstance(v, MetadataObject) for v in value.values()
+    )
+
+
+def diff_objects(old: MetadataObject, new: MetadataObject, ret: ModelDiff) -> None:
+    """
+    Recursively diffs new against old, adding the differences into ret.
+    Subtrees with matching content hashes are skipped without being walked,
+    the cached hashes must be current (see MetadataObject._drop_hashes).
+    """
+    if old.content_hash() == new.content_hash():
+        return
+
+    changed: List[str] = []
+    for f in fields(old):
+        if f.name.startswith("_") or f.name == "ref":
+            continue
+        a = getattr(old, f.name)
+        b = getattr(new, f.name, None)
+        if _is_child_container(a) or _is_child_container(b):
+            _diff_children(a or {}, b or {}, ret)
+        elif f.name == "con_refs" and isinstance(old, Signal):
+            for c in set(a) - set(b):
+                ret.connections_removed.add((old.ref, c))
+            for c in set(b) - set(a):
+                ret.connections_added.add((new.ref, c))
+        else:
+            out_a: List[bytes] = []
+            out_b: List[bytes] = []
+            old._hash_value(a, out_a)
+            old._hash_value(b, out_b)
+            if out_a != out_b:
+                changed.append(f.name)
+
+    if type(old) is not type(new) and "type" not in changed:
+        changed.append("type")
+    if len(changed) > 0:
+        ret.changed[old.ref] = changed
+
+
+def _diff_children(old: Mapping, new: Mapping, ret: ModelDiff) -> None:
+    for key in old.keys():
+        if key not in new:
+            _add_subtree(old[key], ret.removed)
+        else:
+            diff_objects(old[key], new[key], ret)
+    for key in new.keys():
+        if key not in old:
+            _add_subtree(new[key], ret.added)
+
+
+def _add_subtree(obj: MetadataObject, into: Dict[str, MetadataObject]) -> None:
+    """Adds an object and every child object below it"""
+    into[obj.ref] = obj
+    for f in fields(obj):
+        if not f.name.startswith("_"):
+            value = getattr(obj, f.name)
+            if _is_child_container(value):
+                for child in value.values():
+                    _add_subtree(child, into)
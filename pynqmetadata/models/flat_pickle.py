@@ -0,0 +1,151 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Pickling of metadata objects as a flat table.
+
+By default pickle recurses through every object link, the _parent back
+pointers and the _connections of the signals, so pickling a large design
+goes as deep as the longest chain of connected cores and can exceed the
+recursion limit. Here every metadata object reachable from the pickled
+object gets an integer index and its state is pickled on its own, one
+after the other, with links to other metadata objects written as their
+index. Loading creates each object the first time its index is seen, then
+restores the states in order and relinks them.
+
+The ref of an object whose parent comes before it in the table is not
+written when it can be derived from the parent ref, it is rebuilt on load.
+Fields named in the _pickle_exclude of a class are not written either and
+fall back to their default once loaded.
+"""
+
+from __future__ import annotations
+
+import copyreg
+import gc
+import io
+import pickle
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+
+# The objects of the tables being loaded, per thread
+_loading = threading.local()
+
+
+def _obj(idx: int, cls: Optional[Type[MetadataObject]] = None) -> MetadataObject:
+    """Returns the object at idx in the table being loaded, creating it on first use"""
+    objs = _loading.tables[-1]
+    if cls is not None:
+        objs.append(cls.__new__(cls))
+    return objs[idx]
+
+
+def _child_ref(obj: MetadataObject, parent: MetadataObject) -> Optional[str]:
+    state = obj.__dict__
+    name = state.get("name")
+    generic_type = state.get("generic_type")
+    if name is None or generic_type is None:
+        return None
+    return f"{parent.ref}:{name}[{generic_type}]"
+
+
+def _subclasses(cls: type) -> List[type]:
+    ret = [cls]
+    for sub in cls.__subclasses__():
+        ret.extend(_subclasses(sub))
+    return ret
+
+
+class _FlatPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, protocol: int, root: MetadataObject) -> None:
+        super().__init__(file, protocol)
+        from .metadata_object import MetadataObject
+
+        # Pickle memoizes the result of a reduce, so each object is reduced once
+        table = copyreg.dispatch_table.copy()
+        for cls in _subclasses(MetadataObject):
+            table[cls] = self._reduce
+        self.dispatch_table = table
+        self.objs: List[MetadataObject] = [root]
+        self._index: Dict[int, int] = {id(root): 0}
+
+    def _reduce(self, obj: MetadataObject) -> Tuple:
+        idx = self._index.get(id(obj))
+        if idx is not None:
+            return (_obj, (idx,))
+        # First sighting, the loader creates the object from its class
+        idx = len(self.objs)
+        self._index[id(obj)] = idx
+        self.objs.append(obj)
+        return (_obj, (idx, type(obj)))
+
+    def _state(self, idx: int, obj: MetadataObject) -> Dict:
+        state = obj._strong_state()
+        for name in obj._pickle_exclude:
+            state.pop(name, None)
+        parent = state.get("_parent")
+        if (
+            "ref" in state
+            and parent is not None
+            and self._index.get(id(parent), idx) < idx
+            and state["ref"] == _child_ref(obj, parent)
+        ):
+            del state["ref"]
+        return state
+
+    def dump_table(self) -> None:
+        """
+        Pickles the states of the objects in rounds, each round holds the
+        objects first seen while pickling the previous one
+        """
+        done = 0
+        while done < len(self.objs):
+            end = len(self.objs)
+            self.dump([self._state(i, self.objs[i]) for i in range(done, end)])
+            done = end
+
+
+def dumps(obj: MetadataObject, protocol: int) -> bytes:
+    """Pickles obj, and everything reachable from it, as a flat table"""
+    buf = io.BytesIO()
+    collect = gc.isenabled()
+    gc.disable()
+    try:
+        _FlatPickler(buf, max(protocol, 2), obj).dump_table()
+    finally:
+        if collect:
+            gc.enable()
+    return buf.getvalue()
+
+
+def loads(cls: Type[MetadataObject], data: bytes) -> MetadataObject:
+    """Restores an object pickled with dumps()"""
+    objs: List[MetadataObject] = [cls.__new__(cls)]
+    if not hasattr(_loading, "tables"):
+        _loading.tables = []
+    _loading.tables.append(objs)
+    # Loading (and dumping) only allocates, the cyclic collector would
+    # repeatedly scan the growing design for nothing
+    collect = gc.isenabled()
+    gc.disable()
+    try:
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        derived: List[Tuple[MetadataObject, MetadataObject]] = []
+        done = 0
+        while done < len(objs):
+            states = unpickler.load()
+            for obj, state in zip(objs[done : done + len(states)], states):
+                if "ref" not in state and state.get("_parent") is not None:
+                    derived.append((obj, state["_parent"]))
+                obj.__setstate__(state)
+            done += len(states)
+    finally:
+        _loading.tables.pop()
+        if collect:
+            gc.enable()
+    for obj, parent in derived:
+        obj.__dict__["ref"] = _child_ref(obj, parent)
+    return objs[0]
@@ -0,0 +1,34 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Keeping a parsed design out of the way of the cyclic garbage collector.
+
+A parsed design is hundreds of thousands of long lived objects, each full
+collection of the oldest generation traverses all of them again. Once a
+design has been loaded, freeze_gc() moves every object that is alive into
+the permanent generation, which the collector no longer scans. Frozen
+objects are still freed by reference counting, a module that has been
+disposed of (Module.dispose), or that uses weak parent links
+(Module.use_weak_parents), is released as soon as it is dropped.
+"""
+
+import gc
+
+
+def freeze_gc(collect: bool = True) -> int:
+    """
+    Moves every object tracked by the garbage collector into the permanent
+    generation, to be called once a design has been parsed. Garbage left
+    over from the parse is collected first unless collect is False.
+    Returns the number of objects in the permanent generation.
+    """
+    if collect:
+        gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def unfreeze_gc() -> None:
+    """Moves the objects of the permanent generation back to the oldest one"""
+    gc.unfreeze()
@@ -0,0 +1,309 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type, Union
+
+from .block import Block
+from .manager_port import ManagerPort
+from .metadata_object import MetadataObject
+from .module import Module
+from .port import Port
+from .subordinate_port import SubordinatePort
+
+Node = Union[str, MetadataObject]
+PortTypes = Optional[Union[Type[Port], Tuple[Type[Port], ...]]]
+Through = Optional[Callable[[Block], bool]]
+
+DIRECTIONS = ("downstream", "upstream", "any")
+
+
+def _drives(port: Port) -> Optional[bool]:
+    """
+    True if the port drives the block it connects to (managers, stream and
+    scalar outputs), False if it is driven, None if the port type does not say
+    """
+    if isinstance(port, ManagerPort):
+        return True
+    if isinstance(port, SubordinatePort):
+        return False
+    driver = getattr(port, "driver", None)
+    return driver if isinstance(driver, bool) else None
+
+
+class GraphQuery:
+    """
+    Graph queries over the connectivity of a Module, obtained with Module.graph()
+
+    The module is indexed once as a directed graph whose nodes are the ports
+    and blocks of the module (and of any modules within it):
+        * a wire between two ports points from the driving port to the
+          driven port, using the port type (ManagerPort -> SubordinatePort,
+          the driver flag of stream and scalar ports). The external ports of
+          a module drive inwards when they are driven from outside.
+        * a block points to each of the ports it drives and each port that
+          drives a block points to that block, so traversals pass through cores.
+    Wires whose direction cannot be determined are followed both ways.
+
+    The index and the results of every query are memoised until the
+    generation of the module changes (any connection or structural edit).
+    Queries can be made from several threads at once.
+
+    Queries take a start node as an object or a reference and accept:
+        * direction : "downstream", "upstream" or "any"
+        * port_types : only traverse ports of these types, e.g. (ManagerPort,
+          SubordinatePort) to follow memory mapped AXI
+        * through : a predicate on blocks, blocks that fail it are reached
+          but not traversed through
+    """
+
+    def __init__(self, module: Module) -> None:
+        self._module = module
+        self.generation: int = -1
+        self._nodes: List[MetadataObject] = []
+        self._nid: Dict[int, int] = {}
+        self._down: List[List[int]] = []
+        self._up: List[List[int]] = []
+        self._memo: Dict[Tuple, List[int]] = {}
+        self._mutex = threading.RLock()
+
+    def __getstate__(self) -> Dict:
+        # The index is keyed on object ids, which do not survive a copy
+        return {"_module": self._module}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["_module"])
+
+    # ---- index -------------------------------------------------------------
+
+    def _sync(self) -> None:
+        """Rebuilds the index if the module has changed since it was built"""
+        if self.generation != self._module._generation:
+            self._build()
+            self.generation = self._module._generation
+
+    def _node(self, obj: MetadataObject) -> int:
+        n = self._nid.get(id(obj))
+        if n is None:
+            n = len(self._nodes)
+            self._nid[id(obj)] = n
+            self._nodes.append(obj)
+            self._down.append([])
+            self._up.append([])
+        return n
+
+    def _edge(self, a: int, b: int) -> None:
+        self._down[a].append(b)
+        self._up[b].append(a)
+
+    def _collect(self, module: Module, ports: List[Port]) -> None:
+        """Adds the blocks of module, and their links to their ports, to the index"""
+        for block in module.blocks.values():
+            b = self._node(block)
+            for port in block.ports.values():
+                p = self._node(port)
+                ports.append(port)
+                drives = _drives(port)
+                if drives is not False:
+                    self._edge(b, p)
+                if drives is not True:
+                    self._edge(p, b)
+            if isinstance(block, Module):
+                self._collect(block, ports)
+
+    def _build(self) -> None:
+        self._nodes = []
+        self._nid = {}
+        self._down = []
+        self._up = []
+        self._memo = {}
+
+        ports: List[Port] = []
+        for port in self._module.ports.values():
+            self._node(port)
+            ports.append(port)
+        self._collect(self._module, ports)
+
+        seen: Set[Tuple[int, int]] = set()
+        for port in ports:
+            p = self._nid[id(port)]
+            for dst in port._destination_ports().values():
+                d = self._nid.get(id(dst))
+                if d is None or (p, d) in seen or (d, p) in seen:
+                    continue
+                seen.add((p, d))
+                fwd, bwd = self._wire_direction(port, dst)
+                if fwd:
+                    self._edge(p, d)
+                if bwd:
+                    self._edge(d, p)
+
+    @staticmethod
+    def _wire_direction(a: Port, b: Port) -> Tuple[bool, bool]:
+        """Returns (a drives b, b drives a) for a wire between two ports"""
+        role_a = _drives(a)
+        role_b = _drives(b)
+        # Seen from inside a module its external ports have the opposite role
+        if b._parent is not None and b._parent._parent is a._parent:
+            role_a = None if role_a is None else not role_a
+        elif a._parent is not None and a._parent._parent is b._parent:
+            role_b = None if role_b is None else not role_b
+        fwd = role_a is True or role_b is False
+        bwd = role_a is False or role_b is True
+        if fwd == bwd:
+            return True, True
+        return fwd, bwd
+
+    # ---- traversal ---------------------------------------------------------
+
+    def _resolve(self, node: Node) -> int:
+        obj = self._module.lookup(node) if isinstance(node, str) else node
+        n = self._nid.get(id(obj))
+        if n is None:
+            raise KeyError(f"{obj.ref} is not part of the graph of {self._module.ref}")
+        return n
+
+    def _neighbours(self, direction: str) -> Callable[[int], List[int]]:
+        if direction == "downstream":
+            return self._down.__getitem__
+        if direction == "upstream":
+            return self._up.__getitem__
+        if direction == "any":
+            return lambda n: self._down[n] + self._up[n]
+        raise ValueError(f"direction must be one of {DIRECTIONS} not {direction}")
+
+    def _expand(
+        self, start: int, direction: str, port_types: PortTypes, through: Through
+    ) -> Callable[[int], List[int]]:
+        """Returns the function giving the nodes to visit from a node"""
+        neighbours = self._neighbours(direction)
+        nodes = self._nodes
+
+        def expand(n: int) -> List[int]:
+            obj = nodes[n]
+            if n != start and through is not None and isinstance(obj, Block):
+                if not through(obj):
+                    return []
+            if port_types is None:
+                return neighbours(n)
+            return [
+                m
+                for m in neighbours(n)
+                if not isinstance(nodes[m], Port) or isinstance(nodes[m], port_types)
+            ]
+
+        return expand
+
+    def _reach(
+        self,
+        start: int,
+        direction: str,
+        port_types: PortTypes,
+        through: Through,
+        depth_first: bool,
+    ) -> List[int]:
+        key = ("reach", start, direction, port_types, through, depth_first)
+        if key not in self._memo:
+            expand = self._expand(start, direction, port_types, through)
+            order: List[int] = []
+            visited = {start}
+            pending = deque([start])
+            while len(pending) > 0:
+                n = pending.pop() if depth_first else pending.popleft()
+                if n != start:
+                    order.append(n)
+                nxt = expand(n)
+                if depth_first:
+                    nxt = list(reversed(nxt))
+                for m in nxt:
+                    if m not in visited:
+                        visited.add(m)
+                        pending.append(m)
+            self._memo[key] = order
+        return self._memo[key]
+
+    def reachable(
+        self,
+        start: Node,
+        direction: str = "downstream",
+        port_types: PortTypes = None,
+        through: Through = None,
+        depth_first: bool = False,
+    ) -> List[MetadataObject]:
+        """
+        Returns the ports and blocks reachable from start in breadth first
+        (or depth first) visiting order, not including start
+        """
+        with self._mutex:
+            self._sync()
+            order = self._reach(
+                self._resolve(start), direction, port_types, through, depth_first
+            )
+            return [self._nodes[n] for n in order]
+
+    def reachable_blocks(
+        self,
+        start: Node,
+        direction: str = "downstream",
+        port_types: PortTypes = None,
+        through: Through = None,
+    ) -> List[Block]:
+        """Returns only the blocks reachable from start, in breadth first order"""
+        return [
+            obj
+            for obj in self.reachable(start, direction, port_types, through)
+            if isinstance(obj, Block)
+        ]
+
+    def downstream_cone(
+        self, start: Node, port_types: PortTypes = None, through: Through = None
+    ) -> List[Block]:
+        """The blocks driven, directly or indirectly, by start"""
+        return self.reachable_blocks(start, "downstream", port_types, through)
+
+    def upstream_cone(
+        self, start: Node, port_types: PortTypes = None, through: Through = None
+    ) -> List[Block]:
+        """The blocks that drive, directly or indirectly, start"""
+        return self.reachable_blocks(start, "upstream", port_types, through)
+
+    def shortest_path(
+        self,
+        src: Node,
+        dst: Node,
+        direction: str = "downstream",
+        port_types: PortTypes = None,
+        through: Through = None,
+    ) -> List[MetadataObject]:
+        """
+        Returns the ports and blocks on a shortest path from src to dst,
+        including both ends, or an empty list if dst cannot be reached
+        """
+        with self._mutex:
+            self._sync()
+            s = self._resolve(src)
+            d = self._resolve(dst)
+            key = ("path", s, d, direction, port_types, through)
+            if key not in self._memo:
+                expand = self._expand(s, direction, port_types, through)
+                prev: Dict[int, int] = {s: s}
+                pending = deque([s])
+                while len(pending) > 0 and d not in prev:
+                    n = pending.popleft()
+                    for m in expand(n):
+                        if m not in prev:
+                            prev[m] = n
+                            pending.append(m)
+                path: List[int] = []
+                if d in prev:
+                    n = d
+                    while n != s:
+                        path.append(n)
+                        n = prev[n]
+                    path.append(s)
+                    path.reverse()
+                self._memo[key] = path
+            return [self._nodes[n] for n in self._memo[key]]
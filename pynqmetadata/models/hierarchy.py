@@ -4,7 +4,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Set
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Optional, Set
 
 from pydantic import Field
 from pynqmetadata.errors.construction_errors import (
@@ -17,9 +18,24 @@ from .core import Core
 from .metadata_object import MetadataObject
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Hierarchy(MetadataObject):
-    """A metadata object for hierarchies for groups of IP Cores"""
+    """
+    A metadata object for hierarchies for groups of IP Cores
+
+    Every hierarchy of a tree shares the same two indexes, held by
+    reference: _members maps the ref of each core and sub-hierarchy to the
+    hierarchies that directly hold one with that ref, _paths maps the path
+    of each sub-hierarchy to it. exists() looks the item up in _members and
+    follows the _up links of the holders, instead of searching every
+    sub-hierarchy, so allocating the hierarchies of a design is linear in
+    its number of cores.
+
+    The tree is a trie over the hierarchy_name paths of the cores. Each
+    hierarchy keeps the number of cores and sub-hierarchies below it, so
+    subtree counts are O(1), and the queries below walk only the part of
+    the tree they return.
+    """
 
     type: str = "hierarchy"
     generic_type: str = "hierarchy"
@@ -30,6 +46,11 @@ class Hierarchy(MetadataObject):
     _core_obj: Dict[str, Core] = field(default_factory=lambda: ({}))
     path: str = ""
     pr_region: bool = False
+    _up: Optional[Hierarchy] = None
+    _members: Dict[str, List[Hierarchy]] = field(default_factory=lambda: ({}))
+    _paths: Dict[str, Hierarchy] = field(default_factory=lambda: ({}))
+    _core_count: int = 0
+    _hierarchy_count: int = 0
 
     def exists(self, item: MetadataObject) -> bool:
         """
@@ -37,35 +58,137 @@ class Hierarchy(MetadataObject):
         to see if a sub-hierarchy is already present, returns true if present
         false otherwise.
         """
-        if isinstance(item, Core):
-            if item.ref in self._core_obj:
-                return True
-            else:
-                for h in self._hierarchies_obj.values():
-                    if h.exists(item):
-                        return True
-            return False
-        elif isinstance(item, Hierarchy):
-            if item.ref in self._hierarchies_obj:
-                return True
-            else:
-                for h in self._hierarchies_obj.values():
-                    if h.exists(item):
-                        return True
-            return False
-        else:
+        if not isinstance(item, (Core, Hierarchy)):
             raise UnexpectedMetadataObjectType(
                 f"Checking {item.ref} exists in {self.ref} but did not expect type {type(item)}"
             )
+        for h in self._members.get(item.ref, ()):
+            held = h._core_obj if isinstance(item, Core) else h._hierarchies_obj
+            if item.ref in held and self._encloses(h):
+                return True
+        return False
+
+    def _encloses(self, h: Hierarchy) -> bool:
+        """Returns true if h is this hierarchy or one of its sub-hierarchies"""
+        if self._up is None:
+            # The root of the tree, the indexes only hold hierarchies of the tree
+            return True
+        while h is not None:
+            if h is self:
+                return True
+            h = h._up
+        return False
+
+    def _walk(self) -> Iterator[Hierarchy]:
+        """Yields this hierarchy and all of its sub-hierarchies"""
+        stack = [self]
+        while stack:
+            h = stack.pop()
+            yield h
+            stack.extend(h._hierarchies_obj.values())
+
+    def _adopt(self, h: Hierarchy) -> None:
+        """Makes the sub-hierarchy h, and everything below it, share the indexes of this tree"""
+        h._up = self
+        if h._members is not self._members:
+            for ref, holders in h._members.items():
+                self._members.setdefault(ref, []).extend(holders)
+            self._paths.update(h._paths)
+            for sub in h._walk():
+                sub._members = self._members
+                sub._paths = self._paths
+        if h.path:
+            self._paths[h.path] = h
+
+    def _count(self, cores: int, hierarchies: int) -> None:
+        """Adds to the subtree counts of this hierarchy and every hierarchy above it"""
+        h = self
+        while h is not None:
+            state = h.__dict__
+            state["_core_count"] += cores
+            state["_hierarchy_count"] += hierarchies
+            h = h._up
+
+    @property
+    def core_count(self) -> int:
+        """The number of cores in this hierarchy and all of its sub-hierarchies"""
+        return self._core_count
+
+    @property
+    def hierarchy_count(self) -> int:
+        """The number of sub-hierarchies below this hierarchy, at any depth"""
+        return self._hierarchy_count
+
+    def cores(self, recursive: bool = True) -> Dict[str, Core]:
+        """
+        Returns the cores of this hierarchy, keyed by ref, including those of
+        all its sub-hierarchies unless recursive is False
+        """
+        if not recursive:
+            return dict(self._core_obj)
+        ret: Dict[str, Core] = {}
+        for h in self._walk():
+            ret.update(h._core_obj)
+        return ret
+
+    def hierarchies(self, recursive: bool = True) -> Dict[str, Hierarchy]:
+        """
+        Returns the sub-hierarchies of this hierarchy, keyed by path, at any
+        depth unless recursive is False
+        """
+        if not recursive:
+            return {h.path: h for h in self._hierarchies_obj.values()}
+        return {h.path: h for h in self._walk() if h is not self}
+
+    def match(self, pattern: str) -> Dict[str, Hierarchy]:
+        """
+        Returns the sub-hierarchies whose path, relative to this hierarchy,
+        matches the glob pattern, keyed by path. Each level of the pattern
+        matches one level of the path with fnmatch wildcards, e.g.
+        "channel_*" or "audio/*/filters", and a "**" level matches any
+        number of levels. Levels without wildcards are looked up directly
+        rather than matched against every sub-hierarchy.
+        """
+        ret: Dict[str, Hierarchy] = {}
+        self._match(pattern.split("/"), ret)
+        return ret
+
+    def _match(self, levels: List[str], ret: Dict[str, Hierarchy]) -> None:
+        level, rest = levels[0], levels[1:]
+        subs = self._hierarchies_obj
+        if level == "**":
+            if rest:
+                self._match(rest, ret)
+            for h in subs.values():
+                if not rest:
+                    ret[h.path] = h
+                h._match(levels, ret)
+            return
+        if any(c in level for c in "*?["):
+            matched = [h for h in subs.values() if fnmatchcase(h.name, level)]
+        else:
+            matched = [subs[level]] if level in subs else []
+        for h in matched:
+            if rest:
+                h._match(rest, ret)
+            else:
+                ret[h.path] = h
+
+    def lookup_path(self, path: str) -> Hierarchy:
+        """Returns the sub-hierarchy with the given path, raises KeyError if there is none"""
+        return self._paths[path]
 
     def add(self, item: MetadataObject) -> None:
         """
         Adds either a sub-hierarchy or a block to this hierarchy model
         """
+        self._invalidate_hash()
         if isinstance(item, Core):
             if not self.exists(item):
                 self.core_ref.add(item.ref)
                 self._core_obj[item.ref] = item
+                self._members.setdefault(item.ref, []).append(self)
+                self._count(1, 0)
             else:
                 raise CoreAlreadyExists(
                     f"Adding {item.ref} to hierarchy {self.ref} but it already exists"
@@ -74,6 +197,9 @@ class Hierarchy(MetadataObject):
             if not self.exists(item):
                 self.hierarchies_ref.add(item.ref)
                 self._hierarchies_obj[item.ref] = item
+                self._members.setdefault(item.ref, []).append(self)
+                self._adopt(item)
+                self._count(item._core_count, item._hierarchy_count + 1)
             else:
                 raise HierarchyAlreadyExists(
                     f"Adding Hierarchy {item.ref} as a sub-hierarchy to {self.ref} but it already exists"
@@ -82,3 +208,27 @@ class Hierarchy(MetadataObject):
             raise UnexpectedMetadataObjectType(
                 f"Trying to add {item.ref} to hierarchy {self.ref} but it is of type {type(item)} which is not a hierarchy or a block"
             )
+
+    def _dispose(self) -> None:
+        super()._dispose()
+        hierarchies = list(self._hierarchies_obj.values())
+        self.__dict__["_hierarchies_obj"] = {}
+        self.__dict__["_core_obj"] = {}
+        self.__dict__["_members"] = {}
+        self.__dict__["_paths"] = {}
+        self.__dict__["_up"] = None
+        self.__dict__["_core_count"] = 0
+        self.__dict__["_hierarchy_count"] = 0
+        for h in hierarchies:
+            h._dispose()
+
+    def _freeze(self) -> None:
+        """The sub-hierarchies are frozen along with this hierarchy"""
+        super()._freeze()
+        for h in self._hierarchies_obj.values():
+            h._freeze()
+
+    def _thaw(self) -> None:
+        super()._thaw()
+        for h in self._hierarchies_obj.values():
+            h._thaw()
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from .core import Core
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class IPCore(Core):
     """
     Specialised core class for standard PL IP cores
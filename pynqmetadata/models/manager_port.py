@@ -8,13 +8,13 @@ from typing import Dict, Optional
 
 from pydantic import Field
 
-from ..errors import AddressMapAlreadyExists, AddrMapNotFound, MergeConflict
+from ..errors import AddressMapAlreadyExists, AddrMapNotFound
 from .addrmap import AddressMap
 from .port import Port
 from .subordinate_port import SubordinatePort
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class ManagerPort(Port):
     """
     Model that describes a Manager Port object
@@ -42,12 +42,16 @@ class ManagerPort(Port):
         for i, adr in self.addrmap.items():
             if adr in self.addrmap:
                 if a.addrmap[adr] != self.addrmap[adr]:
-                    raise MergeConflict(
+                    self._merge_conflict(
                         f"{a.addrmap[adr]=} conflicts with {self.addrmap[adr]=}"
                     )
             else:
                 self.addrmap[i] = adr
 
+    def _dispose(self) -> None:
+        super()._dispose()
+        self.__dict__["_addrmap_obj"] = {}
+
     def addrmap_exists(self, subord_port: SubordinatePort) -> bool:
         """returns true if a SubordinatePort exists in the address map for this manager"""
         return subord_port.ref in self.addrmap
@@ -57,6 +61,7 @@ class ManagerPort(Port):
         if self.addrmap_exists(subord_port):
             del self._addrmap_obj[subord_port.ref]
             del self.addrmap[subord_port.ref]
+            self._invalidate_hash()
         else:
             raise AddrMapNotFound(
                 f"Could not find an address map from manager {self.ref} to subordinate {subord_port.ref}"
@@ -72,6 +77,7 @@ class ManagerPort(Port):
             self.addrmap[subord_port.ref]["block"] = block
             self.addrmap[subord_port.ref]["memtype"] = memtype
             self.addrmap[subord_port.ref]["subord_port"] = subord_port.ref
+            self._invalidate_hash()
         else:
             raise AddressMapAlreadyExists(
                 f"{subord_port.ref} is already an address target of manager {self.ref}"
@@ -0,0 +1,194 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Memory footprint of a module, see Module.memory_report().
+
+Every metadata object in the module is visited once, through the child
+links of the tree, the ext spaces and the busses and hierarchies of each
+module. The deep
+size of an object is its shallow size plus everything reachable from its
+instance dict that is not another metadata object: strings, containers,
+parameter tables, ext payloads, signal stores, indexes and so on. Each of
+those is counted once, under the first object that reaches it, so the
+deep sizes add up to the footprint of the whole module and strings shared
+between objects, interned names in particular, are not counted twice.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import weakref
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import TYPE_CHECKING, Dict, List, Set
+
+from .metadata_object import MetadataObject
+
+if TYPE_CHECKING:
+    from .module import Module
+
+# Objects that are not followed, anything reachable from them is not part of the module
+_OPAQUE = (
+    MetadataObject,
+    type,
+    ModuleType,
+    FunctionType,
+    BuiltinFunctionType,
+    MethodType,
+    weakref.ref,
+)
+
+_SCALARS = {int, float, bool, bytes, type(None)}
+
+
+class _Walker:
+    def __init__(self) -> None:
+        self.seen: Set[int] = set()
+        self.strings = 0
+        self.string_size = 0
+        self.ext_size = 0
+        # Metadata objects held in ext spaces, visited like children
+        self.ext_objs: Set[int] = set()
+        self.classes: Dict[str, Dict[str, int]] = {}
+
+    def contents(self, objs: List[object]) -> int:
+        """The size of objs, and of everything reachable from them, not seen before"""
+        seen = self.seen
+        getsizeof = sys.getsizeof
+        size = 0
+        while objs:
+            # One level at a time, the referents of a whole level are
+            # gathered by a single gc.get_referents() call
+            fresh = {
+                id(o): o
+                for o in objs
+                if id(o) not in seen and not isinstance(o, _OPAQUE)
+            }
+            seen.update(fresh)
+            containers = []
+            objs = []
+            for o in fresh.values():
+                n = getsizeof(o)
+                size += n
+                cls = type(o)
+                if cls is str:
+                    self.strings += 1
+                    self.string_size += n
+                elif cls not in _SCALARS:
+                    containers.append(o)
+                    if isinstance(o, dict):
+                        # Dicts with string keys only report their values
+                        objs.extend(o)
+            objs.extend(gc.get_referents(*containers))
+        return size
+
+    def visit(self, obj: MetadataObject) -> int:
+        """Accounts for obj against its class, returns its deep size"""
+        state = obj.__dict__
+        self.seen.add(id(obj))
+        self.seen.add(id(state))
+        shallow = sys.getsizeof(obj) + sys.getsizeof(state)
+        deep = shallow
+        ext = state.get("ext")
+        if ext:
+            n = self.contents([ext])
+            self.ext_size += n
+            deep += n
+            for v in ext.values():
+                if isinstance(v, MetadataObject):
+                    self.ext_objs.add(id(v))
+        # The keys of the instance dict are the field names shared by every instance
+        deep += self.contents(list(state.values()))
+        stats = self.classes.get(type(obj).__name__)
+        if stats is None:
+            stats = self.classes[type(obj).__name__] = {
+                "count": 0,
+                "shallow": 0,
+                "deep": 0,
+            }
+        stats["count"] += 1
+        stats["shallow"] += shallow
+        stats["deep"] += deep
+        if id(obj) in self.ext_objs:
+            self.ext_size += deep
+        return deep
+
+    @staticmethod
+    def links(obj: MetadataObject) -> List[MetadataObject]:
+        """
+        The objects below obj, its children, the metadata objects in its
+        ext space and, for a module, its busses and hierarchies
+        """
+        from .module import Module
+
+        ret = list(obj._children.values())
+        ext = obj.__dict__.get("ext")
+        if ext:
+            ret.extend(v for v in ext.values() if isinstance(v, MetadataObject))
+        if isinstance(obj, Module):
+            ret.extend(obj._bus_objects())
+            if obj._hierarchies is not None:
+                ret.append(obj._hierarchies)
+        elif "_hierarchies_obj" in obj.__dict__:
+            ret.extend(obj.__dict__["_hierarchies_obj"].values())
+        return ret
+
+    def walk(self, stack: List[MetadataObject]) -> Dict[str, int]:
+        """Visits the objects on the stack, and every object below them, not seen before"""
+        objects = 0
+        deep = 0
+        while stack:
+            obj = stack.pop()
+            if id(obj) in self.seen:
+                continue
+            objects += 1
+            deep += self.visit(obj)
+            stack.extend(self.links(obj))
+        return {"objects": objects, "deep": deep}
+
+
+def memory_report(module: Module, top: int = 10) -> Dict:
+    """
+    Returns the memory footprint of module as a dict of plain values, ready
+    for json.dumps():
+        * ref, objects, shallow, deep : totals over the whole module
+        * classes : count, shallow and deep size per class, largest first
+        * strings : number and size of the distinct strings
+        * ext : size of the ext payloads
+        * largest_blocks : ref, class, objects and deep size of the top
+          blocks of the module with the largest deep size
+    The shallow size of an object includes its instance dict. Sizes are in
+    bytes, as reported by sys.getsizeof().
+    """
+    walker = _Walker()
+    # The module itself holds the busses, indexes and signal store
+    walker.visit(module)
+    blocks: List[Dict] = []
+    for block in module.blocks.values():
+        stats = walker.walk([block])
+        blocks.append(
+            {
+                "ref": block.ref,
+                "class": type(block).__name__,
+                "objects": stats["objects"],
+                "deep": stats["deep"],
+            }
+        )
+    # The ports, parameters, busses and hierarchies of the module
+    walker.walk(walker.links(module))
+
+    classes = dict(
+        sorted(walker.classes.items(), key=lambda i: i[1]["deep"], reverse=True)
+    )
+    blocks.sort(key=lambda b: b["deep"], reverse=True)
+    return {
+        "ref": module.ref,
+        "objects": sum(c["count"] for c in classes.values()),
+        "shallow": sum(c["shallow"] for c in classes.values()),
+        "deep": sum(c["deep"] for c in classes.values()),
+        "classes": classes,
+        "strings": {"count": walker.strings, "size": walker.string_size},
+        "ext": walker.ext_size,
+        "largest_blocks": blocks[:top],
+    }
@@ -0,0 +1,190 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Three-way merge of metadata objects, see Module.merge3().
+
+The changes going from a base model to theirs are applied onto ours, the
+changes made locally on ours (going from base to ours) are kept. A change
+is a field whose value differs, a child object that was added or removed,
+an extension that was added, replaced or removed, or a connection of a
+signal that was added or removed. Subtrees with the same content hash in
+base and theirs have not changed and are skipped without being walked.
+
+A field changed differently on both sides, an object removed on one side
+but changed on the other, or added on both sides with different content,
+is a conflict. Ours keeps its version and the conflict is recorded with
+MetadataObject._merge_conflict().
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import fields
+from typing import Dict, List, Mapping, Optional
+
+from .block import Block
+from .diff import _is_child_container
+from .metadata_object import MetadataObject
+from .parameter_table import ParameterTable
+from .port import Port
+from .signal import Signal
+
+# Public fields that are not merged: the ref follows from where the object
+# is and the busses of a module are derived from its connections
+_SKIPPED = ("ref", "busses")
+
+
+def _value_bytes(obj: MetadataObject, value: object) -> Optional[List[bytes]]:
+    """The canonical bytes content_hash() uses for a field value"""
+    out: List[bytes] = []
+    obj._hash_value(value, out)
+    return out
+
+
+def merge3_objects(
+    ours: MetadataObject, base: MetadataObject, theirs: MetadataObject
+) -> None:
+    """
+    Applies the changes going from base to theirs onto ours, recursively.
+    The cached content hashes must be current (see MetadataObject._drop_hashes).
+    """
+    if base.content_hash() == theirs.content_hash():
+        return
+    for f in fields(ours):
+        name = f.name
+        if name[0] == "_" or name in _SKIPPED:
+            continue
+        mine = getattr(ours, name)
+        old = getattr(base, name, None)
+        new = getattr(theirs, name, None)
+        if isinstance(mine, ParameterTable):
+            _merge3_parameters(ours, mine, old, new)
+        elif name == "ext":
+            _merge3_ext(ours, mine, old, new)
+        elif (
+            _is_child_container(mine)
+            or _is_child_container(old)
+            or _is_child_container(new)
+        ):
+            _merge3_children(ours, mine, old or {}, new or {})
+        elif name == "con_refs" and isinstance(ours, Signal):
+            _merge3_connections(ours, old, new)
+        else:
+            before = _value_bytes(ours, old)
+            after = _value_bytes(ours, new)
+            if before == after:
+                continue
+            current = _value_bytes(ours, mine)
+            if current == before:
+                setattr(ours, name, copy.deepcopy(new))
+            elif current != after:
+                ours._merge_conflict(f"{name} was changed both here and in theirs")
+
+
+def _merge3_children(
+    ours: MetadataObject, container: Dict, base: Mapping, theirs: Mapping
+) -> None:
+    for key, new in theirs.items():
+        old = base.get(key)
+        mine = container.get(key)
+        if old is None:
+            if mine is None:
+                # Added in theirs, the object is moved into ours
+                ours._insert_child(container, new)
+            elif mine.content_hash() != new.content_hash():
+                ours._merge_conflict(
+                    f"{key} was added both here and in theirs with different content"
+                )
+        elif mine is None:
+            if old.content_hash() != new.content_hash():
+                ours._merge_conflict(f"{key} was removed here but changed in theirs")
+        elif type(old) is not type(new):
+            if mine.content_hash() == old.content_hash():
+                _remove_child(ours, container, mine)
+                ours._insert_child(container, new)
+            else:
+                ours._merge_conflict(f"{key} was changed here but replaced in theirs")
+        else:
+            merge3_objects(mine, old, new)
+
+    for key, old in base.items():
+        if key in theirs:
+            continue
+        mine = container.get(key)
+        if mine is None:
+            continue
+        if mine.content_hash() == old.content_hash():
+            _remove_child(ours, container, mine)
+        else:
+            ours._merge_conflict(f"{key} was changed here but removed in theirs")
+
+
+def _remove_child(ours: MetadataObject, container: Dict, child: MetadataObject) -> None:
+    """Removes a child, along with its connections for blocks, ports and signals"""
+    if isinstance(child, (Block, Port, Signal)):
+        child.remove(refresh=False)
+    else:
+        ours._delete_child(container, child)
+
+
+def _merge3_ext(ours: MetadataObject, mine: Dict, base: Dict, theirs: Dict) -> None:
+    for key in list(base.keys()) + [k for k in theirs.keys() if k not in base]:
+        before = _value_bytes(ours, base[key]) if key in base else None
+        after = _value_bytes(ours, theirs[key]) if key in theirs else None
+        if before == after:
+            continue
+        current = _value_bytes(ours, mine[key]) if key in mine else None
+        if current == before:
+            if key in theirs:
+                mine[key] = theirs[key]
+            else:
+                del mine[key]
+        elif current != after:
+            ours._merge_conflict(f"extension {key} was changed both here and in theirs")
+
+
+def _merge3_connections(ours: Signal, base: List[str], theirs: List[str]) -> None:
+    removed = set(base) - set(theirs)
+    for ref in [c for c in ours.con_refs if c in removed]:
+        if ours._packed() or ref in ours._connections:
+            ours._remove_con_ref(ref)
+        else:
+            ours.con_refs.remove(ref)
+            ours._invalidate_hash()
+    known = set(base)
+    for ref in theirs:
+        if ref in known or ref in ours.con_refs:
+            continue
+        # Linked to the signal object by the next refresh, as after merge()
+        if ours._packed():
+            ours._store.add_con_ref(ours._idx, ref)
+        else:
+            ours.con_refs.append(ref)
+        ours._invalidate_hash()
+
+
+def _merge3_parameters(
+    ours: MetadataObject,
+    mine: ParameterTable,
+    base: ParameterTable,
+    theirs: ParameterTable,
+) -> None:
+    """Parameters are merged on their raw values without creating Parameter objects"""
+    for name in list(base) + [n for n in theirs if n not in base]:
+        before = base.value(name) if name in base else None
+        after = theirs.value(name) if name in theirs else None
+        if name in base and name in theirs and before == after:
+            continue
+        current = mine.value(name) if name in mine else None
+        if (name in mine) == (name in base) and current == before:
+            if name not in theirs:
+                del mine[name]
+            elif name in mine:
+                mine[name].value = after
+            else:
+                mine.add_value(name, after)
+        elif (name in mine) != (name in theirs) or current != after:
+            ours._merge_conflict(
+                f"parameter {name} was changed both here and in theirs"
+            )
@@ -4,19 +4,134 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import weakref
+from collections.abc import Mapping
 from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import ClassVar, Dict, List, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
-from ..errors import MergeConflict, MetadataObjectNotFound
+from ..errors import FrozenModuleModified, MergeConflict, MetadataObjectNotFound
+from . import flat_pickle
+from .copy_on_write import CopyOnReadDict, CowContext, CowDict
 from .metadata_extension import MetadataExtension
+from .rw_lock import WRITE_METHODS, writes
 from .vlnv import Vlnv
 
 
-@dataclass(repr=False)
+class _ExtDict(dict):
+    """
+    The dict used for the ext space of a metadata object. Invalidates the
+    content hash of the owning object whenever an extension is added,
+    replaced or removed.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._owner: Optional[weakref.ref] = None
+
+    def _invalidate(self) -> None:
+        owner = self._owner() if self._owner is not None else None
+        if owner is not None:
+            owner._invalidate_hash()
+
+    def __setitem__(self, key, value) -> None:
+        dict.__setitem__(self, key, value)
+        self._invalidate()
+
+    def __delitem__(self, key) -> None:
+        dict.__delitem__(self, key)
+        self._invalidate()
+
+    def pop(self, *args):
+        self._invalidate()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._invalidate()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._invalidate()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs) -> None:
+        dict.update(self, *args, **kwargs)
+        self._invalidate()
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._invalidate()
+
+    def __reduce__(self):
+        return (_ExtDict, (dict(self),))
+
+
+class _FrozenDict(dict):
+    """
+    The dict used for the public containers of an object in a frozen module,
+    every method that would modify it raises FrozenModuleModified.
+    """
+
+    # Unpickling fills the dict before restoring the instance state
+    _sealed = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._sealed = True
+
+    def _check_not_frozen(self) -> None:
+        if self._sealed:
+            raise FrozenModuleModified("This dict belongs to a frozen module")
+
+    def __setitem__(self, key, value) -> None:
+        self._check_not_frozen()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        self._check_not_frozen()
+        dict.__delitem__(self, key)
+
+    def __ior__(self, other):
+        self._check_not_frozen()
+        return dict.__ior__(self, other)
+
+    def pop(self, *args):
+        self._check_not_frozen()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._check_not_frozen()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._check_not_frozen()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs) -> None:
+        self._check_not_frozen()
+        dict.update(self, *args, **kwargs)
+
+    def clear(self) -> None:
+        self._check_not_frozen()
+        dict.clear(self)
+
+    def __copy__(self) -> _FrozenDict:
+        return _FrozenDict(self)
+
+    def __deepcopy__(self, memo: Dict) -> _FrozenDict:
+        ret = _FrozenDict.__new__(_FrozenDict)
+        memo[id(self)] = ret
+        for key, value in self.items():
+            dict.__setitem__(ret, key, copy.deepcopy(value, memo))
+        ret._sealed = True
+        return ret
+
+
+@dataclass(repr=False, eq=False)
 class MetadataObject:
     """
     Base metadata object
@@ -30,6 +145,201 @@ class MetadataObject:
     ref: str = ""
     ext: Dict[str, MetadataExtension] = field(default_factory=lambda: ({}))
     _timestamp: float = 0.0
+    _hash: Optional[str] = None
+
+    # Private fields that are not pickled, they revert to their defaults
+    _pickle_exclude: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        The methods that modify a design (add, merge, refresh, remove, connect
+        and disconnect) hold the write lock of a locked module while they run
+        """
+        super().__init_subclass__(**kwargs)
+        for name in WRITE_METHODS:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, "_writes", False):
+                setattr(cls, name, writes(method))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Assigning to any public field (other than ref) invalidates the content
+        hash, the public fields of an object in a frozen module cannot be assigned
+        """
+        if name[0] != "_" and self.__dict__.get("_frozen"):
+            raise FrozenModuleModified(f"{self.ref} belongs to a frozen module")
+        if name == "_parent" and self._set_parent_link(value):
+            return
+        if name == "ext" and not (
+            isinstance(value, _ExtDict)
+            and value._owner is not None
+            and value._owner() is self
+        ):
+            value = _ExtDict(value)
+            value._owner = weakref.ref(self)
+        object.__setattr__(self, name, value)
+        if name[0] != "_" and name != "ref":
+            self._invalidate_hash()
+
+    def _set_parent_link(self, parent: Optional[MetadataObject]) -> bool:
+        """
+        Stores a weak link to the parent if the parent uses weak parent links
+        (see Module.use_weak_parents), returns False if the link is strong
+        and is left for __setattr__ to store.
+        """
+        state = self.__dict__
+        if (
+            parent is None
+            or not parent.__dict__.get("_weak_parents")
+            or type(self)._parent is not _PARENT_LINK
+        ):
+            state.pop("_parent_ref", None)
+            return False
+        state.pop("_parent", None)
+        state["_parent_ref"] = weakref.ref(parent)
+        if not state.get("_weak_parents"):
+            self._use_weak_parents()
+        return True
+
+    def _use_weak_parents(self) -> None:
+        """Switches this object, and everything below it, to weak parent links"""
+        state = self.__dict__
+        state["_weak_parents"] = True
+        parent = state.pop("_parent", None)
+        if parent is not None:
+            state["_parent_ref"] = weakref.ref(parent)
+        for child in self._children.values():
+            if not child.__dict__.get("_weak_parents"):
+                child._use_weak_parents()
+
+    def _strong_state(self) -> Dict:
+        """A copy of the instance state with the parent link made strong"""
+        state = dict(self.__dict__)
+        ref = state.pop("_parent_ref", None)
+        if ref is not None:
+            state["_parent"] = ref()
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Restores a pickled or deep copied object, taking ownership of its ext space"""
+        self.__dict__.update(state)
+        ext = state.get("ext")
+        if isinstance(ext, _ExtDict):
+            ext._owner = weakref.ref(self)
+        if state.get("_weak_parents") and "_parent" in state:
+            parent = self.__dict__.pop("_parent")
+            if parent is not None:
+                self.__dict__["_parent_ref"] = weakref.ref(parent)
+
+    def __reduce_ex__(self, protocol: int):
+        """
+        Pickles this object, and every metadata object reachable from it, as
+        a flat table of object states linked by index (see flat_pickle).
+        Metadata objects pickled separately, e.g. two blocks passed in one
+        tuple, are restored as separate copies of the design.
+        """
+        return (flat_pickle.loads, (type(self), flat_pickle.dumps(self, protocol)))
+
+    def __copy__(self):
+        ret = type(self).__new__(type(self))
+        ret.__setstate__(dict(self.__dict__))
+        return ret
+
+    def __deepcopy__(self, memo: Dict):
+        ret = type(self).__new__(type(self))
+        memo[id(self)] = ret
+        ret.__setstate__(copy.deepcopy(self._strong_state(), memo))
+        return ret
+
+    def _invalidate_hash(self) -> None:
+        """
+        Clears the cached content hash of this object and all of its parents.
+        The walk goes all the way up, a parent can keep a cached hash after
+        one of the objects between it and this object has dropped its own.
+        """
+        obj = self
+        while obj is not None:
+            if obj.__dict__.get("_hash") is not None:
+                object.__setattr__(obj, "_hash", None)
+            obj = obj._parent
+
+    def _drop_hashes(self) -> None:
+        """
+        Clears the cached content hash of this object and of every object
+        below it, the hashes computed afterwards see in-place changes that
+        were made since they were cached.
+        """
+        if self.__dict__.get("_hash") is not None:
+            object.__setattr__(self, "_hash", None)
+        for name, _ in _hashed_fields(type(self)):
+            value = getattr(self, name)
+            if type(value) not in _REPR_HASHED:
+                _drop_value_hashes(value)
+
+    def _hash_value(self, value: object, out: List[bytes]) -> None:
+        """Appends a canonical byte representation of a field value to out"""
+        if type(value) in _REPR_HASHED:
+            out.append(repr(value).encode())
+        elif isinstance(value, MetadataObject):
+            out.append(value.content_hash().encode())
+        elif type(value) is dict or isinstance(value, Mapping):
+            out.append(b"{")
+            if hasattr(value, "_hashed_items"):
+                # Lazy containers (e.g. ParameterTable) hash without creating objects
+                for key, h in sorted(value._hashed_items(), key=lambda kv: str(kv[0])):
+                    out.append(repr(key).encode())
+                    out.append(h.encode())
+            else:
+                for key in sorted(value.keys(), key=str):
+                    out.append(repr(key).encode())
+                    item = value[key]
+                    if type(item) in _REPR_HASHED:
+                        out.append(repr(item).encode())
+                    else:
+                        self._hash_value(item, out)
+            out.append(b"}")
+        elif isinstance(value, (list, tuple)):
+            out.append(b"[")
+            for item in value:
+                if type(item) in _REPR_HASHED:
+                    out.append(repr(item).encode())
+                else:
+                    self._hash_value(item, out)
+            out.append(b"]")
+        elif isinstance(value, (set, frozenset)):
+            out.append(repr(sorted(repr(item) for item in value)).encode())
+        elif isinstance(value, Vlnv):
+            out.append(value.str.encode())
+        elif isinstance(value, BaseModel):
+            out.append(json.dumps(value.dict(), sort_keys=True, default=repr).encode())
+        else:
+            out.append(repr(value).encode())
+
+    def content_hash(self) -> str:
+        """
+        Returns a hash of the content of this object: its public fields (other
+        than ref, which depends on where the object sits in a design) with
+        child objects contributing their own content hash. The hash is cached
+        and invalidated up the parent chain when the object is modified, so
+        repeated calls are O(1). Only assignments to fields, ext entries and
+        the methods that add or remove children invalidate it, in-place
+        changes to a container (e.g. addrmap, or an extension object) are
+        not seen. __eq__ compares the fields themselves and is not affected,
+        and merges drop the cached hashes before relying on them.
+        """
+        ret = self.__dict__.get("_hash")
+        if ret is None:
+            out: List[bytes] = []
+            for name, encoded in _hashed_fields(type(self)):
+                out.append(encoded)
+                value = getattr(self, name)
+                if type(value) in _REPR_HASHED:
+                    out.append(repr(value).encode())
+                else:
+                    self._hash_value(value, out)
+            ret = hashlib.blake2b(b"\0".join(out), digest_size=16).hexdigest()
+            object.__setattr__(self, "_hash", ret)
+        return ret
 
     def walk_up_tree_timestamp_update(self, timestamp: float) -> None:
         """Recursively walk up the tree until you can't anymore
@@ -47,8 +357,48 @@ class MetadataObject:
         self.ref = self.name
         self._timestamp = datetime.timestamp(datetime.now())
 
+    def _same_content(self, a: MetadataObject) -> bool:
+        """
+        Returns true if a is known to have the same content as this object,
+        merging it would then not change anything. Content hashes are only
+        compared inside a Module.merge, which drops the cached hashes of both
+        sides first, a hash cached before may miss an in-place change.
+        """
+        if self is a:
+            return True
+        return self._in_fresh_merge() and self.content_hash() == a.content_hash()
+
+    def _in_fresh_merge(self) -> bool:
+        """True if a module above this object is merging with freshly computed hashes"""
+        obj = self
+        while obj is not None:
+            if "_fresh_hashes" in obj.__dict__:
+                return True
+            obj = obj._parent
+        return False
+
+    def _merge_conflict(self, message: str) -> None:
+        """
+        Raises a MergeConflict, unless a module above this object is
+        collecting the conflicts of a merge (see Module.merge), then it is
+        recorded and the conflicting field keeps its current value.
+        """
+        obj = self
+        while obj is not None:
+            conflicts = obj.__dict__.get("_merge_conflicts")
+            if conflicts is not None:
+                conflicts.append(MergeConflict(f"{self.ref}: {message}"))
+                return
+            obj = obj._parent
+        raise MergeConflict(message)
+
     def _mo_merge(self, a: MetadataObject) -> None:
-        """Merges the base metadata object attributes. Raises an error if there are any conflicts"""
+        """
+        Merges the base metadata object attributes. Raises an error if there
+        are any conflicts. Objects of a different name or type cannot be
+        merged and always raise, even when collecting conflicts.
+        """
+        self._invalidate_hash()
         if self.name != a.name:
             raise MergeConflict(f"{self.name=} does not match {a.name=}")
         if self.type != a.type:
@@ -62,8 +412,10 @@ class MetadataObject:
             if a_ext not in self.ext.keys():
                 self.ext[a_ext] = a.ext[a_ext]
             else:
-                if self.ext[a_ext].dict() != a.ext[a_ext].dict():
-                    raise MergeConflict(
+                mine = self.ext[a_ext]
+                theirs = a.ext[a_ext]
+                if mine is not theirs and mine.dict() != theirs.dict():
+                    self._merge_conflict(
                         f"Extension space object {a_ext} is not equivalent for both objects"
                     )
 
@@ -120,7 +472,9 @@ class MetadataObject:
         # is it a set?
         elif isinstance(obj, set):
             ret = obj
-        elif isinstance(obj, dict):
+        elif isinstance(obj, Mapping) and hasattr(obj, "_dict_items"):
+            ret = obj._dict_items()
+        elif isinstance(obj, Mapping):
             ret = {}
             for name_i, i in obj.items():
                 ret[name_i] = self._obj_dict(i)
@@ -131,31 +485,81 @@ class MetadataObject:
     def dict(self) -> Dict:
         """renders the object as a dictionary, ignoring any fields that start with _"""
         ret = {}
-        for field in fields(self):
-            if not field.name.startswith("_"):
-                atr = getattr(self, field.name)
+        for f in fields(self):
+            if not f.name.startswith("_"):
+                atr = getattr(self, f.name)
                 if isinstance(atr, object):
-                    ret[field.name] = self._obj_dict(obj=atr)
+                    ret[f.name] = self._obj_dict(obj=atr)
                 else:
-                    ret[field.name] = atr
+                    ret[f.name] = atr
         return ret
 
-    def copy(self):
-        """Returns a deepcopy of the object"""
-        return copy.deepcopy(self)
+    def copy(self, cow: bool = False):
+        """
+        Returns a deepcopy of the object.
+
+        When cow is True a structural sharing copy is returned instead. Child
+        objects are only cloned (shallowly) the first time they are reached
+        through the copy, untouched subtrees stay shared with this object.
+        Private object links (_connections, _src_port, ...) of cloned objects
+        are mapped to the clones of the objects they point to, links to
+        objects outside of this object keep pointing to the originals.
+        """
+        if not cow or self._packed():
+            return copy.deepcopy(self)
+        return CowContext().clone(self, self._parent)
+
+    def _packed(self) -> bool:
+        """Returns true if any signals below this object are packed into a SignalStore"""
+        return False
+
+    def _cow_clone(self, ctx: CowContext, parent: Optional[MetadataObject]):
+        """
+        Shallow clone used by copy(cow=True). Containers of child objects are
+        wrapped in a CowDict, other mutable containers are copied so that
+        the clone can be modified without touching this object. Links to
+        other objects are mapped to their clones with CowContext.link(),
+        those held in a dict when they are first read.
+        """
+        ret = copy.copy(self)
+        # A copy of an object in a frozen module can be modified
+        ret.__dict__.pop("_frozen", None)
+        ret._parent = parent
+        for f in fields(self):
+            atr = getattr(self, f.name)
+            if f.name == "_children":
+                ret._children = CowDict(ctx, ret, atr)
+            elif isinstance(atr, dict):
+                if not f.name.startswith("_") and any(
+                    isinstance(v, MetadataObject) for v in atr.values()
+                ):
+                    setattr(ret, f.name, CowDict(ctx, ret, atr))
+                elif f.name.startswith("_"):
+                    if any(isinstance(v, MetadataObject) for v in atr.values()):
+                        setattr(ret, f.name, CopyOnReadDict(atr, ctx.link))
+                    else:
+                        setattr(ret, f.name, dict(atr))
+                else:
+                    setattr(ret, f.name, copy.deepcopy(dict(atr)))
+            elif isinstance(atr, (list, set, Vlnv)):
+                setattr(ret, f.name, copy.deepcopy(atr))
+            elif isinstance(atr, MetadataObject) and f.name != "_parent":
+                setattr(ret, f.name, ctx.link(atr))
+        return ret
 
     def __eq__(self, a: object) -> bool:
         """Returns true if the non-private member fields are equal, false otherwise"""
+        if self is a:
+            return True
         if not isinstance(a, MetadataObject):
             return False
-
-        for field in fields(self):
-            if not field.name.startswith("_"):
-                if field.name not in fields(a):
+        theirs = {f.name for f in fields(a)}
+        for f in fields(self):
+            if not f.name.startswith("_"):
+                if f.name not in theirs:
+                    return False
+                if getattr(self, f.name) != getattr(a, f.name):
                     return False
-                else:
-                    if getattr(self, field.name) != getattr(a, field.name):
-                        return False
         return True
 
     def __ne__(self, a: object) -> bool:
@@ -197,6 +601,7 @@ class MetadataObject:
         Adds a child to this metadata object
         """
         self._children[f"{item.name}[{item.generic_type}]"] = item
+        self._invalidate_hash()
         # if not self._child_exists(item):
         #    self._children[f"{item.name}[{item.generic_type}]"] = item
         # else:
@@ -204,6 +609,111 @@ class MetadataObject:
         #    f"{item.ref}[{item.generic_type}] type={type(item)} is already a child of {self.ref} type={type(self)} children={self._children.keys()}"
         # )
 
+    def _insert_child(self, container: Dict, item: MetadataObject) -> None:
+        """
+        Adds item to one of the child dicts of this object and makes this object
+        its parent, recording the edit if a batch is open
+        """
+        container[item.name] = item
+        item.set_parent(self)
+        self._bump_generation()
+        batch = self._active_batch()
+        if batch is not None:
+            batch.inserted(self, container, item)
+
+    def _delete_child(self, container: Dict, item: MetadataObject) -> None:
+        """
+        Removes item from one of the child dicts of this object, recording the
+        edit if a batch is open
+        """
+        pos = list(container.keys()).index(item.name)
+        del container[item.name]
+        self._invalidate_hash()
+        self._bump_generation()
+        batch = self._active_batch()
+        if batch is not None:
+            batch.deleted(self, container, item, pos)
+
+    def _bump_generation(self, structure: bool = True) -> None:
+        """
+        Advances the generation of every module above this object, marking
+        anything derived from the connectivity as out of date. The structure
+        generation is also advanced unless only connections have changed.
+        """
+        obj = self
+        while obj is not None:
+            state = obj.__dict__
+            if "_generation" in state:
+                state["_generation"] += 1
+                if structure:
+                    state["_structure_generation"] += 1
+            obj = obj._parent
+
+    def _active_batch(self):
+        """Returns the open Batch of the closest module above this object, if any"""
+        obj = self
+        while obj is not None:
+            batch = obj.__dict__.get("_batch")
+            if batch is not None:
+                return batch
+            obj = obj._parent
+        return None
+
+    def _dispose(self) -> None:
+        """
+        Drops the links from this object, and everything below it, back up
+        the tree and across it, see Module.dispose()
+        """
+        state = self.__dict__
+        children = list(self._children.values())
+        state.pop("_parent_ref", None)
+        if "_parent" in state:
+            state["_parent"] = None
+        if "_children" in state:
+            state["_children"] = {}
+        for child in children:
+            child._dispose()
+
+    def _freeze(self) -> None:
+        """
+        Marks this object and everything below it as part of a frozen module.
+        The public fields can no longer be assigned and their dicts are swapped
+        for read-only ones. The ext space stays writable, it holds annotations
+        layered on top of the design (driver bindings, interrupt indexes, ...).
+        """
+        state = self.__dict__
+        if state.get("_frozen"):
+            return
+        state["_frozen"] = True
+        for f in fields(self):
+            atr = state.get(f.name)
+            if f.name[0] != "_" and f.name != "ext" and type(atr) is dict:
+                state[f.name] = _FrozenDict(atr)
+        for child in self._children.values():
+            child._freeze()
+
+    def _thaw(self) -> None:
+        """Undoes _freeze() on this object and everything below it"""
+        state = self.__dict__
+        if not state.pop("_frozen", False):
+            return
+        for f in fields(self):
+            atr = state.get(f.name)
+            if isinstance(atr, _FrozenDict):
+                state[f.name] = dict(atr)
+        for child in self._children.values():
+            child._thaw()
+
+    def _active_lock(self):
+        """Returns the RWLock of the closest locked module above this object, if any"""
+        obj = self
+        while obj is not None:
+            lock = obj.__dict__.get("_lock")
+            if lock is not None:
+                return lock
+            obj = obj._parent
+        return None
+
     def parent(self) -> Optional[MetadataObject]:
         """
         Returns a reference to the parent of this object
@@ -232,3 +742,56 @@ class MetadataObject:
     def _repr_json_(self) -> str:
         """For pretty printing the objects to the jupyter repr"""
         return json.loads(json.dumps(self.dict(), default=self._default_repr))
+
+
+# Field values hashed as their repr()
+_REPR_HASHED = {str, int, float, bool, type(None)}
+
+# The (name, encoded name) of the fields hashed by content_hash(), per class
+_HASHED_FIELDS: Dict[type, List[Tuple[str, bytes]]] = {}
+
+
+def _hashed_fields(cls: type) -> List[Tuple[str, bytes]]:
+    ret = _HASHED_FIELDS.get(cls)
+    if ret is None:
+        ret = _HASHED_FIELDS[cls] = [
+            (f.name, f.name.encode())
+            for f in fields(cls)
+            if f.name[0] != "_" and f.name != "ref"
+        ]
+    return ret
+
+
+def _drop_value_hashes(value: object) -> None:
+    """MetadataObject._drop_hashes() of every object held in a field value"""
+    if isinstance(value, MetadataObject):
+        value._drop_hashes()
+    elif type(value) is dict or isinstance(value, Mapping):
+        # Lazy containers (e.g. ParameterTable) only cache hashes of the objects they created
+        objs = value._objs if hasattr(value, "_hashed_items") else value
+        for item in objs.values():
+            if type(item) not in _REPR_HASHED:
+                _drop_value_hashes(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            if type(item) not in _REPR_HASHED:
+                _drop_value_hashes(item)
+
+
+class _ParentLink:
+    """
+    MetadataObject._parent. A strong link to the parent is stored in the
+    instance dict, which takes precedence over this (non-data) descriptor,
+    so reading it costs the same as a plain attribute. A weak link is stored
+    as _parent_ref instead and is dereferenced here.
+    """
+
+    def __get__(self, obj: Optional[MetadataObject], cls: type = None):
+        if obj is None:
+            return self
+        ref = obj.__dict__.get("_parent_ref")
+        return None if ref is None else ref()
+
+
+_PARENT_LINK = _ParentLink()
+MetadataObject._parent = _PARENT_LINK
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from .core import Core
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class MicroblazeCore(Core):
     """
     A microblaze core type
@@ -1,25 +1,41 @@
 # Copyright (C) 2022 Xilinx, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from re import L
-from typing import Dict, List, Optional
+from typing import (TYPE_CHECKING, Callable, ContextManager, Dict, List,
+                    Mapping, Optional, Type, TypeVar, Union)
 
 from pynqmetadata.errors.metadata_type_errors import UnexpectedMetadataObjectType
 
-from ..errors import CoreAlreadyExists, UnexpectedPmdObject
+from ..errors import CoreAlreadyExists, MergeConflict, UnexpectedPmdObject
+from .batch import Batch
 from .block import Block
+from .block_index import BlockIndex
 from .bus_connection import BusConnection
+from .bus_map import BusMap
+from .copy_on_write import CowContext
 from .core import Core
+from .diff import ModelDiff, diff_objects
 from .hierarchy import Hierarchy
 from .manager_port import ManagerPort
 from .metadata_object import MetadataObject
 from .parameter import Parameter
 from .port import Port
 from .proc_sys_core import ProcSysCore
+from .rw_lock import FrozenLock, RWLock
+from .signal import Signal
 
+if TYPE_CHECKING:
+    from .adjacency import Adjacency
+    from .graph_query import GraphQuery
+    from .signal_store import SignalStore
 
-@dataclass(repr=False)
+T = TypeVar("T")
+
+
+@dataclass(repr=False, eq=False)
 class Module(Block):
     """
     A Metadata object that contains a hierarchy of
@@ -30,7 +46,15 @@ class Module(Block):
     blocks: Dict[str, Block] = field(default_factory=lambda: ({}))
     modules: Dict[str, MetadataObject] = field(default_factory=lambda: ({}))
     busses: Dict[str, BusConnection] = field(default_factory=lambda: ({}))
+    _bus_map: Optional[BusMap] = None
     _hierarchies: Optional[Hierarchy] = None
+    _signal_store: Optional["SignalStore"] = None
+    _batch: Optional[Batch] = None
+    _generation: int = 0
+    _structure_generation: int = 0
+    _graph: Optional["GraphQuery"] = None
+    _block_index: Optional[BlockIndex] = None
+    _lock: Optional[RWLock] = None
 
     def merge(
         self,
@@ -39,33 +63,141 @@ class Module(Block):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        collect_conflicts: bool = False,
     ) -> None:
+        """
+        Merges module a into this module, see Block.merge for the options.
+
+        Blocks, ports, signals, parameters and registers whose content
+        hashes are equal on both sides are skipped. The hashes cached on both
+        sides are dropped first, as they may miss in-place changes, and are
+        only computed for the objects present on both sides.
+
+        When collect_conflicts is True a conflict between the values of a
+        field does not stop the merge, the field keeps its current value and
+        the rest is merged. The conflicts are then raised together as one
+        MergeConflict, its errors are the MergeConflict of each field
+        prefixed with the ref of the object.
+        """
         assert isinstance(a, Module)
-        self._block_merge(
-            a,
-            skip_external=skip_external,
-            inherit_signal_width=inherit_signal_width,
-            inherit_addr_info=inherit_addr_info,
-            ignore_addr_info=ignore_addr_info,
-        )
+        if self is a:
+            return
+        batch = self._active_batch()
+        if batch is not None:
+            batch.full_refresh = True
+        self._bump_generation()
+        conflicts: Optional[List[MergeConflict]] = None
+        if collect_conflicts:
+            conflicts = self.__dict__["_merge_conflicts"] = []
+        # The outermost merge drops the cached hashes, see _same_content()
+        fresh = not self._in_fresh_merge()
+        if fresh:
+            self._drop_hashes()
+            a._drop_hashes()
+            self.__dict__["_fresh_hashes"] = True
+        try:
+            self._block_merge(
+                a,
+                skip_external=skip_external,
+                inherit_signal_width=inherit_signal_width,
+                inherit_addr_info=inherit_addr_info,
+                ignore_addr_info=ignore_addr_info,
+            )
 
-        for block in a.blocks:
-            if block in self.blocks:
-                self.blocks[block].merge(
-                    a.blocks[block],
-                    skip_external=skip_external,
-                    inherit_signal_width=inherit_signal_width,
-                    inherit_addr_info=inherit_addr_info,
-                    ignore_addr_info=ignore_addr_info,
-                )
-            else:
-                self.blocks[block] = a.blocks[block]
+            for block in a.blocks:
+                if block in self.blocks:
+                    mine = self.blocks[block]
+                    if not mine._same_content(a.blocks[block]):
+                        mine.merge(
+                            a.blocks[block],
+                            skip_external=skip_external,
+                            inherit_signal_width=inherit_signal_width,
+                            inherit_addr_info=inherit_addr_info,
+                            ignore_addr_info=ignore_addr_info,
+                        )
+                else:
+                    self.blocks[block] = a.blocks[block]
 
-        for mod in a.modules:
-            if mod in self.modules:
-                self.modules[mod].merge(a.modules[mod])
-            else:
-                self.modules[mod] = a.modules[mod]
+            for mod in a.modules:
+                if mod in self.modules:
+                    if not self.modules[mod]._same_content(a.modules[mod]):
+                        self.modules[mod].merge(a.modules[mod])
+                else:
+                    self.modules[mod] = a.modules[mod]
+        finally:
+            if conflicts is not None:
+                del self.__dict__["_merge_conflicts"]
+            if fresh:
+                del self.__dict__["_fresh_hashes"]
+        if conflicts:
+            raise MergeConflict(
+                f"{len(conflicts)} conflicts merging {a.ref} into {self.ref}",
+                errors=conflicts,
+            )
+
+    def merge3(self, base: "Module", theirs: "Module") -> None:
+        """
+        Three-way merge, applies the changes made going from base to theirs
+        onto this module and keeps the changes made locally since base.
+        Used to bring a design up to date with a newer version of the
+        hardware, base being the version this module was loaded from.
+
+        Subtrees with the same content hash in base and theirs are skipped
+        without being walked, refreshing a large design after a small change
+        only visits the objects along the path to that change. The hashes
+        cached on all three modules are dropped first, as they may miss
+        in-place changes (e.g. to an extension object).
+
+        Objects added in theirs are moved into this module, as with merge(),
+        theirs should not be used afterwards. Conflicts do not stop the
+        merge, this module keeps its version of the object and the conflicts
+        are raised together as one MergeConflict once done. Call refresh()
+        afterwards to relink the connections that changed.
+        """
+        from .merge3 import merge3_objects
+
+        assert isinstance(base, Module) and isinstance(theirs, Module)
+        batch = self._active_batch()
+        if batch is not None:
+            batch.full_refresh = True
+        self._bump_generation()
+        for md in (self, base, theirs):
+            md._drop_hashes()
+        conflicts: List[MergeConflict] = []
+        self.__dict__["_merge_conflicts"] = conflicts
+        try:
+            merge3_objects(self, base, theirs)
+        finally:
+            del self.__dict__["_merge_conflicts"]
+        if conflicts:
+            raise MergeConflict(
+                f"{len(conflicts)} conflicts merging {theirs.ref} into {self.ref}",
+                errors=conflicts,
+            )
+
+    def merge_blocks(
+        self,
+        merges: Mapping[str, Union["Module", Callable[[], "Module"]]],
+        workers: Optional[int] = None,
+        processes: bool = False,
+        **options,
+    ) -> None:
+        """
+        Merges a model into each of several module blocks of this module,
+        such as the block design containers of a design. The keys of merges
+        are the names of the blocks, the values the models to merge into
+        them or loaders, callables returning the model. Only the loaders run
+        in parallel, on a pool of worker threads (or processes if processes
+        is True, the loaders must then be picklable). The options are passed
+        on to merge().
+
+        The merges run one after the other and the design is refreshed once
+        at the end. All the merges are attempted, the conflicts of those
+        that failed are raised together as one MergeConflict once done.
+        """
+        from .parallel_merge import merge_blocks
+
+        merge_blocks(self, merges, workers=workers, processes=processes, **options)
 
     def exists(self, item: MetadataObject) -> bool:
         """Returns true if the item is in this model"""
@@ -84,8 +216,7 @@ class Module(Block):
             self._add(item)
         elif isinstance(item, Block):
             if not self.exists(item):
-                self.blocks[item.name] = item
-                item.set_parent(self)
+                self._insert_child(self.blocks, item)
             else:
                 raise CoreAlreadyExists(
                     f"{item.name} already exists in module {self.ref}"
@@ -101,7 +232,15 @@ class Module(Block):
             * populates all the connections
             * performs well-formdness checks on the design
             * populates the hierarchy mappings
+
+        While a batch is open on this module (or a module above it) the
+        refresh is deferred until the batch is committed.
         """
+        batch = self._active_batch()
+        if batch is not None:
+            return
+
+        self._bump_generation()
         if self.parent is None:
             self.ref = self.name
         else:
@@ -117,6 +256,242 @@ class Module(Block):
         self._populate_connections()
         self._allocate_hierarchies()
 
+    def bus_map(self) -> BusMap:
+        """
+        Returns the bus-level connections of this module as a read-only
+        mapping that is always up to date, unlike busses which holds them as
+        of the last refresh. Only the ports whose signals were connected or
+        disconnected since the last call are looked at again.
+        """
+        if self._bus_map is None:
+            self._bus_map = BusMap(self)
+        return self._bus_map
+
+    def _populate_connections(self) -> None:
+        """
+        Brings busses up to date with the bus-level connections of the design.
+        The BusConnection objects of existing busses are kept, busses whose
+        connection has gone are dropped.
+        """
+        live = self.bus_map().items()
+        refs = {ref for ref, _ in live}
+        changed = False
+        for ref in [r for r, b in self.busses.items() if isinstance(b, BusConnection)]:
+            if ref not in refs:
+                del self.busses[ref]
+                changed = True
+        for ref, bus in live:
+            if self.busses.get(ref) is not bus:
+                self.busses[ref] = bus
+                changed = True
+        if changed:
+            self._invalidate_hash()
+
+    def enable_locking(self) -> RWLock:
+        """
+        Makes this module, and everything within it, safe to share between
+        threads that read it while another thread modifies it. Enable it on
+        the top level module.
+
+        Every add, merge, merge3, merge_blocks, refresh, remove, connect and
+        disconnect on an object in the module (and every batch) holds the
+        write lock while it runs. Readers either hold the read lock with
+        reading(), or run without any lock through read(), which retries if
+        a write happened meanwhile.
+
+        Nothing else takes the lock: assigning to a field, writing to the
+        ext space or to a dict of the model, and the parameter table's
+        add_value() and merge() must be done within writing() if other
+        threads may be reading. The caches that readers fill in (port
+        destinations, the bus map, parameter objects) are safe to fill from
+        several readers at once.
+        """
+        if self._lock is None:
+            self._lock = RWLock()
+        return self._lock
+
+    def reading(self) -> ContextManager:
+        """
+        Context manager that holds the read lock, if locking is enabled, so
+        that the module cannot be modified while reading it
+        """
+        lock = self._active_lock()
+        return nullcontext() if lock is None else lock.read()
+
+    def writing(self) -> ContextManager:
+        """
+        Context manager that holds the write lock, if locking is enabled, so
+        that several edits appear to readers as a single change
+        """
+        lock = self._active_lock()
+        return nullcontext() if lock is None else lock.write()
+
+    def read(self, fn: Callable[["Module"], T]) -> T:
+        """
+        Returns fn(self), computed from a consistent state of the module.
+        With locking enabled fn runs without taking any lock and is rerun if
+        a writer was active while it ran (falling back to the read lock after
+        a few attempts). fn should only read, and return values rather than
+        objects that may later be modified.
+        """
+        lock = self._active_lock()
+        if lock is None:
+            return fn(self)
+        return lock.optimistic(lambda: fn(self))
+
+    def freeze(self) -> "Module":
+        """
+        Returns an immutable snapshot of this module that can be shared
+        between threads, and pickled to other processes, without any locking.
+
+        The snapshot is a copy with the refs, busses, port destinations,
+        block index, hierarchies and content hashes all computed up front.
+        Every add, merge, refresh, remove, connect and disconnect on it
+        (and every batch or writing()) raises FrozenModuleModified, as does
+        assigning to a public field or changing one of its dicts. The ext
+        space of each object stays writable for annotations such as those
+        made by the runtime views. copy() of a snapshot is another snapshot,
+        thaw() or copy(cow=True) return one that can be modified.
+        """
+        if self.__dict__.get("_frozen"):
+            return self
+        ret = self.copy()
+        ret._prepare_snapshot()
+        ret._freeze()
+        ret._lock = FrozenLock()
+        return ret
+
+    def thaw(self) -> "Module":
+        """Returns a copy of a frozen module that can be modified"""
+        ret = self.copy()
+        ret._thaw()
+        ret._lock = None
+        return ret
+
+    def _prepare_snapshot(self) -> None:
+        """Computes everything readers of a frozen module would otherwise build lazily"""
+        for block in self.blocks.values():
+            if isinstance(block, Module):
+                block._prepare_snapshot()
+        self.bus_map()._reindex()
+        self.bus_map().values()
+        self.select()
+        graph = self.graph()
+        with graph._mutex:
+            graph._sync()
+        self.content_hash()
+
+    def _freeze(self) -> None:
+        """The hierarchies and the busses are frozen along with the module"""
+        super()._freeze()
+        if self._hierarchies is not None:
+            self._hierarchies._freeze()
+        for bus in self._bus_objects():
+            bus._freeze()
+
+    def _thaw(self) -> None:
+        super()._thaw()
+        if self._hierarchies is not None:
+            self._hierarchies._thaw()
+        for bus in self.busses.values():
+            bus._thaw()
+        self._bus_map = None
+
+    def use_weak_parents(self) -> "Module":
+        """
+        Switches the links from every object in this module back to its
+        parent to weak references, returns the module.
+
+        The tree then holds no reference cycles through the parent links,
+        objects are freed by reference counting as soon as the module is
+        dropped instead of waiting for the cyclic collector. Objects added
+        later pick up weak links from their parent. The module, and every
+        parent up to it, must be kept alive by the caller, the parent() of
+        an object whose module has been dropped is None. Copies, pickles
+        and snapshots of the module also use weak parent links.
+        """
+        self._use_weak_parents()
+        for bus in self._bus_objects():
+            bus._use_weak_parents()
+        return self
+
+    def _bus_objects(self) -> List[BusConnection]:
+        """The BusConnection objects of busses and of the bus map"""
+        ret = {id(b): b for b in self.busses.values()}
+        if self._bus_map is not None:
+            ret.update((id(b), b) for b in self._bus_map._objs.values())
+        return list(ret.values())
+
+    def dispose(self) -> None:
+        """
+        Breaks every reference cycle within this module, so it is freed by
+        reference counting alone once the last reference to it is dropped.
+
+        The parent, child, connection, destination and address map links
+        of every object are cleared, along with the busses, hierarchies,
+        indexes and signal store of the module. The module, and the objects
+        that were in it, can no longer be used afterwards. Call it when no
+        other thread is reading the module.
+        """
+        self._dispose()
+
+    def _dispose(self) -> None:
+        busses = self._bus_objects()
+        bus_map = self._bus_map
+        store = self._signal_store
+        hierarchies = self._hierarchies
+        super()._dispose()
+        for bus in busses:
+            bus._dispose()
+        if bus_map is not None:
+            bus_map.__init__(None)
+        if hierarchies is not None:
+            hierarchies._dispose()
+        if store is not None:
+            store.__init__()
+        state = self.__dict__
+        state["busses"] = {}
+        state["_bus_map"] = None
+        state["_hierarchies"] = None
+        state["_signal_store"] = None
+        state["_graph"] = None
+        state["_block_index"] = None
+        state["_batch"] = None
+
+    def batch(self) -> Batch:
+        """
+        Returns a transaction for making structural edits to this module, used
+        as a context manager. Refreshes are deferred, connection polarity is
+        checked in bulk on exit and a single incremental refresh is performed.
+        The journaled edits are rolled back if an error is raised.
+        """
+        return Batch(self)
+
+    def _commit_batch(self, batch: Batch) -> None:
+        """
+        Refreshes the design after a batch of edits has been committed. Only
+        the busses of the modules whose ports were touched are brought up to
+        date, and only the hierarchies of those that had blocks added or
+        removed are rebuilt.
+        """
+        if batch.full_refresh:
+            self.refresh()
+            return
+        if batch.empty():
+            return
+
+        modules: Dict[int, Module] = {id(self): self}
+        for port in batch.dirty_ports() + batch.removed_ports():
+            parent = port._parent
+            owners = [parent, parent._parent if parent is not None else None]
+            for owner in owners:
+                if isinstance(owner, Module):
+                    modules[id(owner)] = owner
+        for mod in modules.values():
+            mod._populate_connections()
+            if batch.blocks_changed():
+                mod._allocate_hierarchies()
+
     def _relink_objects(self) -> None:
         """Using the string references, relink the objects together in the model"""
         for block in self.blocks.values():
@@ -127,9 +502,135 @@ class Module(Block):
                             port.addrmap[addr]["subord_port"]
                         )
 
+                if isinstance(port.signals, dict):
+                    for sig in port.signals.values():
+                        for con in sig.con_refs:
+                            sig._set_connection(con, self.lookup(con))
+
+        if self._signal_store is not None:
+            self._signal_store.relink(self)
+
+    def pack_signals(self) -> "SignalStore":
+        """
+        Packs the signals of all the block ports and external ports of this module
+        into a struct-of-arrays SignalStore (requires numpy). Port.signals becomes a
+        dict-like facade and Signal objects are created on demand as views onto the
+        store. Returns the store, which can be used for vectorised queries
+        (fan_out, total_width, polarity_violations, ...)
+        """
+        from .signal_store import SignalStore
+
+        if self._signal_store is None:
+            ports = [p for b in self.blocks.values() for p in b.ports.values()]
+            ports.extend(self.ports.values())
+            self._signal_store, views = SignalStore.from_ports(ports)
+            self._retarget_connections(lambda sig: views.get(id(sig)))
+        return self._signal_store
+
+    def unpack_signals(self) -> None:
+        """Converts a packed module back to using a Signal object per signal"""
+        store = self._signal_store
+        if store is not None:
+            sigs = store.unpack()
+            self._signal_store = None
+
+            def _unpacked(sig: Signal) -> Optional[Signal]:
+                idx = store.index_of(sig)
+                return None if idx is None else sigs[idx]
+
+            self._retarget_connections(_unpacked)
+
+    def _retarget_connections(
+        self, replacement: Callable[[Signal], Optional[Signal]]
+    ) -> None:
+        """Walks every signal in this module (and any modules within it) swapping
+        connected signal objects for the one returned by replacement"""
+        ports = [p for b in self.blocks.values() for p in b.ports.values()]
+        ports.extend(self.ports.values())
+        for port in ports:
+            port._invalidate_destinations()
+            if isinstance(port.signals, dict):
                 for sig in port.signals.values():
-                    for con in sig.con_refs:
-                        sig._connections[con] = self.lookup(con)
+                    for con, dst in sig._connections.items():
+                        new = replacement(dst)
+                        if new is not None:
+                            sig._connections[con] = new
+                    for con, src in sig._incoming.items():
+                        new = replacement(src)
+                        if new is not None:
+                            sig._incoming[con] = new
+        for block in self.blocks.values():
+            if isinstance(block, Module):
+                block._retarget_connections(replacement)
+
+    def graph(self) -> "GraphQuery":
+        """
+        Returns the graph query engine for this module (reachability, shortest
+        paths, upstream/downstream cones). Its index and query results are
+        reused until a connection or the structure of the module changes.
+        """
+        from .graph_query import GraphQuery
+
+        if self._graph is None:
+            self._graph = GraphQuery(self)
+        return self._graph
+
+    def memory_report(self, top: int = 10) -> Dict:
+        """
+        Returns the memory footprint of this module as a dict of plain
+        values that can be passed to json.dumps(): the instance count,
+        shallow and deep size of each class of object, the size of the
+        strings and ext payloads, and the top blocks with the largest deep
+        size (see memory_report). The read lock is held while walking the
+        module. Only objects that exist are counted, parameters and busses
+        that have not been created yet are part of the size of their block
+        or module.
+        """
+        from .memory_report import memory_report
+
+        with self.reading():
+            return memory_report(self, top)
+
+    def port_adjacency(self) -> "Adjacency":
+        """
+        Returns the port-level connectivity of this module, and the modules
+        within it, as a graph in CSR form (requires numpy). Use
+        Adjacency.to_scipy() to get a scipy.sparse matrix.
+        """
+        from .adjacency import port_adjacency
+
+        return port_adjacency(self)
+
+    def signal_adjacency(self) -> "Adjacency":
+        """
+        Returns the signal-level connectivity of this module, and the modules
+        within it, as a graph in CSR form (requires numpy). Use
+        Adjacency.to_scipy() to get a scipy.sparse matrix.
+        """
+        from .adjacency import signal_adjacency
+
+        return signal_adjacency(self)
+
+    def _cow_clone(self, ctx: CowContext, parent: Optional[MetadataObject]):
+        """The bus map of the clone is derived from the cloned ports"""
+        ret = super()._cow_clone(ctx, parent)
+        ret._bus_map = None
+        ret._graph = None
+        ret._block_index = None
+        # A copy of a frozen module can be modified and is not locked
+        locked = self._lock is not None and not isinstance(self._lock, FrozenLock)
+        ret._lock = RWLock() if locked else None
+        return ret
+
+    def _packed(self) -> bool:
+        """Returns true if this module, or any module within it, has packed signals"""
+        return self._signal_store is not None or any(
+            b._packed() for b in self.blocks.values() if isinstance(b, Module)
+        )
+
+    def signal_store(self) -> Optional["SignalStore"]:
+        """Returns the SignalStore for this module if its signals have been packed"""
+        return self._signal_store
 
     def _update_parents(self) -> None:
         """Walk down through the module and makes sure all the parent references are accurate
@@ -140,40 +641,8 @@ class Module(Block):
             b.set_parent(self)
             b._update_parents()
         for b in self.busses.values():
-            b.set_parent(self)
-
-    def _populate_connections(self) -> None:
-        """
-        Populates bus-level connections in the design. Walks over the signal
-        level wiring to determine this
-        """
-        for c in self.blocks.values():
-            for p in c.ports.values():
-                for d in p.destinations().values():
-                    con_name = f"{p.ref}->{d.ref}"
-                    conn = BusConnection(
-                        name=con_name,
-                        ref=con_name,
-                        src_port=p.ref,
-                        dst_port=d.ref,
-                        _src_port=p,
-                        _dst_port=d,
-                    )
-                    self.busses[conn.ref] = conn
-
-        # External ports
-        for p in self.ports.values():
-            for d in p.destinations().values():
-                con_name = f"{p.ref}->{d.ref}"
-                conn = BusConnection(
-                    name=con_name,
-                    ref=con_name,
-                    src_port=p.ref,
-                    dst_port=d.ref,
-                    _src_port=p,
-                    _dst_port=d,
-                )
-                self.busses[conn.ref] = conn
+            # Not set_parent(), the ref of a bus is not derived from its parent
+            b._parent = self
 
     def _allocate_hierarchies(self) -> None:
         """
@@ -228,28 +697,72 @@ class Module(Block):
             else:
                 h.add(core)
 
-    def _hierarchy_recurse_search(self, hier:Hierarchy, hier_name:List[str])->Hierarchy:
-        """ Used by hierarchy() to recursively walk down the hierarchy tree 
-        searching for the matching hierarchy"""
-        if len(hier_name) == 1:
-            return hier._hierarchies_obj[hier_name[0]] 
-        else:
-            return self._hierarchy_recurse_search(hier=hier._hierarchies_obj[hier_name[0]], hier_name=hier_name[1:])
-        
-
     def hierarchy(self, hier_name:str)->Hierarchy:
         """ Given a hierarchy string, where levels are separated by a /, 
         return a hierarchy model from this module"""
-        hn_split = hier_name.split("/")
-        return self._hierarchy_recurse_search(hier_name=hn_split, hier=self._hierarchies)
+        return self._hierarchies.lookup_path(hier_name)
+
+    def match_hierarchies(self, pattern: str) -> Dict[str, Hierarchy]:
+        """
+        Returns the hierarchies of this module whose path matches the glob
+        pattern, keyed by path, e.g. "channel_*" or "audio/**/filters", see
+        Hierarchy.match. The cores below a hierarchy are returned by its
+        cores() method and counted by its core_count.
+        """
+        return self._hierarchies.match(pattern)
+
+    def diff(self, other: "Module") -> ModelDiff:
+        """
+        Returns the structural differences between this module and other, i.e.
+        the blocks, ports, signals, parameters, registers and connections that
+        were added, removed or changed going from this module to other.
+        Identical subtrees are skipped using their content hashes, the hashes
+        cached on both sides are dropped first as they may miss in-place
+        changes (e.g. to an extension object).
+        """
+        self._drop_hashes()
+        other._drop_hashes()
+        ret = ModelDiff()
+        diff_objects(self, other, ret)
+        return ret
+
+    def select(
+        self,
+        cls: Optional[Type[Block]] = None,
+        type: Optional[str] = None,
+        vlnv: Optional[str] = None,
+        parameters: Optional[Dict[str, object]] = None,
+    ) -> Dict[str, Block]:
+        """
+        Returns the blocks of this module that match all of the given criteria,
+        in the order of self.blocks, using indexes kept up to date as blocks
+        are added and removed
+
+        param
+        ---------
+        * cls : blocks that are instances of this class, e.g. ProcSysCore
+        * type : blocks with this type string, e.g. "core-ip"
+        * vlnv : a full VLNV, a versionless VLNV or a glob pattern,
+          e.g. "xilinx.com:ip:axi_dma:*"
+        * parameters : parameter names mapped to the required value, or to
+          None to only require that the parameter exists
+        """
+        index = self._block_index
+        generation = self._structure_generation
+        if index is None or index.generation != generation:
+            # Built before being published so concurrent readers never see a
+            # partially built index
+            index = BlockIndex()
+            index.build(self, generation)
+            self._block_index = index
+        return {
+            b.name: b
+            for b in index.select(cls=cls, type=type, vlnv=vlnv, parameters=parameters)
+        }
 
     def get_processing_systems(self) -> Dict[str, ProcSysCore]:
         """Returns a list of processing system blocks that are in the design"""
-        core_set: Dict[str, ProcSysCore] = {}
-        for core in self.blocks.values():
-            if isinstance(core, ProcSysCore):
-                core_set[core.name] = core
-        return core_set
+        return self.select(cls=ProcSysCore)
 
     def get_dict_of_block_instances_with(self, name: str) -> Dict[str, MetadataObject]:
         """
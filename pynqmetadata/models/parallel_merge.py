@@ -0,0 +1,116 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Merging models into several module blocks of a design at once, see
+Module.merge_blocks().
+
+Only the loading of the models is parallel. The loaders run on a pool, a
+thread pool or, as parsing is CPU bound, a process pool. A model made by
+a worker process comes back as a flat pickle (see flat_pickle) so only
+loaders, not models, need to be picklable.
+
+The merges themselves are object walks that would gain nothing from
+threads and run one after the other. Each target module is detached
+from the design while it is merged, so the steps that walk up the parent
+links (generation counters, hash invalidation, open batches, locks and
+conflict collection) stop at the target. Each target is then refreshed,
+as after a merge() into it, and the design is updated once at the end.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from ..errors import MergeConflict, UnexpectedMetadataObjectType
+
+if TYPE_CHECKING:
+    from .module import Module
+
+Loader = Callable[[], "Module"]
+K = TypeVar("K")
+
+
+def _call(loader: Loader) -> Module:
+    return loader()
+
+
+def load_models(
+    merges: Mapping[K, Union[Module, Loader]],
+    workers: Optional[int] = None,
+    processes: bool = False,
+) -> Dict[K, Module]:
+    """
+    Returns the model for each key of merges, running the loaders on a pool
+    of threads or of processes if processes is True
+    """
+    from .module import Module
+
+    models = {n: m for n, m in merges.items() if isinstance(m, Module)}
+    loaders = {n: m for n, m in merges.items() if not isinstance(m, Module)}
+    if loaders:
+        pool: Executor = (
+            ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+        )
+        with pool:
+            futures = {n: pool.submit(_call, loader) for n, loader in loaders.items()}
+            models.update({n: f.result() for n, f in futures.items()})
+    return models
+
+
+def merge_blocks(
+    module: Module,
+    merges: Mapping[str, Union[Module, Loader]],
+    workers: Optional[int] = None,
+    processes: bool = False,
+    **options,
+) -> None:
+    """See Module.merge_blocks"""
+    from .module import Module
+
+    targets: Dict[str, Module] = {}
+    for name in merges:
+        target = module.blocks[name]
+        if not isinstance(target, Module):
+            raise UnexpectedMetadataObjectType(
+                f"{target.ref} is not a module, models can only be merged into modules"
+            )
+        targets[name] = target
+    models = load_models(merges, workers, processes)
+
+    conflicts: List[MergeConflict] = []
+    for target in targets.values():
+        target._parent = None
+    try:
+        for name, target in targets.items():
+            try:
+                target.merge(models[name], **options)
+            except MergeConflict as e:
+                conflicts.append(MergeConflict(f"{target.ref}: {e}", e.errors))
+    finally:
+        for target in targets.values():
+            target._parent = module
+    for target in targets.values():
+        target.refresh()
+
+    batch = module._active_batch()
+    if batch is not None:
+        batch.full_refresh = True
+    module._bump_generation()
+    module._invalidate_hash()
+    module.refresh()
+    if conflicts:
+        raise MergeConflict(
+            f"{len(conflicts)} of {len(targets)} merges into {module.ref} conflicted",
+            errors=conflicts,
+        )
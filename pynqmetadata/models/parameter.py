@@ -3,15 +3,50 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Optional
-
-from pynqmetadata.errors.construction_errors import MergeConflict
+from typing import Optional, Union
 
 from .metadata_object import MetadataObject
 
+Typed = Union[None, bool, int, float, str]
+
+_INT = re.compile(r"[+-]?[0-9]+")
+_FLOAT = re.compile(r"[+-]?([0-9]+\.[0-9]*|\.[0-9]+|[0-9]+(?=[eE]))([eE][+-]?[0-9]+)?")
+
 
-@dataclass(repr=False)
+def parse_int(raw: str) -> int:
+    """Convert a hex (0x prefixed) or decimal string into an int"""
+    return int(raw, 16 if raw[:2] in ("0x", "0X") else 10)
+
+
+def typed_value(raw: Optional[str]) -> Typed:
+    """
+    Interprets the raw string value of a parameter:
+        * "true"/"false" (any case) : bool
+        * 0x prefixed hex (addresses) or decimal integers : int
+        * decimal floating point : float
+        * anything else (enumerations, names) : the string itself
+    """
+    if raw is None:
+        return None
+    s = raw.strip()
+    low = s.lower()
+    if low == "true" or low == "false":
+        return low == "true"
+    if low[:2] == "0x":
+        try:
+            return int(s, 16)
+        except ValueError:
+            return raw
+    if _INT.fullmatch(s):
+        return int(s)
+    if _FLOAT.fullmatch(s):
+        return float(s)
+    return raw
+
+
+@dataclass(repr=False, eq=False)
 class Parameter(MetadataObject):
     """
     A model for a Pmd parameter
@@ -22,11 +57,25 @@ class Parameter(MetadataObject):
     generic_type: str = "parameter"
     value: Optional[str] = None
 
+    def __setattr__(self, name: str, value: object) -> None:
+        """Changing the raw value discards the cached typed value"""
+        if name == "value":
+            self.__dict__.pop("_typed", None)
+        super().__setattr__(name, value)
+
+    @property
+    def typed(self) -> Typed:
+        """The value interpreted with typed_value(), computed once and cached"""
+        state = self.__dict__
+        if "_typed" not in state:
+            state["_typed"] = typed_value(self.value)
+        return state["_typed"]
+
     def merge(self, a: Parameter) -> None:
         """Attempt to merge the two parameters, raise an error if there is a conflict"""
         self._mo_merge(a)
         if self.value is not None and a.value is not None:
             if self.value != a.value:
-                raise MergeConflict(f"{self.value=} conflicts with {a.value=}")
+                self._merge_conflict(f"{self.value=} conflicts with {a.value=}")
         else:
             self.value = a.value
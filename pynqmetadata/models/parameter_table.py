@@ -0,0 +1,306 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from ..errors import FrozenModuleModified, MergeConflict
+from .parameter import Parameter, Typed, typed_value
+
+if TYPE_CHECKING:
+    from .copy_on_write import CowContext
+    from .metadata_object import MetadataObject
+
+
+def _raw_dict(name: str, value: Optional[str], ref: str) -> Dict:
+    """The dict() of a Parameter with no extensions, without creating it"""
+    return {
+        "name": name,
+        "type": "parameter",
+        "generic_type": "parameter",
+        "ref": ref,
+        "ext": {},
+        "value": value,
+    }
+
+
+def _raw_hash(name: str, value: Optional[str]) -> str:
+    """The content_hash() of a Parameter with no extensions, without creating it"""
+    out = [
+        b"name",
+        repr(name).encode(),
+        b"type",
+        b"'parameter'",
+        b"generic_type",
+        b"'parameter'",
+        b"ext",
+        b"{",
+        b"}",
+        b"value",
+        repr(value).encode(),
+    ]
+    return hashlib.blake2b(b"\0".join(out), digest_size=16).hexdigest()
+
+
+class ParameterTable(MutableMapping):
+    """
+    Dict-like facade used as Block.parameters.
+
+    The parameters are kept as two parallel lists, the (interned) names and
+    the raw values. A Parameter object is only created the first time it is
+    looked up and is then kept, it becomes the owner of the value from then
+    on. Processing system cores carry thousands of parameters, most of which
+    are never looked at individually, so this avoids a Parameter (with its
+    own ref, timestamp, ext dict and parent link) for each of them.
+
+    value(), raw_items(), dict() rendering and content hashing all read the
+    raw values without creating any Parameter objects. typed() and
+    typed_items() return the values interpreted by typed_value(), which are
+    computed once per parameter and cached alongside the raw values.
+
+    The table of a block in a frozen module is frozen along with it, adding,
+    replacing, removing and merging parameters then raise.
+    """
+
+    def __init__(
+        self, owner: Optional[MetadataObject], src: Optional[Mapping] = None
+    ) -> None:
+        self._owner = owner
+        self._names: List[str] = []
+        self._values: List[Optional[str]] = []
+        self._pos: Dict[str, int] = {}
+        self._objs: Dict[str, Parameter] = {}
+        self._typed: Dict[str, Typed] = {}
+        self._frozen: bool = False
+        if isinstance(src, ParameterTable):
+            self._names = list(src._names)
+            self._values = list(src._values)
+            self._pos = dict(src._pos)
+            self._objs = dict(src._objs)
+            self._typed = dict(src._typed)
+        elif src is not None:
+            for name, param in src.items():
+                self._set(name, param)
+
+    def _append(self, name: str, value: Optional[str]) -> None:
+        name = sys.intern(name)
+        self._pos[name] = len(self._names)
+        self._names.append(name)
+        self._values.append(value)
+
+    def _set(self, name: str, param: Parameter) -> None:
+        pos = self._pos.get(name)
+        if pos is None:
+            self._append(name, param.value)
+        else:
+            self._values[pos] = param.value
+            self._typed.pop(name, None)
+        self._objs[name] = param
+
+    def _invalidate(self) -> None:
+        if self._owner is not None:
+            self._owner._invalidate_hash()
+
+    def _merge_conflict(self, message: str) -> None:
+        """Reports a conflict through the owner, see MetadataObject._merge_conflict"""
+        if self._owner is None:
+            raise MergeConflict(message)
+        self._owner._merge_conflict(message)
+
+    def _check_not_frozen(self) -> None:
+        if self._frozen:
+            raise FrozenModuleModified(
+                f"The parameters of {self._owner.ref} belong to a frozen module"
+            )
+
+    def add_value(self, name: str, value: Optional[str]) -> None:
+        """
+        Adds a parameter from its name and raw value without creating a
+        Parameter object. Like Block.add, an existing parameter is kept.
+        """
+        self._check_not_frozen()
+        if name in self._pos:
+            return
+        self._append(name, value)
+        if self._owner is not None:
+            self._owner._invalidate_hash()
+            self._owner._bump_generation()
+
+    def value(self, name: str) -> Optional[str]:
+        """Returns the value of a parameter, raises KeyError if it does not exist"""
+        param = self._objs.get(name)
+        if param is not None:
+            return param.value
+        return self._values[self._pos[name]]
+
+    def typed(self, name: str) -> Typed:
+        """
+        Returns the typed value of a parameter (see typed_value), raises
+        KeyError if it does not exist
+        """
+        param = self._objs.get(name)
+        if param is not None:
+            return param.typed
+        cache = self._typed
+        if name not in cache:
+            cache[name] = typed_value(self._values[self._pos[name]])
+        return cache[name]
+
+    def typed_items(self) -> Dict[str, Typed]:
+        """Returns the typed value of every parameter keyed on name, in order"""
+        return {name: self.typed(name) for name in self._names}
+
+    def raw_items(self) -> List[Tuple[str, Optional[str]]]:
+        """Returns (name, value) for every parameter, in order"""
+        objs = self._objs
+        return [
+            (name, objs[name].value if name in objs else value)
+            for name, value in zip(self._names, self._values)
+        ]
+
+    def __getitem__(self, name: str) -> Parameter:
+        param = self._objs.get(name)
+        if param is None:
+            param = Parameter(name=name, value=self._values[self._pos[name]])
+            if name in self._typed:
+                param.__dict__["_typed"] = self._typed[name]
+            # Only the first of several threads creating the object keeps it
+            winner = self._objs.setdefault(name, param)
+            if winner is not param:
+                return winner
+            owner = self._owner
+            if owner is not None:
+                # Parent the object without invalidating any content hashes,
+                # creating it does not change the content of the block. A
+                # cached hash on the owner implies one on its children.
+                param._parent = owner
+                param.ref = f"{owner.ref}:{name}[parameter]"
+                owner._children[f"{name}[parameter]"] = param
+                if self._frozen:
+                    param._freeze()
+                if owner.__dict__.get("_hash") is not None:
+                    object.__setattr__(param, "_hash", _raw_hash(name, param.value))
+        return param
+
+    def __setitem__(self, name: str, param: Parameter) -> None:
+        self._check_not_frozen()
+        self._set(name, param)
+        self._invalidate()
+
+    def __delitem__(self, name: str) -> None:
+        self._check_not_frozen()
+        pos = self._pos.pop(name)
+        del self._names[pos]
+        del self._values[pos]
+        for n in self._names[pos:]:
+            self._pos[n] -= 1
+        self._objs.pop(name, None)
+        self._typed.pop(name, None)
+        self._invalidate()
+
+    def _restore(self, param: Parameter) -> None:
+        """Undoes the removal of a parameter, it is added back at the end"""
+        self._set(param.name, param)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._pos
+
+    def __repr__(self) -> str:
+        return f"ParameterTable({dict(self.raw_items())})"
+
+    def _materialised(self) -> List[Parameter]:
+        """The Parameter objects that have been created so far"""
+        return list(self._objs.values())
+
+    def _ref(self, name: str) -> str:
+        if self._owner is None:
+            return name
+        return f"{self._owner.ref}:{name}[parameter]"
+
+    def _hashed_items(self) -> List[Tuple[str, str]]:
+        """(name, content hash) of every parameter, as used by content_hash()"""
+        objs = self._objs
+        return [
+            (
+                name,
+                objs[name].content_hash() if name in objs else _raw_hash(name, value),
+            )
+            for name, value in zip(self._names, self._values)
+        ]
+
+    def _dict_items(self) -> Dict[str, Dict]:
+        """The dict() of every parameter, keyed on name, as used by dict()"""
+        objs = self._objs
+        return {
+            name: (
+                objs[name].dict()
+                if name in objs
+                else _raw_dict(name, value, self._ref(name))
+            )
+            for name, value in zip(self._names, self._values)
+        }
+
+    def lookup(self, key: str) -> Optional[Parameter]:
+        """Resolves a 'name[parameter]' child key (case insensitive, like MetadataObject._lookup)"""
+        if not key.endswith("[parameter]"):
+            return None
+        name = key[: -len("[parameter]")]
+        for n in (name, name.upper(), name.lower()):
+            if n in self._pos:
+                return self[n]
+        return None
+
+    def merge(self, a: Mapping) -> None:
+        """
+        Merges the parameters of another block into this table, with the same
+        conflict rules as Parameter.merge. Parameters that only exist as raw
+        values on both sides are merged without creating objects.
+        """
+        self._check_not_frozen()
+        raw = isinstance(a, ParameterTable)
+        for name in a:
+            if raw and name not in a._objs:
+                theirs = a._values[a._pos[name]]
+                pos = self._pos.get(name)
+                if pos is None:
+                    self._append(name, theirs)
+                    continue
+                if name not in self._objs:
+                    mine = self._values[pos]
+                    if mine is not None and theirs is not None:
+                        if mine != theirs:
+                            self._merge_conflict(
+                                f"parameter {name} self.value={mine!r} conflicts with a.value={theirs!r}"
+                            )
+                    else:
+                        self._values[pos] = theirs
+                        self._typed.pop(name, None)
+                    continue
+            if name in self._pos:
+                self[name].merge(a[name])
+            else:
+                self._set(name, a[name])
+        self._invalidate()
+
+    def _cow_copy(self, ctx: CowContext, owner: MetadataObject) -> ParameterTable:
+        """
+        The table for a structural sharing copy of the owner. The raw lists
+        are copied, any Parameter objects that exist are cloned into the copy.
+        """
+        ret = ParameterTable(owner)
+        ret._names = list(self._names)
+        ret._values = list(self._values)
+        ret._pos = dict(self._pos)
+        ret._typed = dict(self._typed)
+        ret._objs = {name: ctx.clone(p, owner) for name, p in self._objs.items()}
+        return ret
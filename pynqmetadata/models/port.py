@@ -4,24 +4,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, fields
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from ..errors import (
     FeatureNotYetImplemented,
-    MergeConflict,
     ParentIsNone,
     PortNotFound,
     PortSignalAlreadyExists,
     UnexpectedMetadataObjectType,
     UnexpectedPmdObject,
 )
+from .copy_on_write import CowContext
 from .metadata_object import MetadataObject
 from .parameter import Parameter
 from .signal import Signal
 from .vlnv import Vlnv
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Port(MetadataObject):
     """
     A model for a Port Base Type
@@ -33,7 +33,7 @@ class Port(MetadataObject):
     signals: Dict[str, Signal] = field(default_factory=lambda: ({}))
     parameters: Dict[str, Parameter] = field(default_factory=lambda: ({}))
     external: bool = False
-    _destinations: Dict[str, Port] = field(default_factory=lambda: ({}))
+    _destinations: Optional[Dict[str, Port]] = None
 
     def _merge(
         self, a: Port, skip_external: bool = False, inherit_signal_width: bool = False
@@ -42,18 +42,20 @@ class Port(MetadataObject):
         self._mo_merge(a)
         if self.vlnv is not None and a.vlnv is not None:
             if self.vlnv.dict() != a.vlnv.dict():
-                raise MergeConflict(f"{self.vlnv=} conflicts with {a.vlnv=}")
+                self._merge_conflict(f"{self.vlnv=} conflicts with {a.vlnv=}")
 
         # Skip over external ports (used when a separate BDC is being merged into a module)
         if not skip_external:
             if self.external != a.external:
-                raise MergeConflict(f"{self.external=} conflicts with {a.external=}")
+                self._merge_conflict(f"{self.external=} conflicts with {a.external=}")
         else:
             self.external = a.external
 
         # Merge in signals
         for s in a.signals:
             if s in self.signals:
+                if self.signals[s]._same_content(a.signals[s]):
+                    continue
                 self.signals[s].merge(
                     a.signals[s],
                     skip_external=skip_external,
@@ -65,7 +67,8 @@ class Port(MetadataObject):
         # Merge in parameters
         for p in a.parameters:
             if p in self.parameters:
-                self.parameters[p].merge(a.parameters[p])
+                if not self.parameters[p]._same_content(a.parameters[p]):
+                    self.parameters[p].merge(a.parameters[p])
             else:
                 self.add(a.parameters[p])
 
@@ -108,25 +111,32 @@ class Port(MetadataObject):
                 f"{item.name} is not either a port or a parameter so cannot exist in {self.ref}"
             )
 
-    def _add_destination(self, dst: Port) -> None:
+    def _invalidate_destinations(self) -> None:
         """
-        Adds a port to the _destination dict, this
-        is called whenever a signal is added to the
-        model
+        Drops the cached port-level destinations, called whenever
+        the connections of one of the signals of this port change
         """
-        self._destinations[dst.name] = dst
+        self._destinations = None
+        self._bump_generation(structure=False)
 
     def destinations(self) -> Dict[str, Port]:
         """
-        Returns the port-level destinations for this port
+        Returns the port-level destinations for this port.
+        These are computed from the signal connections on the
+        first call and cached until a connection changes.
         """
-        r = {}
-        for sig in self.signals.values():
-            for con in sig._connections.values():
-                if con.parent().name not in r:
-                    r[con.parent().name] = con.parent()
-        return r
-        # return self._destinations
+        return dict(self._destination_ports())
+
+    def _destination_ports(self) -> Dict[str, Port]:
+        """The cached destinations, callers must not modify the returned dict"""
+        if self._destinations is None:
+            r = {}
+            for sig in self.signals.values():
+                for con in sig._connections.values():
+                    if con.parent().name not in r:
+                        r[con.parent().name] = con.parent()
+            self._destinations = r
+        return self._destinations
 
     def _add_signal(self, item: Signal) -> None:
         """
@@ -134,12 +144,15 @@ class Port(MetadataObject):
         """
         if not self.exists(item):
             self.signals[item.name] = item
+            item = self.signals[item.name]
             item.set_parent(self)
+            batch = self._active_batch()
+            if batch is not None:
+                batch.inserted(self, self.signals, item)
 
             if item.parent() is not None:
-                dst_port = item.parent()
-                if isinstance(dst_port, Port):
-                    self._destinations[dst_port.name] = dst_port
+                if isinstance(item.parent(), Port):
+                    self._invalidate_destinations()
                 else:
                     raise PortNotFound(
                         f"Parent of {item.ref} is not a Port type when adding connection to {self.ref}"
@@ -151,13 +164,23 @@ class Port(MetadataObject):
         else:
             raise PortSignalAlreadyExists(f"{item.ref} already exists in {self.ref}")
 
+    def _lookup(self, ref_levels: List[str]) -> Optional[MetadataObject]:
+        """
+        helper used for recursively looking down the object tree.
+        Signals packed into a SignalStore are not held in _children so
+        fall back to the signals facade for those.
+        """
+        obj = super()._lookup(ref_levels)
+        if obj is None and not isinstance(self.signals, dict):
+            return self.signals.lookup(ref_levels[-1])
+        return obj
+
     def _add_parameter(self, item: Parameter) -> None:
         """
         Adds a parameter to the model
         """
         if not self.exists(item):
-            self.parameters[item.name] = item
-            item.set_parent(self)
+            self._insert_child(self.parameters, item)
 
     def _add_signal_or_parameter(self, item: MetadataObject) -> None:
         """
@@ -172,6 +195,20 @@ class Port(MetadataObject):
                 f"unable to add {item} to {self.ref} was expecting either a parameter or a port"
             )
 
+    def _packed(self) -> bool:
+        """Returns true if the signals of this port are packed into a SignalStore"""
+        return not isinstance(self.signals, dict)
+
+    def _cow_clone(self, ctx: CowContext, parent: Optional[MetadataObject]):
+        """The cached destinations refer to the original ports, so are not shared"""
+        ret = super()._cow_clone(ctx, parent)
+        ret._destinations = None
+        return ret
+
+    def _dispose(self) -> None:
+        super()._dispose()
+        self.__dict__["_destinations"] = None
+
     def _get_root(self) -> MetadataObject:
         """
         Returns the root module that this is a part of, otherwise raises an error if it can't find it
@@ -216,7 +253,7 @@ class Port(MetadataObject):
                 self.signals[sig].remove(refresh=False)
 
             if isinstance(self._parent, MetadataObject):
-                del self._parent.ports[self.name]
+                self._parent._delete_child(self._parent.ports, self)
             else:
                 raise UnexpectedMetadataObjectType(
                     f"Expecting parent of Port {self.ref} to be either a Core or a Module"
@@ -8,7 +8,7 @@ from ..errors import ParameterNotFound, UnexpectedMetadataObjectType
 from .core import Core
 from .signal import Signal
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class ProcSysCore(Core):
     """
     A hardened processing system core type
@@ -52,9 +52,9 @@ class ProcSysCore(Core):
                                 ret[con_core.name]["pins"] = pinlist
 
                             if "DIN_FROM" in con_core.parameters:
-                                ret[con_core.name]["index"] = con_core.parameters[
+                                ret[con_core.name]["index"] = con_core.parameters.value(
                                     "DIN_FROM"
-                                ].value
+                                )
                             else:
                                 ret[con_core.name]["index"] = 999
                         else:
@@ -74,7 +74,7 @@ class ProcSysCore(Core):
         """For a given clock id and divisor id return the clock divisor"""
         clk_odiv = self.clk_div_param_name(clk_id, div_id)
         if clk_odiv in self.parameters:
-            divisor = self.parameters[clk_odiv].value
+            divisor = self.parameters.typed(clk_odiv)
             if divisor is not None:
                 return int(divisor)
             else:
@@ -95,7 +95,7 @@ class ProcSysCore(Core):
         """Return true if the clock with id clk_id is enabled"""
         param_name = self.clk_enable_param_name(clk_id)
         if param_name in self.parameters:
-            value = self.parameters[param_name].value
+            value = self.parameters.typed(param_name)
             if value is not None:
                 return int(value) == 1
             else:
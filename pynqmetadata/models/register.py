@@ -6,12 +6,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict
 
-from ..errors import BitAlreadyExists, MergeConflict
+from ..errors import BitAlreadyExists
 from .bit_field import BitField
 from .metadata_object import MetadataObject
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Register(MetadataObject):
     """
     Model that describes a register associated with a subordinate port
@@ -30,18 +30,18 @@ class Register(MetadataObject):
         """Attempts to merge two registers together. Generates a conflict if there is a collision"""
         self._mo_merge(a)
         if self.access != a.access:
-            raise MergeConflict(f"{self.access=} is not the same as {a.access=}")
+            self._merge_conflict(f"{self.access=} is not the same as {a.access=}")
         if self.offset != a.offset:
-            raise MergeConflict(f"{self.offset=} is not the same as {a.offset=}")
+            self._merge_conflict(f"{self.offset=} is not the same as {a.offset=}")
         if self.width != a.width:
-            raise MergeConflict(f"{self.width=} is not the same as {a.width=}")
+            self._merge_conflict(f"{self.width=} is not the same as {a.width=}")
         if self.enabled != a.enabled:
-            raise MergeConflict(f"{self.enabled=} is not the same as {a.enabled=}")
+            self._merge_conflict(f"{self.enabled=} is not the same as {a.enabled=}")
 
         for bit in a.bitfields:
             if bit in self.bitfields:
-                if a.bitfields[bit].dict() != self.bitfields[bit].dict():
-                    raise MergeConflict(
+                if a.bitfields[bit] != self.bitfields[bit]:
+                    self._merge_conflict(
                         f"{self.name} and {a.name} cannot be merged there is a conflict on {self.bitfields[bit].ref}"
                     )
             else:
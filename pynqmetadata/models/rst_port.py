@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from .scalar_port import ScalarPort
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class RstPort(ScalarPort):
     """
     A reset port model, inherits from the scalar port model
@@ -0,0 +1,211 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, TypeVar
+
+from ..errors import FrozenModuleModified
+
+T = TypeVar("T")
+
+# The public methods of metadata objects that modify a design. They take the
+# write lock of the closest locked module above the object, see writes()
+WRITE_METHODS = (
+    "add",
+    "merge",
+    "merge3",
+    "merge_blocks",
+    "refresh",
+    "remove",
+    "connect",
+    "disconnect",
+)
+
+# Set once the first lock is created, until then writes() costs one check
+_locking_used = False
+
+
+class RWLock:
+    """
+    A reader/writer lock for a Module, created with Module.enable_locking()
+
+    Any number of threads can hold the read lock at once, the write lock is
+    exclusive. Both are reentrant for the thread holding them and the thread
+    holding the write lock can also read, if it releases the write lock
+    first it keeps reading as an ordinary reader. Waiting writers block new
+    readers so that a stream of readers cannot starve a writer. Upgrading a
+    read lock to a write lock is not possible and raises a RuntimeError.
+
+    seq is incremented when the write lock is taken and again when it is
+    released, so it is odd while a writer is active. optimistic() uses it
+    to read without taking the lock at all.
+    """
+
+    def __init__(self) -> None:
+        global _locking_used
+        _locking_used = True
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writer: int = 0
+        self._write_depth: int = 0
+        self._waiting_writers: int = 0
+        self._local = threading.local()
+        self.seq: int = 0
+
+    def __getstate__(self) -> Dict:
+        # Locks cannot be copied, a copied module gets a new (unheld) lock
+        return {}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def acquire_read(self) -> None:
+        depth = self._read_depth()
+        if depth > 0:
+            self._local.depth = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            # Covered by the write lock, counted as a reader only if the
+            # write lock is released first (see release_write)
+            self._local.counted = False
+            self._local.depth = 1
+            return
+        with self._cond:
+            while self._writer != 0 or self._waiting_writers > 0:
+                self._cond.wait()
+            self._readers += 1
+        self._local.counted = True
+        self._local.depth = 1
+
+    def release_read(self) -> None:
+        depth = self._read_depth() - 1
+        self._local.depth = depth
+        if depth > 0 or not self._local.counted:
+            return
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if self._read_depth() > 0:
+            raise RuntimeError("A read lock cannot be upgraded to a write lock")
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer != 0 or self._readers > 0:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+            self.seq += 1
+
+    def release_write(self) -> None:
+        self._write_depth -= 1
+        if self._write_depth > 0:
+            return
+        with self._cond:
+            if self._read_depth() > 0 and not self._local.counted:
+                # The thread keeps reading, its read becomes a counted one
+                self._readers += 1
+                self._local.counted = True
+            self.seq += 1
+            self._writer = 0
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def optimistic(self, fn: Callable[[], T], retries: int = 3) -> T:
+        """
+        Runs fn without taking the lock and returns its result if no writer
+        was active while it ran. Otherwise fn is retried, falling back to
+        running it under the read lock after retries attempts. Errors raised
+        while a writer was active are treated as a failed attempt.
+        """
+        for _ in range(retries):
+            seq = self.seq
+            if seq % 2 == 1:
+                break
+            try:
+                ret = fn()
+            except Exception:
+                if self.seq == seq:
+                    raise
+                continue
+            if self.seq == seq:
+                return ret
+        with self.read():
+            return fn()
+
+
+class FrozenLock(RWLock):
+    """
+    The lock of a module returned by Module.freeze(). Nothing can modify a
+    frozen module so reads never need to wait, and every attempt to take
+    the write lock raises FrozenModuleModified.
+    """
+
+    def acquire_read(self) -> None:
+        pass
+
+    def release_read(self) -> None:
+        pass
+
+    def acquire_write(self) -> None:
+        raise FrozenModuleModified(
+            "A frozen module cannot be modified, use thaw() to get a mutable copy"
+        )
+
+    def release_write(self) -> None:
+        pass
+
+    def optimistic(self, fn: Callable[[], T], retries: int = 3) -> T:
+        return fn()
+
+
+def writes(method: Callable) -> Callable:
+    """
+    Wraps a method that modifies a design so that it holds the write lock of
+    the closest locked module above the object for the whole call. Calling
+    it on an object of a frozen module raises FrozenModuleModified (freezing
+    creates a FrozenLock, so _locking_used is always set by then).
+    """
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        if not _locking_used:
+            return method(self, *args, **kwargs)
+        if self.__dict__.get("_frozen"):
+            raise FrozenModuleModified(f"{self.ref} belongs to a frozen module")
+        lock = self._active_lock()
+        if lock is None:
+            return method(self, *args, **kwargs)
+        with lock.write():
+            return method(self, *args, **kwargs)
+
+    locked._writes = True
+    return locked
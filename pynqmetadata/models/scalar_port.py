@@ -5,13 +5,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from ..errors import MergeConflict, TooManySignals
+from ..errors import TooManySignals
 from .metadata_object import MetadataObject
 from .port import Port
 from .signal import Signal
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class ScalarPort(Port):
     """
     A port object for a core that can
@@ -54,10 +54,10 @@ class ScalarPort(Port):
         )
 
         if self.driver != a.driver:
-            raise MergeConflict(f"{self.driver=} conflicts with {a.driver=}")
+            self._merge_conflict(f"{self.driver=} conflicts with {a.driver=}")
 
         if not inherit_signal_width:
             if self.width != a.width:
-                raise MergeConflict(f"{self.width=} conflicts with {a.width=}")
+                self._merge_conflict(f"{self.width=} conflicts with {a.width=}")
         else:
             self.width = a.width
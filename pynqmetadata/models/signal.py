@@ -8,7 +8,6 @@ from typing import Dict, List, Optional, Set
 
 from ..errors import (
     FeatureNotYetImplemented,
-    MergeConflict,
     PortSignalAlreadyExists,
     PortSignalNotFound,
     UnexpectedMetadataObjectType,
@@ -17,7 +16,7 @@ from ..errors import (
 from .metadata_object import MetadataObject
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class Signal(MetadataObject):
     """
     A signal object. These are nets that
@@ -29,6 +28,7 @@ class Signal(MetadataObject):
     type: str = "signal"
     generic_type: str = "signal"
     _connections: Dict[str, Signal] = field(default_factory=lambda: ({}))
+    _incoming: Dict[str, Signal] = field(default_factory=lambda: ({}))
     con_refs: List[str] = field(default_factory=lambda: ([]))
     width: int = 1
     driver: bool = True
@@ -51,18 +51,18 @@ class Signal(MetadataObject):
 
         if not inherit_signal_width:
             if self.width != a.width:
-                raise MergeConflict(
+                self._merge_conflict(
                     f"{self.ref}  {self.width=} is not the same as {a.ref}  {a.width=}"
                 )
         else:
             self.width = a.width
 
         if self.driver != a.driver:
-            raise MergeConflict(f"{self.driver=} is not the same as {a.driver=}")
+            self._merge_conflict(f"{self.driver=} is not the same as {a.driver=}")
 
         if not skip_external:
             if self.external != a.external:
-                raise MergeConflict(
+                self._merge_conflict(
                     f"{self.external=} is not the same as {a.external=}"
                 )
         else:
@@ -92,7 +92,9 @@ class Signal(MetadataObject):
         """
         if self._con_ref_exists(ref):
             self.con_refs.remove(ref)
-            del self._connections[ref]
+            self._connections.pop(ref)._remove_incoming(self)
+            self._connections_changed()
+            self._invalidate_hash()
         else:
             raise PortSignalNotFound(
                 f"Could not find reference connection to {ref} in {self.ref}"
@@ -119,14 +121,80 @@ class Signal(MetadataObject):
         Connect this signal to sig
         """
         if not self.connection_exists(sig):
-            self._check_polarity(sig)
-            self._connections[sig.ref] = sig
-            self.con_refs.append(sig.ref)
+            batch = self._active_batch()
+            if batch is None:
+                self._check_polarity(sig)
+            self._connect(sig)
+            if batch is not None:
+                batch.connected(self, sig)
         #else: ## TODO: This needs to be added back in for buildtime stuff
         #    raise PortSignalAlreadyExists(
         #        f"{sig.ref} is already connected to {self.ref} .  full list of signals {self._connections.keys()}"
         #    )
 
+    def _connect(self, sig: Signal) -> None:
+        """Adds the connection to sig without any checks"""
+        self._connections[sig.ref] = sig
+        self.con_refs.append(sig.ref)
+        sig._add_incoming(self)
+        self._connections_changed()
+        self._invalidate_hash()
+
+    def _set_connection(self, ref: str, sig: Signal) -> None:
+        """
+        Links the connection reference ref to the signal object sig, used
+        when relinking a model from its string references
+        """
+        if self._connections.get(ref) is not sig:
+            self._connections[ref] = sig
+            self._connections_changed()
+        sig._add_incoming(self)
+
+    def _connections_changed(self) -> None:
+        """Drops the cached port-level destinations of the parent port"""
+        if self._parent is not None:
+            self._parent._invalidate_destinations()
+
+    def _dispose(self) -> None:
+        """The connections in both directions are dropped too"""
+        super()._dispose()
+        state = self.__dict__
+        if "_connections" in state:
+            state["_connections"] = {}
+            state["_incoming"] = {}
+
+    def set_parent(self, parent: MetadataObject) -> None:
+        """
+        Sets the parent port. Moving a signal between ports changes the
+        destinations of both ports and of the ports connecting to it
+        """
+        if self._parent is not parent:
+            self._connections_changed()
+            for sig in self._incoming.values():
+                sig._connections_changed()
+            super().set_parent(parent)
+            self._connections_changed()
+        else:
+            super().set_parent(parent)
+
+    def _add_incoming(self, sig: Signal) -> None:
+        """Records that sig has a connection to this signal"""
+        self._incoming[sig.ref] = sig
+
+    def _remove_incoming(self, sig: Signal) -> None:
+        """Removes sig from the signals connecting to this signal"""
+        self._incoming.pop(sig.ref, None)
+
+    def incoming(self) -> Dict[str, Signal]:
+        """
+        Returns the signals that have a connection to this signal
+        """
+        ret: Dict[str, Signal] = {}
+        for sig in self._incoming.values():
+            if sig._connections.get(self.ref) is self:
+                ret[sig.ref] = sig
+        return ret
+
     def _get_root(self) -> MetadataObject:
         """
         Returns the root module that this signal is a part of
@@ -155,6 +223,9 @@ class Signal(MetadataObject):
         if self.connection_exists(sig):
             if self._con_ref_exists(sig.ref):
                 self._remove_con_ref(sig.ref)
+                batch = self._active_batch()
+                if batch is not None:
+                    batch.disconnected(self, sig)
             else:
                 raise PortSignalNotFound(
                     f"Could not find {sig.ref} in {self.ref} reference list when removing"
@@ -196,21 +267,19 @@ class Signal(MetadataObject):
             )
         else:
             root = self._get_root()
-            for core in root.blocks.values():
-                for port in core.ports.values():
-                    for signal in port.signals.values():
-                        if signal != self:
-                            if signal.connection_exists(self):
-                                signal.disconnect(self)
-
-            # remove from external ports also
-            for port in root.ports.values():
-                for signal in port.signals.values():
-                    if signal != self:
-                        signal.disconnect(self)
+            for signal in self.incoming().values():
+                if signal is not self:
+                    signal.disconnect(self, refresh=False)
+
+            batch = self._active_batch()
+            for signal in self._connections.values():
+                signal._remove_incoming(self)
+                if batch is not None:
+                    batch.record(lambda signal=signal: signal._add_incoming(self))
 
         if isinstance(self._parent, MetadataObject):
-            del self._parent.signals[self.name]
+            self._connections_changed()
+            self._parent._delete_child(self._parent.signals, self)
         else:
             raise UnexpectedMetadataObjectType(
                 f"Trying to remove {self.ref} from it's parent, but it's parent was not type Port"
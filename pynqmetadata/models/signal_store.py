@@ -0,0 +1,661 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..errors import FeatureNotYetImplemented, PortSignalNotFound
+from .metadata_object import MetadataObject
+from .signal import Signal
+
+if TYPE_CHECKING:
+    from .port import Port
+
+
+class _Column:
+    """
+    A per-signal array of a SignalStore. The array is kept in a buffer with
+    spare capacity (see SignalStore._reserve) so that appending a signal
+    does not copy it, reading the attribute returns a view of the rows in
+    use, plus extra rows (the closing entry of a CSR indptr).
+    """
+
+    def __init__(self, extra: int = 0) -> None:
+        self.extra = extra
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.key = f"_{name}_buf"
+
+    def __get__(self, obj: Optional[SignalStore], cls: type = None):
+        if obj is None:
+            return self
+        return obj.__dict__[self.key][: len(obj.names) + self.extra]
+
+    def __set__(self, obj: SignalStore, value: np.ndarray) -> None:
+        obj.__dict__[self.key] = value
+
+
+class SignalStore:
+    """
+    A struct-of-arrays backend for the signals of a module.
+
+    Instead of a Signal object (with its own connection dict) per net, the
+    signals of every port packed into the store are kept as parallel NumPy
+    arrays:
+        * width : the width of each signal
+        * driver : True if the signal drives the net
+        * external : True if the signal is an external port signal
+        * port : the index of the parent port in self.ports
+        * indptr/indices : the connections of each signal in CSR form
+        * src_indptr/src_indices : the same connections by destination, the
+          signals connected to each signal
+
+    Connections to signals that are not in the store (or references that
+    have not been resolved yet) are kept sparsely in _extern. Signal objects
+    are created on demand as lightweight SignalView facades onto the arrays.
+    """
+
+    width = _Column()
+    driver = _Column()
+    external = _Column()
+    alive = _Column()
+    port = _Column()
+    indptr = _Column(extra=1)
+    src_indptr = _Column(extra=1)
+
+    def __init__(self) -> None:
+        self.ports: List[Port] = []
+        self.names: List[str] = []
+        self.width = np.zeros(0, dtype=np.int64)
+        self.driver = np.zeros(0, dtype=bool)
+        self.external = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self.port = np.zeros(0, dtype=np.int32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.src_indptr = np.zeros(1, dtype=np.int64)
+        self.src_indices = np.zeros(0, dtype=np.int32)
+        self.ext: Dict[int, Dict[str, object]] = {}
+        self._port_signals: List[Dict[str, int]] = []
+        self._port_lookup: Dict[int, int] = {}
+        self._rows: Dict[int, List[int]] = {}
+        self._src_rows: Dict[int, List[int]] = {}
+        self._extern: Dict[int, Dict[str, Optional[Signal]]] = {}
+        self._incoming_extern: Dict[int, Dict[str, Signal]] = {}
+        self._discarded: Dict[int, Tuple] = {}
+        self._timestamp: float = datetime.timestamp(datetime.now())
+        self._views: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    @classmethod
+    def from_ports(cls, ports: List[Port]) -> Tuple[SignalStore, Dict[int, Signal]]:
+        """Packs the signals of the given ports into a new store. The ports
+        have their signals dict replaced with a PackedSignals facade.
+        Returns the store and a mapping from id() of each packed Signal
+        object to the view that replaces it"""
+        store = cls()
+        sig_index: Dict[int, int] = {}
+        sigs: List[Signal] = []
+        widths: List[int] = []
+        drivers: List[bool] = []
+        externals: List[bool] = []
+        port_idx: List[int] = []
+
+        for port in ports:
+            pidx = store._register_port(port)
+            for sig in port.signals.values():
+                sig_index[id(sig)] = len(sigs)
+                store._port_signals[pidx][sig.name] = len(sigs)
+                store.names.append(sig.name)
+                widths.append(sig.width)
+                drivers.append(sig.driver)
+                externals.append(sig.external)
+                port_idx.append(pidx)
+                if len(sig.ext) > 0:
+                    store.ext[len(sigs)] = sig.ext
+                sigs.append(sig)
+
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        for i, sig in enumerate(sigs):
+            for ref in sig.con_refs:
+                dst = sig._connections.get(ref)
+                if dst is not None and id(dst) in sig_index:
+                    indices.append(sig_index[id(dst)])
+                else:
+                    store._extern.setdefault(i, {})[ref] = dst
+            for src in sig._incoming.values():
+                if id(src) not in sig_index:
+                    store._incoming_extern.setdefault(i, {})[src.ref] = src
+            indptr.append(len(indices))
+
+        store.width = np.array(widths, dtype=np.int64)
+        store.driver = np.array(drivers, dtype=bool)
+        store.external = np.array(externals, dtype=bool)
+        store.alive = np.ones(len(sigs), dtype=bool)
+        store.port = np.array(port_idx, dtype=np.int32)
+        store.indptr = np.array(indptr, dtype=np.int64)
+        store.indices = np.array(indices, dtype=np.int32)
+        store._index_sources()
+
+        for pidx, port in enumerate(store.ports):
+            for name in store._port_signals[pidx]:
+                port._children.pop(f"{name}[signal]", None)
+            port.signals = PackedSignals(store, pidx)
+        return store, {i: store.view(idx) for i, idx in sig_index.items()}
+
+    def _reserve(self, n: int) -> None:
+        """Makes room for n signals in the arrays, at least doubling any that grow"""
+        for col in _COLUMNS:
+            buf = self.__dict__[col.key]
+            if len(buf) < n + col.extra:
+                size = max(n, 2 * (len(buf) - col.extra), 16) + col.extra
+                grown = np.zeros(size, dtype=buf.dtype)
+                grown[: len(buf)] = buf
+                self.__dict__[col.key] = grown
+
+    def _register_port(self, port: Port) -> int:
+        pidx = len(self.ports)
+        self.ports.append(port)
+        self._port_signals.append({})
+        self._port_lookup[id(port)] = pidx
+        return pidx
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.alive))
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_views"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._port_lookup = {id(p): i for i, p in enumerate(self.ports)}
+        self._views = weakref.WeakValueDictionary()
+
+    def view(self, idx: int) -> SignalView:
+        """Returns the Signal facade for the signal at idx"""
+        v = self._views.get(idx)
+        if v is None:
+            v = SignalView(self, idx)
+            self._views[idx] = v
+        return v
+
+    def index_of(self, sig: Signal) -> Optional[int]:
+        """Returns the index of sig if it is stored in this store"""
+        if isinstance(sig, SignalView) and sig._store is self:
+            return sig._idx
+        return None
+
+    def ref(self, idx: int) -> str:
+        """The reference of the signal at idx, derived from its port"""
+        return f"{self.ports[self._port_buf[idx]].ref}:{self.names[idx]}[signal]"
+
+    # ---- connections -------------------------------------------------------
+
+    def row(self, idx: int) -> List[int]:
+        """The in-store destinations of the signal at idx"""
+        if idx in self._rows:
+            return self._rows[idx]
+        return self.indices[self.indptr[idx] : self.indptr[idx + 1]].tolist()
+
+    def _editable_row(self, idx: int) -> List[int]:
+        if idx not in self._rows:
+            self._rows[idx] = self.row(idx)
+        return self._rows[idx]
+
+    def source_row(self, idx: int) -> List[int]:
+        """The in-store signals connected to the signal at idx"""
+        if idx in self._src_rows:
+            return self._src_rows[idx]
+        return self.src_indices[self.src_indptr[idx] : self.src_indptr[idx + 1]].tolist()
+
+    def _editable_source_row(self, idx: int) -> List[int]:
+        if idx not in self._src_rows:
+            self._src_rows[idx] = self.source_row(idx)
+        return self._src_rows[idx]
+
+    def _index_sources(self) -> None:
+        """Builds src_indptr/src_indices from the (compacted) connections"""
+        n = len(self.names)
+        src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+        self.src_indices = src[np.argsort(self.indices, kind="stable")]
+        src_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=src_indptr[1:])
+        self.src_indptr = src_indptr
+        self._src_rows = {}
+
+    def connections(self, idx: int) -> Dict[str, Signal]:
+        """The connections of the signal at idx keyed on reference"""
+        ret: Dict[str, Signal] = {}
+        for dst in self.row(idx):
+            ret[self.ref(dst)] = self.view(dst)
+        for ref, sig in self._extern.get(idx, {}).items():
+            if sig is not None:
+                ret[ref] = sig
+        return ret
+
+    def sources(self, idx: int) -> Dict[str, Signal]:
+        """The signals that have a connection to the signal at idx keyed on reference"""
+        ret: Dict[str, Signal] = {}
+        for s in sorted(set(self.source_row(idx))):
+            ret[self.ref(s)] = self.view(s)
+        ret.update(self._incoming_extern.get(idx, {}))
+        return ret
+
+    def con_refs(self, idx: int) -> List[str]:
+        """The connection references of the signal at idx"""
+        return [self.ref(dst) for dst in self.row(idx)] + list(
+            self._extern.get(idx, {}).keys()
+        )
+
+    def _port_changed(self, idx: int) -> None:
+        """Drops the cached destinations of the port holding the signal at idx"""
+        self.ports[self.port[idx]]._invalidate_destinations()
+
+    def connect(self, idx: int, sig: Signal) -> None:
+        """Adds a connection from the signal at idx to sig"""
+        self._port_changed(idx)
+        dst = self.index_of(sig)
+        if dst is not None:
+            self._editable_row(idx).append(dst)
+            self._editable_source_row(dst).append(idx)
+        else:
+            self._extern.setdefault(idx, {})[sig.ref] = sig
+            sig._add_incoming(self.view(idx))
+
+    def add_con_ref(self, idx: int, ref: str) -> None:
+        """Adds an unresolved connection reference, resolved by relink()"""
+        if ref not in self.con_refs(idx):
+            self._extern.setdefault(idx, {})[ref] = None
+
+    def disconnect(self, idx: int, ref: str) -> None:
+        """Removes the connection from the signal at idx to ref"""
+        self._port_changed(idx)
+        extern = self._extern.get(idx, {})
+        if ref in extern:
+            dst = extern.pop(ref)
+            if dst is not None:
+                dst._remove_incoming(self.view(idx))
+            return
+        row = self._editable_row(idx)
+        for pos, dst in enumerate(row):
+            if self.ref(dst) == ref:
+                del row[pos]
+                self._editable_source_row(dst).remove(idx)
+                return
+        raise PortSignalNotFound(f"Could not find {ref} in {self.ref(idx)}")
+
+    def relink(self, root: MetadataObject) -> None:
+        """Resolves any pending connection references against root"""
+        for idx, extern in self._extern.items():
+            for ref in list(extern.keys()):
+                if extern[ref] is None:
+                    sig = root.lookup(ref)
+                    del extern[ref]
+                    self.connect(idx, sig)
+
+    def compact(self) -> None:
+        """Folds edited rows back into the CSR arrays"""
+        if len(self._rows) == 0:
+            return
+        counts = np.diff(self.indptr)
+        for idx, row in self._rows.items():
+            counts[idx] = len(row)
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        for idx in range(len(counts)):
+            indices[indptr[idx] : indptr[idx + 1]] = self.row(idx)
+        self.indptr = indptr
+        self.indices = indices
+        self._rows = {}
+        self._index_sources()
+
+    # ---- signal membership -------------------------------------------------
+
+    def append(self, pidx: int, sig: Signal) -> int:
+        """Absorbs the Signal object sig into the store under port pidx"""
+        idx = len(self.names)
+        self._reserve(idx + 1)
+        self._width_buf[idx] = sig.width
+        self._driver_buf[idx] = sig.driver
+        self._external_buf[idx] = sig.external
+        self._alive_buf[idx] = True
+        self._port_buf[idx] = pidx
+        self._indptr_buf[idx + 1] = self._indptr_buf[idx]
+        self._src_indptr_buf[idx + 1] = self._src_indptr_buf[idx]
+        self.names.append(sig.name)
+        if len(sig.ext) > 0:
+            self.ext[idx] = sig.ext
+        self._port_signals[pidx][sig.name] = idx
+        for ref in sig.con_refs:
+            dst = sig._connections.get(ref)
+            self._extern.setdefault(idx, {})[ref] = dst
+            if dst is not None:
+                dst._add_incoming(self.view(idx))
+        for src in sig._incoming.values():
+            self.view(idx)._add_incoming(src)
+        return idx
+
+    def discard(self, idx: int) -> None:
+        """Removes the signal at idx from the store, leaving a tombstone"""
+        self._port_changed(idx)
+        self.alive[idx] = False
+        del self._port_signals[self.port[idx]][self.names[idx]]
+        row = self.row(idx)
+        for dst in row:
+            self._editable_source_row(dst).remove(idx)
+        self._discarded[idx] = (
+            row,
+            self._extern.pop(idx, None),
+            self._incoming_extern.pop(idx, None),
+            self.ext.pop(idx, None),
+        )
+        self._rows[idx] = []
+
+    def restore(self, idx: int) -> None:
+        """Brings back a signal removed by discard()"""
+        row, extern, incoming, ext = self._discarded.pop(idx)
+        self._port_changed(idx)
+        self.alive[idx] = True
+        self._port_signals[self.port[idx]][self.names[idx]] = idx
+        self._rows[idx] = row
+        for dst in row:
+            self._editable_source_row(dst).append(idx)
+        for d, v in [(self._extern, extern), (self._incoming_extern, incoming), (self.ext, ext)]:
+            if v is not None:
+                d[idx] = v
+
+    def rename(self, idx: int, name: str) -> None:
+        names = self._port_signals[self.port[idx]]
+        del names[self.names[idx]]
+        names[name] = idx
+        self.names[idx] = name
+
+    def move(self, idx: int, port: Port) -> None:
+        """Moves the signal at idx to a different port in the store"""
+        pidx = self._port_lookup.get(id(port))
+        if pidx is None:
+            raise FeatureNotYetImplemented(
+                f"{self.ref(idx)} cannot be moved to {port.ref} as it is not packed into the same signal store"
+            )
+        for src in self.sources(idx).values():
+            src._connections_changed()
+        self._port_changed(idx)
+        del self._port_signals[self.port[idx]][self.names[idx]]
+        self.port[idx] = pidx
+        self._port_signals[pidx][self.names[idx]] = idx
+        self._port_changed(idx)
+
+    def unpack(self) -> Dict[int, Signal]:
+        """Converts every packed port back into plain Signal objects.
+        Returns a mapping from each signal index to the Signal replacing it"""
+        sigs: Dict[int, Signal] = {}
+        for pidx, port in enumerate(self.ports):
+            signals: Dict[str, Signal] = {}
+            for name, idx in self._port_signals[pidx].items():
+                sig = Signal(
+                    name=name,
+                    width=int(self.width[idx]),
+                    driver=bool(self.driver[idx]),
+                    external=bool(self.external[idx]),
+                )
+                sig.ext = self.ext.get(idx, {})
+                sigs[idx] = sig
+                signals[name] = sig
+            port.signals = signals
+            for sig in signals.values():
+                sig.set_parent(port)
+
+        for idx, sig in sigs.items():
+            for dst in self.row(idx):
+                sig._set_connection(sigs[dst].ref, sigs[dst])
+                sig.con_refs.append(sigs[dst].ref)
+            for ref, dst in self._extern.get(idx, {}).items():
+                if dst is not None:
+                    sig._set_connection(ref, dst)
+                sig.con_refs.append(ref)
+            sig._incoming.update(self._incoming_extern.get(idx, {}))
+        return sigs
+
+    # ---- vectorised queries ------------------------------------------------
+
+    def fan_out(self) -> np.ndarray:
+        """The number of connections leaving each signal"""
+        self.compact()
+        counts = np.diff(self.indptr)
+        for idx, extern in self._extern.items():
+            counts[idx] += len(extern)
+        return np.where(self.alive, counts, 0)
+
+    def fan_in(self) -> np.ndarray:
+        """The number of in-store connections arriving at each signal"""
+        self.compact()
+        counts = np.bincount(self.indices, minlength=len(self.names))
+        return np.where(self.alive, counts, 0)
+
+    def total_width(self, driver: Optional[bool] = None) -> int:
+        """The summed width of all the signals, optionally only drivers
+        (driver=True) or only sinks (driver=False)"""
+        mask = self.alive
+        if driver is not None:
+            mask = mask & (self.driver == driver)
+        return int(self.width[mask].sum())
+
+    def width_per_port(self) -> Dict[str, int]:
+        """The summed signal width of each port keyed on the port reference"""
+        totals = np.bincount(
+            self.port[self.alive],
+            weights=self.width[self.alive],
+            minlength=len(self.ports),
+        )
+        return {p.ref: int(totals[i]) for i, p in enumerate(self.ports)}
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (source, destination) index arrays of all in-store connections"""
+        self.compact()
+        src = np.repeat(np.arange(len(self.names), dtype=np.int32), np.diff(self.indptr))
+        return src, self.indices
+
+    def polarity_violations(self) -> List[Tuple[Signal, Signal]]:
+        """
+        Vectorised version of Signal._check_polarity over every in-store
+        connection. Internal nets must join a driver to a sink, nets to an
+        external port must have matching polarity.
+        """
+        src, dst = self.edges()
+        same = self.driver[src] == self.driver[dst]
+        ext = self.external[src] | self.external[dst]
+        bad = np.where(ext, ~same, same)
+        return [(self.view(int(s)), self.view(int(d))) for s, d in zip(src[bad], dst[bad])]
+
+
+_COLUMNS = tuple(c for c in vars(SignalStore).values() if isinstance(c, _Column))
+
+
+class PackedSignals(MutableMapping):
+    """
+    Dict-like facade used as Port.signals for ports that have been packed
+    into a SignalStore. Values are SignalView objects created on demand.
+    """
+
+    def __init__(self, store: SignalStore, pidx: int) -> None:
+        self._store = store
+        self._pidx = pidx
+
+    @property
+    def _names(self) -> Dict[str, int]:
+        return self._store._port_signals[self._pidx]
+
+    def __getitem__(self, name: str) -> SignalView:
+        return self._store.view(self._names[name])
+
+    def __setitem__(self, name: str, sig: Signal) -> None:
+        if name in self._names:
+            raise FeatureNotYetImplemented(
+                f"Cannot replace packed signal {name} in {self._store.ports[self._pidx].ref}"
+            )
+        self._store.append(self._pidx, sig)
+        self._store.ports[self._pidx]._invalidate_hash()
+
+    def __delitem__(self, name: str) -> None:
+        self._store.discard(self._names[name])
+        self._store.ports[self._pidx]._invalidate_hash()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def _restore(self, sig: SignalView) -> None:
+        """Undoes the removal of a signal from this port"""
+        self._store.restore(sig._idx)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def lookup(self, key: str) -> Optional[SignalView]:
+        """Resolves a 'name[signal]' child key (case insensitive, like MetadataObject._lookup)"""
+        if not key.endswith("[signal]"):
+            return None
+        name = key[: -len("[signal]")]
+        for n in (name, name.upper(), name.lower()):
+            if n in self._names:
+                return self[n]
+        return None
+
+
+class SignalView(Signal):
+    """
+    A lightweight Signal that reads and writes its state from a SignalStore.
+    Behaves like a Signal for connect/disconnect/connections() and rendering.
+    """
+
+    def __init__(self, store: SignalStore, idx: int) -> None:
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_idx", idx)
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._idx]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._store.rename(self._idx, value)
+
+    @property
+    def _parent(self) -> Port:
+        return self._store.ports[self._store._port_buf[self._idx]]
+
+    @_parent.setter
+    def _parent(self, value: Port) -> None:
+        if value is not self._parent:
+            self._store.move(self._idx, value)
+
+    @property
+    def _children(self) -> Dict[str, MetadataObject]:
+        return {}
+
+    @property
+    def ref(self) -> str:
+        return self._store.ref(self._idx)
+
+    @ref.setter
+    def ref(self, value: str) -> None:
+        """References are derived from the parent port"""
+
+    @property
+    def ext(self) -> Dict[str, object]:
+        return self._store.ext.setdefault(self._idx, {})
+
+    @ext.setter
+    def ext(self, value: Dict[str, object]) -> None:
+        self._store.ext[self._idx] = value
+
+    @property
+    def _timestamp(self) -> float:
+        return self._store._timestamp
+
+    @_timestamp.setter
+    def _timestamp(self, value: float) -> None:
+        self._store._timestamp = value
+
+    @property
+    def width(self) -> int:
+        return int(self._store._width_buf[self._idx])
+
+    @width.setter
+    def width(self, value: int) -> None:
+        self._store._width_buf[self._idx] = value
+
+    @property
+    def driver(self) -> bool:
+        return bool(self._store._driver_buf[self._idx])
+
+    @driver.setter
+    def driver(self, value: bool) -> None:
+        self._store._driver_buf[self._idx] = value
+
+    @property
+    def external(self) -> bool:
+        return bool(self._store._external_buf[self._idx])
+
+    @external.setter
+    def external(self, value: bool) -> None:
+        self._store._external_buf[self._idx] = value
+
+    @property
+    def _connections(self) -> Dict[str, Signal]:
+        return self._store.connections(self._idx)
+
+    @property
+    def con_refs(self) -> List[str]:
+        return self._store.con_refs(self._idx)
+
+    @property
+    def _incoming(self) -> Dict[str, Signal]:
+        return self._store.sources(self._idx)
+
+    def _add_incoming(self, sig: Signal) -> None:
+        if self._store.index_of(sig) is None:
+            self._store._incoming_extern.setdefault(self._idx, {})[sig.ref] = sig
+
+    def _remove_incoming(self, sig: Signal) -> None:
+        self._store._incoming_extern.get(self._idx, {}).pop(sig.ref, None)
+
+    def _packed(self) -> bool:
+        return True
+
+    def set_parent(self, parent: MetadataObject) -> None:
+        """Signals in a store are owned by the store rather than the port children"""
+        self._parent = parent
+
+    def merge(
+        self, a: Signal, skip_external: bool = False, inherit_signal_width: bool = False
+    ) -> None:
+        """Merges signal a into this signal, see Signal.merge"""
+        con_refs = self.con_refs
+        for c in a.con_refs:
+            if c not in con_refs:
+                self._store.add_con_ref(self._idx, c)
+        super().merge(
+            a, skip_external=skip_external, inherit_signal_width=inherit_signal_width
+        )
+
+    def _connect(self, sig: Signal) -> None:
+        """Adds the connection to sig without any checks"""
+        self._store.connect(self._idx, sig)
+        self._invalidate_hash()
+
+    def _remove_con_ref(self, ref: str) -> None:
+        """Removes a connection from the references"""
+        self._store.disconnect(self._idx, ref)
+        self._invalidate_hash()
@@ -5,11 +5,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from ..errors import MergeConflict
 from .port import Port
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class StreamPort(Port):
     """
     A model for an AXI stream port.
@@ -33,4 +32,4 @@ class StreamPort(Port):
         )
 
         if self.driver != a.driver:
-            raise MergeConflict(f"{self.driver=} conflicts with {a.driver=}")
+            self._merge_conflict(f"{self.driver=} conflicts with {a.driver=}")
@@ -6,8 +6,6 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict
 
-from pynqmetadata.errors.construction_errors import MergeConflict
-
 from ..errors import UnexpectedPmdObject
 from .metadata_object import MetadataObject
 from .parameter import Parameter
@@ -16,7 +14,7 @@ from .register import Register
 from .signal import Signal
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class SubordinatePort(Port):
     """
     Model that describes a subordinate port
@@ -54,16 +52,17 @@ class SubordinatePort(Port):
         if not ignore_addr_info:
             if not inherit_addr_info:
                 if self.baseaddr != a.baseaddr:
-                    raise MergeConflict(f"{self.baseaddr=} conflict with {a.baseaddr=}")
+                    self._merge_conflict(f"{self.baseaddr=} conflict with {a.baseaddr=}")
                 if self.range != a.range:
-                    raise MergeConflict(f"{self.range=} conflict with {a.range=}")
+                    self._merge_conflict(f"{self.range=} conflict with {a.range=}")
             else:
                 self.baseaddr = a.baseaddr
                 self.range = a.range
 
         for r in a.registers:
             if r in self.registers:
-                self.registers[r].merge(a.registers[r])
+                if not self.registers[r]._same_content(a.registers[r]):
+                    self.registers[r].merge(a.registers[r])
             else:
                 self.registers[r] = a.registers[r]
 
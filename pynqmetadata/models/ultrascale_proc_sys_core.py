@@ -7,7 +7,7 @@ from typing import Dict
 from .proc_sys_core import ProcSysCore
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class UltrascaleProcSysCore(ProcSysCore):
     """A specialised pydantic model for the Ultrascale Zynq processing system"""
 
@@ -5,14 +5,23 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict, dataclass, field
-from typing import Tuple, Dict
+from typing import Dict, Tuple
 
+# Interned instances, keyed on their fields and on the VLNV strings parsed into them
+_interned: Dict[Tuple, Vlnv] = {}
+_interned_str: Dict[str, Vlnv] = {}
 
-@dataclass(repr=False)
+
+@dataclass(repr=False, frozen=True)
 class Vlnv:
     """
     Class that describes the model for a vendor:library:name:version
     type
+
+    Vlnv objects are immutable, the string and hash are computed once when
+    the object is created. Vlnv.intern() and Vlnv.from_str() return a single
+    shared instance for each distinct VLNV, which the frontends use so that a
+    design holds one object per VLNV rather than one per core and port.
     """
 
     vendor: str
@@ -20,6 +29,39 @@ class Vlnv:
     name: str
     version: Tuple[int, int] = field(default_factory=tuple)
 
+    def __post_init__(self) -> None:
+        version = tuple(self.version)
+        vstr = ".".join(str(v) for v in version[:2])
+        s = f"{self.vendor}:{self.library}:{self.name}:{vstr}"
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_str", s)
+        object.__setattr__(self, "_hash", hash(s))
+
+    @classmethod
+    def intern(
+        cls, vendor: str, library: str, name: str, version: Tuple[int, int]
+    ) -> Vlnv:
+        """Returns the shared Vlnv instance for these fields"""
+        key = (vendor, library, name, tuple(version))
+        ret = _interned.get(key)
+        if ret is None:
+            ret = _interned.setdefault(
+                key, cls(vendor=vendor, library=library, name=name, version=key[3])
+            )
+        return ret
+
+    @classmethod
+    def from_str(cls, vlnv_str: str) -> Vlnv:
+        """Returns the shared Vlnv instance for a vendor:library:name:major.minor string"""
+        ret = _interned_str.get(vlnv_str)
+        if ret is None:
+            split_str = vlnv_str.split(":")
+            version_str = split_str[3].split(".")
+            version = (int(version_str[0]), int(version_str[1]))
+            ret = cls.intern(split_str[0], split_str[1], split_str[2], version)
+            _interned_str[vlnv_str] = ret
+        return ret
+
     def dict(self) -> Dict:
         """Returns a dict of the Vlnv"""
         return asdict(self)
@@ -29,18 +71,36 @@ class Vlnv:
         return json.dumps(self.dict())
 
     def copy(self) -> Vlnv:
-        return Vlnv(
-            vendor=self.vendor,
-            library=self.library,
-            name=self.name,
-            version=self.version,
-        )
+        """Vlnv objects are immutable so copies are the object itself"""
+        return self
+
+    def __copy__(self) -> Vlnv:
+        return self
+
+    def __deepcopy__(self, memo: Dict) -> Vlnv:
+        return self
+
+    def __reduce__(self):
+        # Unpickled objects are interned again
+        return (Vlnv.intern, (self.vendor, self.library, self.name, self.version))
 
     @property
     def str(self) -> str:
         """Returns a stringified version of the VLNV"""
-        return f"{self.vendor}:{self.library}:{self.name}:{self.version[0]}.{self.version[1]}"
-                
+        return self._str
+
+    def __eq__(self, a: object) -> bool:
+        if self is a:
+            return True
+        if not isinstance(a, Vlnv):
+            return NotImplemented
+        return self._hash == a._hash and (
+            self.vendor,
+            self.library,
+            self.name,
+            self.version,
+        ) == (a.vendor, a.library, a.name, a.version)
+
     def __hash__(self):
         """Returns a hash of the object."""
-        return hash(self.str)
+        return self._hash
@@ -7,7 +7,7 @@ from typing import Dict
 from .proc_sys_core import ProcSysCore
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, eq=False)
 class ZynqProcSysCore(ProcSysCore):
     """A specialised pydantic model the the Zynq 7000 processing system"""
 
@@ -0,0 +1,53 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from conftest import chain_module
+from pynqmetadata import Module
+
+
+def _build_module() -> Module:
+    """A chain of three cores, c1.p_out -> c2.p_in and c2.p_out -> c3.p_in"""
+    return chain_module(["c1", "c2", "c3"])
+
+
+def test_port_adjacency():
+    """The port-level graph matches the bus-level connections"""
+    mod = _build_module()
+    adj = mod.port_adjacency()
+    assert len(adj) == 6
+    assert list(adj.fan_out()) == [0, 1, 0, 1, 0, 0]
+    assert list(adj.fan_in()) == [0, 0, 1, 0, 1, 0]
+    assert adj.neighbours("mod:c1[block]:p_out[port]") == ["mod:c2[block]:p_in[port]"]
+
+    src, dst = adj.edges()
+    edges = {f"{adj.refs[s]}->{adj.refs[d]}" for s, d in zip(src, dst)}
+    assert edges == set(mod.busses.keys())
+    assert adj.objects[adj.index["mod:c3[block]:p_in[port]"]] is mod.blocks["c3"].ports["p_in"]
+
+
+def test_signal_adjacency():
+    """The signal-level graph has a node per signal and an edge per connection"""
+    mod = _build_module()
+    adj = mod.signal_adjacency()
+    assert len(adj) == 6
+    assert len(adj.indices) == 2
+    assert adj.neighbours("mod:c2[block]:p_out[port]:data[signal]") == [
+        "mod:c3[block]:p_in[port]:data[signal]"
+    ]
+
+
+def test_adjacency_to_scipy():
+    """The graph can be handed to scipy.sparse.csgraph"""
+    pytest.importorskip("scipy")
+    from scipy.sparse.csgraph import breadth_first_order
+
+    mod = _build_module()
+    adj = mod.signal_adjacency()
+    mat = adj.to_scipy()
+    assert mat.shape == (6, 6)
+    order = breadth_first_order(
+        mat, adj.index["mod:c1[block]:p_out[port]:data[signal]"], return_predecessors=False
+    )
+    assert adj.index["mod:c2[block]:p_in[port]:data[signal]"] in order
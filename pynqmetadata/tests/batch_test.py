@@ -0,0 +1,70 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from conftest import make_loop_core
+from pynqmetadata import Module
+from pynqmetadata.errors import WrongPolarityConnection
+
+
+def _chain(mod: Module, names) -> None:
+    """Adds the cores and connects each s_in to the previous core's s_out"""
+    for name in names:
+        mod.add(make_loop_core(name))
+    for prev, name in zip(names, names[1:]):
+        mod.lookup(f"{mod.ref}:{name}[block]:p1[port]:s_in[signal]").connect(
+            mod.lookup(f"{mod.ref}:{prev}[block]:p1[port]:s_out[signal]")
+        )
+
+
+def test_batch_matches_refresh():
+    """Edits made in a batch end up with the same busses as a full refresh"""
+    names = [f"c{i}" for i in range(5)]
+    md1 = Module(name="mod")
+    _chain(md1, names)
+    md1.refresh()
+
+    md2 = Module(name="mod")
+    with md2.batch():
+        _chain(md2, names)
+    assert set(md2.busses.keys()) == set(md1.busses.keys())
+    assert md2.json() == md1.json()
+
+    with md2.batch():
+        md2.blocks["c2"].remove()
+    assert all("c2" not in b for b in md2.busses)
+    assert "mod:c2[block]" not in md2._hierarchies._core_obj
+
+
+def test_batch_rollback_on_error():
+    """An exception inside the batch restores the module"""
+    mod = Module(name="mod")
+    _chain(mod, ["c0", "c1"])
+    mod.refresh()
+    ref = mod.json()
+
+    with pytest.raises(RuntimeError):
+        with mod.batch():
+            mod.add(make_loop_core("c2"))
+            mod.lookup("mod:c2[block]:p1[port]:s_in[signal]").connect(
+                mod.lookup("mod:c1[block]:p1[port]:s_out[signal]")
+            )
+            mod.blocks["c0"].remove()
+            raise RuntimeError("abort")
+    assert mod.json() == ref
+
+
+def test_batch_polarity_checked_on_commit():
+    """Polarity is validated in bulk when the batch is committed"""
+    mod = Module(name="mod")
+    _chain(mod, ["c0", "c1"])
+    mod.refresh()
+    ref = mod.json()
+
+    with pytest.raises(WrongPolarityConnection):
+        with mod.batch():
+            mod.lookup("mod:c0[block]:p1[port]:s_out[signal]").connect(
+                mod.lookup("mod:c1[block]:p1[port]:s_out[signal]")
+            )
+    assert mod.json() == ref
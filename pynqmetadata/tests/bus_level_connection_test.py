@@ -1,10 +1,11 @@
 # Copyright (C) 2022 Xilinx, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 
+import json
 import os
 
-from pynqmetadata import Module
-from pynqmetadata.frontends import Metadata
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
+from pynqmetadata.frontends import JsonFrontend, Metadata
 
 TEST_DIR = os.path.dirname(__file__)
 
@@ -87,3 +88,106 @@ def test_bus_level_connectivity():
     assert "resizer:rst_ps7_0_100M[block]:peripheral_aresetn[port]->resizer:axi_interconnect_0[block]:S00_ARESETN[port]" in md.busses
     assert "resizer:rst_ps7_0_100M[block]:peripheral_aresetn[port]->resizer:axi_interconnect_1[block]:S01_ARESETN[port]" in md.busses
     assert "resizer:rst_ps7_0_100M[block]:peripheral_aresetn[port]->resizer:resize_accel_0[block]:ap_rst_n[port]" in md.busses
+
+
+def test_bus_map_follows_connections():
+    """
+    Busses appear in the bus map as soon as signals are connected and stale
+    busses are dropped when the signals are disconnected, busses itself is
+    brought up to date by refresh()
+    """
+    mod = Module(name="mod")
+    cvlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    for name in ["c1", "c2"]:
+        c = Core(name=name, vlnv=cvlnv)
+        p = Port(name="p1")
+        p.add(Signal(name="s_in", width=1, driver=False))
+        p.add(Signal(name="s_out", width=1, driver=True))
+        c.add(p)
+        mod.add(c)
+    mod.refresh()
+    assert len(mod.bus_map()) == 0
+
+    s_in = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    s_out = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    s_in.connect(s_out)
+    bus_ref = "mod:c1[block]:p1[port]->mod:c2[block]:p1[port]"
+    assert list(mod.bus_map().keys()) == [bus_ref]
+    bus = mod.bus_map()[bus_ref]
+    assert bus._src_port is mod.blocks["c1"].ports["p1"]
+    assert bus.dst_port == "mod:c2[block]:p1[port]"
+    assert mod.bus_map()[bus_ref] is bus
+    assert mod.busses == {}
+    mod.refresh()
+    assert mod.busses == {bus_ref: bus}
+
+    s_in.disconnect(s_out, refresh=False)
+    assert bus_ref not in mod.bus_map()
+    assert len(mod.bus_map()) == 0
+    assert bus_ref in mod.busses
+    mod.refresh()
+    assert mod.busses == {}
+
+
+def _merged_bdc_design() -> Module:
+    """A module with a BDC block merged in as the XSA frontend does"""
+    vlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+
+    def core(name, ports, hier=None):
+        c = Core(name=name, vlnv=vlnv, hierarchy_name=hier)
+        for pname, driver in ports:
+            p = Port(name=pname)
+            p.add(Signal(name=pname, width=1, driver=driver))
+            c.add(p)
+        return c
+
+    def ext_port(name):
+        p = Port(name=name, external=True)
+        p.add(Signal(name=name, width=1, driver=False))
+        return p
+
+    top = Module(name="top")
+    top.add(core("ps", [("clk", True)]))
+    b = Module(name="bdc_0", hierarchy_name="bdc_0")
+    b.add(ext_port("aclk"))
+    top.add(b)
+    top.lookup("top:bdc_0[block]:aclk[port]:aclk[signal]").connect(
+        top.lookup("top:ps[block]:clk[port]:clk[signal]")
+    )
+    top.refresh()
+
+    bdc = Module(name="bdc")
+    bdc.add(ext_port("aclk"))
+    bdc.add(core("c0", [("clk", False), ("out", True)], "c0"))
+    bdc.add(core("c1", [("inp", False)], "c1"))
+    sub = Module(name="sub", hierarchy_name="sub")
+    sub.add(Port(name="din"))
+    sub.ports["din"].add(Signal(name="din", width=1, driver=False))
+    bdc.add(sub)
+    out = bdc.lookup("bdc:c0[block]:out[port]:out[signal]")
+    bdc.lookup("bdc:c1[block]:inp[port]:inp[signal]").connect(out)
+    bdc.lookup("bdc:sub[block]:din[port]:din[signal]").connect(out)
+    bdc.refresh()
+
+    mod = JsonFrontend(bdc.json().replace(bdc.name, b.name))
+    mod.hierarchy_name = b.hierarchy_name
+    b.merge(mod, skip_external=True, inherit_signal_width=True, inherit_addr_info=True)
+    b.refresh()
+    return top
+
+
+def test_merged_bdc_json():
+    """
+    The JSON rendering of a design with a merged BDC matches the one from
+    before the bus map (the nested module keeps the busses of its last
+    refresh), and reading the bus map does not change it
+    """
+    top = _merged_bdc_design()
+    with open(f"{TEST_DIR}/golden_dicts/merged_bdc/module_golden.json") as f:
+        golden = json.load(f)
+    assert json.loads(top.json()) == golden
+    assert top.blocks["bdc_0"].blocks["sub"].busses == {}
+
+    for mod in [top, top.blocks["bdc_0"], top.blocks["bdc_0"].blocks["sub"]]:
+        list(mod.bus_map().values())
+    assert json.loads(top.json()) == golden
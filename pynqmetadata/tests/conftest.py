@@ -0,0 +1,80 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Small designs shared by the tests, imported with `from conftest import ...`"""
+
+from typing import Dict, Iterable, Optional
+
+from pynqmetadata import Core, Module, Parameter, Port, Signal, Vlnv
+
+
+def make_vlnv(
+    name: str = "p", version=(1, 0), vendor: str = "c", library: str = "i"
+) -> Vlnv:
+    return Vlnv(vendor=vendor, library=library, name=name, version=version)
+
+
+def make_core(
+    name: str,
+    width: int = 8,
+    signals: Iterable[str] = ("data",),
+    params: Optional[Dict[str, str]] = None,
+    cls=Core,
+    vlnv: Optional[Vlnv] = None,
+    **kwargs,
+) -> Core:
+    """
+    A core with an input port p_in and an output port p_out holding the
+    given signals (no ports if there are none), and the given parameters,
+    by default WIDTH. Other keyword arguments are passed to the core.
+    """
+    c = cls(name=name, vlnv=make_vlnv() if vlnv is None else vlnv, **kwargs)
+    signals = list(signals)
+    if signals:
+        for pname, driver in [("p_in", False), ("p_out", True)]:
+            p = Port(name=pname)
+            for sname in signals:
+                p.add(Signal(name=sname, width=width, driver=driver))
+            c.add(p)
+    params = {"WIDTH": str(width)} if params is None else params
+    for pname, value in params.items():
+        c.parameters.add_value(pname, value)
+    return c
+
+
+def make_loop_core(name: str, in_width: int = 1, out_width: int = 1) -> Core:
+    """A core with a single port p1 holding an input s_in and an output s_out"""
+    c = Core(name=name, vlnv=make_vlnv())
+    p = Port(name="p1")
+    p.add(Signal(name="s_in", width=in_width, driver=False))
+    p.add(Signal(name="s_out", width=out_width, driver=True))
+    c.add(p)
+    return c
+
+
+def chain_module(names: Iterable[str], name: str = "mod", **kwargs) -> Module:
+    """
+    A module of cores made by make_core(), called with kwargs, where the
+    data signal of each p_out drives the p_in of the next core
+    """
+    names = list(names)
+    mod = Module(name=name)
+    for cname in names:
+        mod.add(make_core(cname, **kwargs))
+    for src, dst in zip(names, names[1:]):
+        mod.blocks[src].ports["p_out"].signals["data"].connect(
+            mod.blocks[dst].ports["p_in"].signals["data"]
+        )
+    mod.refresh()
+    return mod
+
+
+def build_module(cores: Iterable[str] = ("c1", "c2")) -> Module:
+    """A module of unconnected loop cores, each with a WIDTH parameter of 32"""
+    mod = Module(name="mod")
+    for cname in cores:
+        c = make_loop_core(cname)
+        c.add(Parameter(name="WIDTH", value="32"))
+        mod.add(c)
+    mod.refresh()
+    return mod
@@ -0,0 +1,79 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import build_module
+from pynqmetadata import MetadataExtension, Port
+
+
+class NoteExtension(MetadataExtension):
+    info: str = ""
+
+
+def test_equivalent_models_hash_equal():
+    """Two separately built but equivalent models have the same content hash"""
+    md1 = build_module()
+    md2 = build_module()
+    assert md1.content_hash() == md2.content_hash()
+    assert md1 == md2
+    assert md1.blocks["c1"] != md1.blocks["c2"]
+
+
+def test_hash_invalidated_up_the_tree():
+    """Modifying an object changes the hash of all of its parents"""
+    mod = build_module()
+    mod_hash = mod.content_hash()
+    c1_hash = mod.blocks["c1"].content_hash()
+    c2_hash = mod.blocks["c2"].content_hash()
+
+    mod.blocks["c1"].parameters["WIDTH"].value = "64"
+    assert mod.blocks["c1"].content_hash() != c1_hash
+    assert mod.blocks["c2"].content_hash() == c2_hash
+    assert mod.content_hash() != mod_hash
+
+    mod.blocks["c1"].parameters["WIDTH"].value = "32"
+    assert mod.content_hash() == mod_hash
+
+    mod.blocks["c2"].ext["test"] = NoteExtension(info="hello")
+    assert mod.content_hash() != mod_hash
+    del mod.blocks["c2"].ext["test"]
+    assert mod.content_hash() == mod_hash
+
+
+def test_hash_tracks_connections():
+    """Connecting and disconnecting signals updates the hash"""
+    mod = build_module()
+    mod_hash = mod.content_hash()
+
+    s_in = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    s_out = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    s_in.connect(s_out)
+    assert mod.content_hash() != mod_hash
+
+    s_in.disconnect(s_out, refresh=False)
+    assert mod.content_hash() == mod_hash
+
+
+def test_equality_sees_in_place_changes():
+    """Equality compares the fields, not a cached hash of them"""
+    md1 = build_module()
+    md2 = build_module()
+    assert md1 == md2
+    md1.blocks["c1"].ports["p2"] = Port(name="p2")
+    assert md1 != md2
+    del md1.blocks["c1"].ports["p2"]
+    assert md1 == md2
+    md1.blocks["c1"].ports["p1"].signals["s_in"].con_refs.append("mod:c2[block]")
+    assert md1 != md2
+    assert md1.blocks["c1"] != md2.blocks["c1"]
+    del md2.blocks["c2"]
+    assert md1.blocks["c2"] != md2.blocks.get("c2")
+
+
+def test_hash_invalidated_above_an_unhashed_object():
+    """Invalidation reaches every cached hash above the modified object"""
+    mod = build_module()
+    mod_hash = mod.content_hash()
+    signal = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    object.__setattr__(signal._parent, "_hash", None)
+    signal.width = 8
+    assert mod.content_hash() != mod_hash
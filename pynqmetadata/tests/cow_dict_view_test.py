@@ -0,0 +1,62 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import json
+import pickle
+
+from pynqmetadata.views.runtime.cow_dict_view import CowDictView
+
+
+def _source() -> dict:
+    return {
+        "a": {"registers": {"r0": {"offset": 0}}, "gpio": {}, "pins": [1, 2]},
+        "b": {"registers": {}, "gpio": {}, "pins": []},
+    }
+
+
+def test_cow_dict_view_copy_on_read():
+    """Writes through the view never reach the source dict"""
+    src = _source()
+    d = CowDictView(src)
+    d["a"]["gpio"]["p0"] = 1
+    d["a"]["pins"].append(3)
+    del d["b"]
+    assert src == _source()
+    assert d["a"]["gpio"] == {"p0": 1}
+    assert d["a"]["pins"] == [1, 2, 3]
+    # Only the parts that were read are copied
+    assert dict.__getitem__(d["a"], "registers") is src["a"]["registers"]
+
+
+def test_cow_dict_view_snapshot():
+    """A snapshot holds the current content and is not changed by later writes"""
+    src = _source()
+    d = CowDictView(src)
+    d["a"]["gpio"]["p0"] = 1
+    snap = d._snapshot()
+    d["a"]["gpio"]["p1"] = 2
+    assert type(snap["a"]) is dict
+    assert snap["a"]["gpio"] == {"p0": 1}
+    assert snap["b"] is src["b"]
+
+
+def test_cow_dict_view_shared():
+    """With shared=True a dict reached through two paths is the same view"""
+    inner = {"ip": {}}
+    src = {"h": {"hierarchies": {"s": inner}}, "h/s": inner}
+    d = CowDictView(src, shared=True)
+    d["h/s"]["ip"]["x"] = 1
+    assert d["h"]["hierarchies"]["s"] is d["h/s"]
+    assert d["h"]["hierarchies"]["s"]["ip"] == {"x": 1}
+    assert inner == {"ip": {}}
+
+
+def test_cow_dict_view_plain_copies():
+    """Deep copies and pickles are plain dicts, json sees the content"""
+    d = CowDictView(_source())
+    d["a"]["gpio"]["p0"] = 1
+    for c in [copy.deepcopy(d), pickle.loads(pickle.dumps(d))]:
+        assert type(c) is dict and type(c["a"]) is dict
+        assert c["a"]["gpio"] == {"p0": 1}
+    assert json.loads(json.dumps(d)) == d
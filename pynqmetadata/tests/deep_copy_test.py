@@ -3,6 +3,8 @@
 
 import os
 
+from conftest import chain_module
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
 from pynqmetadata.frontends import HwhFrontend
 
 TEST_DIR = os.path.dirname(__file__)
@@ -19,3 +21,96 @@ def test_deep_copy():
 
     # if md1.dict() == md2.dict():
     #    raise RuntimeError("Both copies are identical even after a core was removed")
+
+
+def test_cow_copy():
+    """A structural sharing copy can be modified without changing the original"""
+    mod = Module(name="mod")
+    cvlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    for name in ["c1", "c2"]:
+        c = Core(name=name, vlnv=cvlnv)
+        p = Port(name="p1")
+        p.add(Signal(name="s_in", width=1, driver=False))
+        p.add(Signal(name="s_out", width=1, driver=True))
+        c.add(p)
+        mod.add(c)
+    mod.lookup("mod:c1[block]:p1[port]:s_in[signal]").connect(
+        mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    )
+    mod.refresh()
+    ref = mod.dict()
+
+    md2 = mod.copy(cow=True)
+    if md2.dict() != ref:
+        raise RuntimeError("The copy-on-write copy is not equivalent")
+
+    md2.blocks["c1"].ext["vis"] = {"hidden": "yes"}
+    md2.blocks["c1"].ports["p1"].signals["s_in"].width = 4
+    del md2.blocks["c2"]
+    if mod.dict() != ref:
+        raise RuntimeError("Modifying the copy-on-write copy changed the original")
+    if md2.lookup("mod:c1[block]") is not md2.blocks["c1"]:
+        raise RuntimeError("Children of the copy are not shared between containers")
+    if md2.blocks["c1"].ports["p1"].parent() is not md2.blocks["c1"]:
+        raise RuntimeError("Parent of a copied port is not the copied block")
+
+
+def _links(mod: Module) -> dict:
+    """The connections held by every signal of mod, as refs"""
+    return {
+        sig.ref: (list(sig.con_refs), sorted(sig._incoming), sorted(sig._connections))
+        for b in mod.blocks.values()
+        for p in b.ports.values()
+        for sig in p.signals.values()
+    }
+
+
+def test_cow_copy_links():
+    """Connections of a structural sharing copy link the objects of the copy"""
+    mod = chain_module(["a", "b", "c"])
+    ref = mod.json()
+    links = _links(mod)
+
+    md2 = mod.copy(cow=True)
+    a_out = md2.blocks["a"].ports["p_out"].signals["data"]
+    b_in = md2.blocks["b"].ports["p_in"].signals["data"]
+    assert a_out._connections[b_in.ref] is b_in
+    assert b_in._incoming[a_out.ref] is a_out
+    for bus in md2.busses.values():
+        assert bus._src_port is md2.lookup(bus._src_port.ref)
+
+    a_out.disconnect(b_in, refresh=False)
+    md2.blocks["c"].remove()
+    assert mod.json() == ref
+    assert _links(mod) == links
+
+    mod.blocks["b"].remove()
+    assert mod.blocks["a"].ports["p_out"].signals["data"].con_refs == []
+
+
+def test_vis_hierarchy_filter_copy():
+    """The filtered module is a full copy, annotating it leaves the original alone"""
+    from pynqmetadata.frontends.visualisations import VisHierarchyFilter
+
+    mod = Module(name="mod")
+    cvlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    for name in ["c1", "c2"]:
+        c = Core(name=name, vlnv=cvlnv, hierarchy_name=f"h/{name}")
+        p = Port(name="p1")
+        p.add(Signal(name="s_in", width=1, driver=False))
+        p.add(Signal(name="s_out", width=1, driver=True))
+        c.add(p)
+        mod.add(c)
+    mod.lookup("mod:c1[block]:p1[port]:s_in[signal]").connect(
+        mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    )
+    mod.refresh()
+    ref = mod.dict()
+
+    ret = VisHierarchyFilter(mod, mod.hierarchy("h"))
+    if mod.dict() != ref:
+        raise RuntimeError("Filtering a hierarchy changed the original module")
+    for bus in ret.busses.values():
+        for port in [bus._src_port, bus._dst_port]:
+            if ret.lookup(port.ref) is not port:
+                raise RuntimeError("A bus of the filtered copy reaches the original")
@@ -0,0 +1,60 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import build_module
+
+
+def test_diff_identical():
+    """Identical models have an empty diff"""
+    md1 = build_module()
+    md2 = build_module()
+    assert not md1.diff(md2)
+
+
+def test_diff_sees_in_place_changes():
+    """Hashes cached before an ext entry is changed in place do not hide the change"""
+    md1 = build_module()
+    md2 = build_module()
+    for md in (md1, md2):
+        md.blocks["c1"].ext["vis"] = {"hidden": "no"}
+        md.content_hash()
+    md2.blocks["c1"].ext["vis"]["hidden"] = "yes"
+
+    d = md1.diff(md2)
+    assert d.changed == {"mod:c1[block]": ["ext"]}
+    assert md1 != md2
+
+
+def test_diff_blocks_and_parameters():
+    """Added and removed blocks, and changed parameters are reported"""
+    md1 = build_module(cores=("c1", "c2"))
+    md2 = build_module(cores=("c1", "c3"))
+    md2.blocks["c1"].parameters["WIDTH"].value = "64"
+
+    d = md1.diff(md2)
+    assert "mod:c3[block]" in d.added
+    assert "mod:c3[block]:p1[port]:s_in[signal]" in d.added
+    assert "mod:c2[block]" in d.removed
+    assert d.changed == {"mod:c1[block]:WIDTH[parameter]": ["value"]}
+    assert list(d.of_type("block").added) == ["mod:c3[block]"]
+    assert list(d.of_type("parameter").changed) == ["mod:c1[block]:WIDTH[parameter]"]
+
+
+def test_diff_connections():
+    """Signal level connections are reported"""
+    md1 = build_module()
+    md2 = build_module()
+    md2.lookup("mod:c1[block]:p1[port]:s_in[signal]").connect(
+        md2.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    )
+    md2.refresh()
+
+    d = md1.diff(md2)
+    assert d.connections_added == {
+        (
+            "mod:c1[block]:p1[port]:s_in[signal]",
+            "mod:c2[block]:p1[port]:s_out[signal]",
+        )
+    }
+    assert len(d.changed) == 0
+    assert len(d.of_type("bus").added) == 1
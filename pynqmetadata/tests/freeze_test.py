@@ -0,0 +1,133 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pickle
+import threading
+from typing import List
+
+import pytest
+
+from conftest import chain_module, make_core
+from pynqmetadata import Core, Module, Parameter
+from pynqmetadata.errors import FrozenModuleModified
+
+
+def _module() -> Module:
+    return chain_module(f"c{i}" for i in range(4))
+
+
+def test_freeze_is_a_precomputed_copy():
+    mod = _module()
+    frozen = mod.freeze()
+    assert frozen is not mod
+    assert frozen.freeze() is frozen
+    assert frozen == mod
+    assert frozen.json() == mod.json()
+    assert list(frozen.busses.keys()) == list(mod.busses.keys())
+    assert frozen.__dict__["_hash"] is not None
+    assert frozen.blocks["c0"].ports["p_out"]._destinations is not None
+    assert frozen._block_index is not None
+
+    # The snapshot is independent of the module it was taken from
+    mod.blocks["c3"].remove()
+    assert "c3" in frozen.blocks
+
+
+def test_frozen_mutators_raise():
+    frozen = _module().freeze()
+    c0 = frozen.blocks["c0"]
+    sig = c0.ports["p_out"].signals["data"]
+    with pytest.raises(FrozenModuleModified):
+        frozen.add(make_core("c9"))
+    with pytest.raises(FrozenModuleModified):
+        c0.remove()
+    with pytest.raises(FrozenModuleModified):
+        sig.disconnect(frozen.blocks["c1"].ports["p_in"].signals["data"])
+    with pytest.raises(FrozenModuleModified):
+        frozen.refresh()
+    with pytest.raises(FrozenModuleModified):
+        with frozen.batch():
+            pass
+    with pytest.raises(FrozenModuleModified):
+        c0.name = "renamed"
+    with pytest.raises(FrozenModuleModified):
+        sig.width = 16
+    with pytest.raises(FrozenModuleModified):
+        del frozen.blocks["c0"]
+    with pytest.raises(FrozenModuleModified):
+        c0.ports.pop("p_in")
+    with pytest.raises(FrozenModuleModified):
+        c0.parameters.add_value("DEPTH", "16")
+    with pytest.raises(FrozenModuleModified):
+        c0.parameters["WIDTH"].value = "16"
+    with pytest.raises(FrozenModuleModified):
+        list(frozen.busses.values())[0].name = "bus"
+    with pytest.raises(FrozenModuleModified):
+        frozen._hierarchies.add(Core(name="extra"))
+    assert frozen == frozen.thaw()
+
+    # Annotations can still be made in the ext space
+    c0.ext["note"] = Parameter(name="note", value="x")
+    assert "note" in c0.ext
+
+
+def test_thaw_and_cow_copy_are_mutable():
+    mod = _module()
+    frozen = mod.freeze()
+    for copy in [frozen.thaw(), frozen.copy(cow=True)]:
+        copy.blocks["c3"].remove()
+        copy.blocks["c0"].parameters.add_value("DEPTH", "16")
+        copy.refresh()
+        assert "c3" not in copy.blocks
+        assert "c3" in frozen.blocks
+        assert "DEPTH" not in frozen.blocks["c0"].parameters
+    assert frozen.copy().__dict__.get("_frozen")
+
+
+def test_frozen_pickle():
+    frozen = _module().freeze()
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert restored == frozen
+    assert list(restored.busses.keys()) == list(frozen.busses.keys())
+    with pytest.raises(FrozenModuleModified):
+        restored.blocks["c0"].remove()
+    with pytest.raises(FrozenModuleModified):
+        restored.blocks["c9"] = make_core("c9")
+    with pytest.raises(FrozenModuleModified):
+        restored.blocks["c0"].parameters["WIDTH"].value = "16"
+
+
+def test_frozen_shared_between_threads():
+    frozen = _module().freeze()
+    expected = (
+        frozen.json(),
+        sorted(frozen.busses.keys()),
+        sorted(frozen.select(type="core").keys()),
+    )
+    errors: List[BaseException] = []
+    results = []
+
+    def reader() -> None:
+        try:
+            for _ in range(20):
+                with frozen.reading():
+                    results.append(
+                        frozen.read(
+                            lambda m: (
+                                m.json(),
+                                sorted(m.busses.keys()),
+                                sorted(m.select(type="core").keys()),
+                            )
+                        )
+                    )
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(results) == 160
+    assert all(r == expected for r in results)
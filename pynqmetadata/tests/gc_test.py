@@ -0,0 +1,75 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import gc
+import pickle
+import weakref
+
+from conftest import chain_module, make_core
+from pynqmetadata import Module, freeze_gc, unfreeze_gc
+
+
+def _module() -> Module:
+    mod = chain_module(f"c{i}" for i in range(4))
+    mod.blocks["c0"].parameters["WIDTH"]
+    return mod
+
+
+def _freed_without_collector(make) -> bool:
+    """Returns true if the signal in the module made by make() is freed by refcounting"""
+    collect = gc.isenabled()
+    gc.disable()
+    try:
+        mod = make()
+        sig = weakref.ref(mod.lookup("mod:c1[block]:p_in[port]:data[signal]"))
+        param = weakref.ref(mod.blocks["c0"].parameters["WIDTH"])
+        bus = weakref.ref(list(mod.busses.values())[0])
+        mod.dispose()
+        del mod
+        return sig() is None and param() is None and bus() is None
+    finally:
+        if collect:
+            gc.enable()
+
+
+def test_dispose_breaks_cycles():
+    assert _freed_without_collector(_module)
+
+
+def test_weak_parents():
+    mod = _module().use_weak_parents()
+    mod.add(make_core("c9"))
+    c0 = mod.blocks["c0"]
+    sig = c0.ports["p_out"].signals["data"]
+    assert "_parent" not in c0.__dict__
+    assert "_parent" not in mod.blocks["c9"].ports["p_in"].__dict__
+    assert sig.parent().parent() is c0
+    assert c0.parent() is mod
+    assert list(mod.busses.values())[0].parent() is mod
+    assert mod.blocks["c0"].parameters["WIDTH"].parent() is c0
+
+    for other in [
+        copy.deepcopy(mod),
+        mod.copy(cow=True),
+        pickle.loads(pickle.dumps(mod)),
+    ]:
+        assert other == mod
+        assert other.blocks["c0"].parent() is other
+        assert "_parent" not in other.blocks["c0"].__dict__
+
+    # The children of a dropped module no longer have a parent
+    del mod
+    gc.collect()
+    assert c0.parent() is None
+    assert sig.parent().parent() is c0
+
+
+def test_freeze_gc():
+    mod = _module()
+    try:
+        assert freeze_gc() > 0
+        assert mod.lookup("mod:c0[block]").parent() is mod
+    finally:
+        unfreeze_gc()
+    assert gc.get_freeze_count() == 0
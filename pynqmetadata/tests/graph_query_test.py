@@ -0,0 +1,102 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import make_core, make_vlnv
+from pynqmetadata import (Core, ManagerPort, Module, Signal, StreamPort,
+                          SubordinatePort)
+
+
+def _core(name: str, vname: str) -> Core:
+    return make_core(name, signals=(), params={}, vlnv=make_vlnv(vname))
+
+
+def _port(cls, name: str, **kwargs):
+    """A port with a single data signal, driven by managers and stream drivers"""
+    p = cls(name=name, **kwargs)
+    driver = cls is ManagerPort or kwargs.get("driver", False)
+    p.add(Signal(name="data", width=32, driver=driver))
+    return p
+
+
+def _wire(mod: Module, src: str, dst: str) -> None:
+    s = mod.lookup(f"mod:{src}[port]:data[signal]")
+    d = mod.lookup(f"mod:{dst}[port]:data[signal]")
+    s.connect(d)
+    d.connect(s)
+
+
+def _build_module() -> Module:
+    """
+    ps.M_AXI -> ic.S00_AXI, ic.M00_AXI -> ip0.S_AXI, ic.M01_AXI -> ip1.S_AXI
+    and a stream ip0.M_AXIS -> ip1.S_AXIS
+    """
+    mod = Module(name="mod")
+    ps = _core("ps", "ps")
+    ps.add(_port(ManagerPort, "M_AXI"))
+    mod.add(ps)
+    ic = _core("ic", "axi_interconnect")
+    ic.add(_port(SubordinatePort, "S00_AXI"))
+    ic.add(_port(ManagerPort, "M00_AXI"))
+    ic.add(_port(ManagerPort, "M01_AXI"))
+    mod.add(ic)
+    for name in ["ip0", "ip1"]:
+        ip = _core(name, "accel")
+        ip.add(_port(SubordinatePort, "S_AXI"))
+        ip.add(_port(StreamPort, "M_AXIS", driver=True))
+        ip.add(_port(StreamPort, "S_AXIS", driver=False))
+        mod.add(ip)
+
+    _wire(mod, "ps[block]:M_AXI", "ic[block]:S00_AXI")
+    _wire(mod, "ic[block]:M00_AXI", "ip0[block]:S_AXI")
+    _wire(mod, "ic[block]:M01_AXI", "ip1[block]:S_AXI")
+    _wire(mod, "ip0[block]:M_AXIS", "ip1[block]:S_AXIS")
+    mod.refresh()
+    return mod
+
+
+def test_cones():
+    """Downstream and upstream cones follow the direction of the ports"""
+    mod = _build_module()
+    g = mod.graph()
+    aximm = (ManagerPort, SubordinatePort)
+    assert [b.name for b in g.downstream_cone("mod:ps[block]", port_types=aximm)] == [
+        "ic",
+        "ip0",
+        "ip1",
+    ]
+    assert [b.name for b in g.upstream_cone("mod:ip1[block]", port_types=aximm)] == [
+        "ic",
+        "ps",
+    ]
+    assert [b.name for b in g.upstream_cone(mod.blocks["ip1"])] == ["ic", "ip0", "ps"]
+    assert g.downstream_cone("mod:ip1[block]") == []
+    assert [b.name for b in g.downstream_cone("mod:ps[block]", through=lambda b: b.name != "ic")] == ["ic"]
+
+
+def test_shortest_path():
+    """The shortest path passes through the ports and blocks in between"""
+    mod = _build_module()
+    path = mod.graph().shortest_path("mod:ps[block]:M_AXI[port]", "mod:ip1[block]")
+    assert [o.ref for o in path] == [
+        "mod:ps[block]:M_AXI[port]",
+        "mod:ic[block]:S00_AXI[port]",
+        "mod:ic[block]",
+        "mod:ic[block]:M01_AXI[port]",
+        "mod:ip1[block]:S_AXI[port]",
+        "mod:ip1[block]",
+    ]
+    assert mod.graph().shortest_path("mod:ip1[block]", "mod:ps[block]") == []
+
+
+def test_query_tracks_generation():
+    """Memoised results are dropped when the connectivity changes"""
+    mod = _build_module()
+    g = mod.graph()
+    assert [b.name for b in g.downstream_cone("mod:ip0[block]", port_types=StreamPort)] == ["ip1"]
+    mod.lookup("mod:ip0[block]:M_AXIS[port]:data[signal]").disconnect(
+        mod.lookup("mod:ip1[block]:S_AXIS[port]:data[signal]")
+    )
+    mod.lookup("mod:ip1[block]:S_AXIS[port]:data[signal]").disconnect(
+        mod.lookup("mod:ip0[block]:M_AXIS[port]:data[signal]")
+    )
+    assert g.downstream_cone("mod:ip0[block]", port_types=StreamPort) == []
@@ -0,0 +1,104 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import make_core
+from pynqmetadata import Hierarchy, Module
+from pynqmetadata.errors import CoreAlreadyExists, HierarchyAlreadyExists
+
+
+def _build_module() -> Module:
+    mod = Module(name="mod")
+    for name, hier in [
+        ("c0", None),
+        ("c1", "audio/c1"),
+        ("c2", "audio/filters/c2"),
+        ("c3", "audio/filters/c3"),
+        ("c4", "video/filters/c4"),
+    ]:
+        mod.add(make_core(name, signals=(), params={}, hierarchy_name=hier))
+    mod.refresh()
+    return mod
+
+
+def test_hierarchy_lookup():
+    """Hierarchies are found by path, including those with the same name"""
+    mod = _build_module()
+    audio = mod.hierarchy("audio/filters")
+    video = mod.hierarchy("video/filters")
+    assert audio is not video
+    assert audio.core_ref == {"mod:c2[block]", "mod:c3[block]"}
+    assert video.core_ref == {"mod:c4[block]"}
+    assert mod.hierarchy("audio")._hierarchies_obj["filters"] is audio
+    try:
+        mod.hierarchy("audio/missing")
+    except KeyError:
+        pass
+    else:
+        raise RuntimeError("Test failed. expected a KeyError")
+
+
+def test_hierarchy_exists():
+    """exists() covers the sub-hierarchies of a hierarchy and nothing else"""
+    mod = _build_module()
+    root = mod._hierarchies
+    audio = mod.hierarchy("audio")
+    c2 = mod.blocks["c2"]
+    c4 = mod.blocks["c4"]
+    assert root.exists(c2) and root.exists(c4)
+    assert audio.exists(c2) and not audio.exists(c4)
+    assert audio.exists(Hierarchy(name="filters"))
+    assert not mod.hierarchy("audio/filters").exists(Hierarchy(name="filters"))
+    try:
+        root.add(c2)
+    except CoreAlreadyExists:
+        pass
+    else:
+        raise RuntimeError("Test failed. expected CoreAlreadyExists")
+    try:
+        audio.add(Hierarchy(name="filters"))
+    except HierarchyAlreadyExists:
+        pass
+    else:
+        raise RuntimeError("Test failed. expected HierarchyAlreadyExists")
+
+
+def test_hierarchy_adopt():
+    """A hierarchy built on its own joins the indexes of the tree it is added to"""
+    mod = _build_module()
+    sub = Hierarchy(name="extra", path="audio/extra")
+    sub.add(Hierarchy(name="deeper", path="audio/extra/deeper"))
+    mod.hierarchy("audio").add(sub)
+    assert mod.hierarchy("audio/extra/deeper")._up is sub
+    assert mod._hierarchies.exists(Hierarchy(name="deeper"))
+
+
+def test_hierarchy_prefix_queries():
+    """Cores and sub-hierarchies below a path, with their counts"""
+    mod = _build_module()
+    audio = mod.hierarchy("audio")
+    assert set(audio.cores()) == {"mod:c1[block]", "mod:c2[block]", "mod:c3[block]"}
+    assert set(audio.cores(recursive=False)) == {"mod:c1[block]"}
+    assert audio.cores()["mod:c2[block]"] is mod.blocks["c2"]
+    assert audio.core_count == 3
+    assert audio.hierarchy_count == 1
+    assert list(audio.hierarchies()) == ["audio/filters"]
+    assert mod._hierarchies.core_count == 5
+    assert mod._hierarchies.hierarchy_count == 4
+
+
+def test_hierarchy_match():
+    """Glob patterns are matched one level at a time"""
+    mod = _build_module()
+    assert set(mod.match_hierarchies("*")) == {"audio", "video"}
+    assert set(mod.match_hierarchies("a*")) == {"audio"}
+    assert set(mod.match_hierarchies("*/filters")) == {
+        "audio/filters",
+        "video/filters",
+    }
+    assert set(mod.match_hierarchies("audio/filters")) == {"audio/filters"}
+    assert set(mod.match_hierarchies("**/filters")) == {
+        "audio/filters",
+        "video/filters",
+    }
+    assert set(mod.match_hierarchies("**")) == set(mod._hierarchies.hierarchies())
+    assert mod.match_hierarchies("audio/missing") == {}
@@ -0,0 +1,52 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+from conftest import make_core
+from pynqmetadata import Module, Parameter
+
+
+def _module() -> Module:
+    mod = Module(name="mod")
+    for i in range(3):
+        width = 2 + 8 * i
+        signals = [f"d{j}" for j in range(width)]
+        mod.add(make_core(f"c{i}", 1, signals, {"WIDTH": str(width)}))
+    for i in range(2):
+        src = mod.lookup(f"mod:c{i}[block]:p_out[port]:d0[signal]")
+        src.connect(mod.lookup(f"mod:c{i + 1}[block]:p_in[port]:d0[signal]"))
+    mod.refresh()
+    mod.busses.values()
+    mod.blocks["c0"].parameters["WIDTH"]
+    return mod
+
+
+def test_memory_report():
+    mod = _module()
+    mod.blocks["c1"].ext["note"] = Parameter(name="note", value="x" * 1000)
+    report = mod.memory_report(top=2)
+    assert json.loads(json.dumps(report)) == report
+
+    classes = report["classes"]
+    assert classes["Module"]["count"] == 1
+    assert classes["Core"]["count"] == 3
+    assert classes["Port"]["count"] == 6
+    assert classes["Signal"]["count"] == 2 * (2 + 10 + 18)
+    assert classes["Parameter"]["count"] == 2
+    assert classes["BusConnection"]["count"] == 2
+    assert classes["Hierarchy"]["count"] == 1
+    assert report["objects"] == sum(c["count"] for c in classes.values())
+    assert report["deep"] == sum(c["deep"] for c in classes.values())
+    for c in classes.values():
+        assert 0 < c["shallow"] <= c["deep"]
+    assert list(classes)[0] == "Signal"
+    assert report["ext"] > 1000
+    assert report["strings"]["size"] > 1000
+
+    largest = report["largest_blocks"]
+    assert [b["ref"] for b in largest] == ["mod:c2[block]", "mod:c1[block]"]
+    assert largest[0]["objects"] == 1 + 2 + 2 * 18
+
+    # Reporting does not change the module, nor the next report
+    assert mod.memory_report(top=2) == report
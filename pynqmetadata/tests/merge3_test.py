@@ -0,0 +1,87 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import build_module
+from pynqmetadata.errors import MergeConflict
+
+
+def test_merge3_applies_upstream_changes():
+    """Changes from base to theirs are applied, local annotations are kept"""
+    base = build_module(cores=("c1", "c2"))
+    ours = build_module(cores=("c1", "c2"))
+    theirs = build_module(cores=("c1", "c3"))
+    theirs.blocks["c1"].parameters["WIDTH"].value = "64"
+    ours.blocks["c1"].ext["note"] = "kept"
+
+    ours.merge3(base, theirs)
+    ours.refresh()
+    assert ours.blocks["c1"].parameters["WIDTH"].value == "64"
+    assert ours.blocks["c1"].ext["note"] == "kept"
+    assert "c3" in ours.blocks and "c2" not in ours.blocks
+    assert ours.blocks["c3"].ref == "mod:c3[block]"
+
+
+def test_merge3_connections():
+    """Connections added upstream are linked by the next refresh"""
+    base = build_module()
+    ours = build_module()
+    theirs = build_module()
+    theirs.lookup("mod:c1[block]:p1[port]:s_in[signal]").connect(
+        theirs.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    )
+    theirs.refresh()
+
+    ours.merge3(base, theirs)
+    ours.refresh()
+    sig = ours.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    assert sig.connection_exists(ours.lookup("mod:c2[block]:p1[port]:s_out[signal]"))
+    assert not ours.diff(theirs)
+
+
+def test_merge3_conflicts():
+    """A field changed differently on both sides keeps the local value"""
+    base = build_module()
+    ours = build_module()
+    theirs = build_module()
+    ours.lookup("mod:c1[block]:p1[port]:s_in[signal]").width = 2
+    theirs.lookup("mod:c1[block]:p1[port]:s_in[signal]").width = 4
+    theirs.blocks["c2"].parameters["WIDTH"].value = "64"
+
+    try:
+        ours.merge3(base, theirs)
+    except MergeConflict as e:
+        assert len(e.errors) == 1
+        assert "s_in[signal]" in str(e.errors[0])
+    else:
+        raise RuntimeError("Test failed. expected a MergeConflict")
+    assert ours.lookup("mod:c1[block]:p1[port]:s_in[signal]").width == 2
+    assert ours.blocks["c2"].parameters["WIDTH"].value == "64"
+
+
+def test_merge3_skips_unchanged_subtrees():
+    """Blocks that did not change upstream are left untouched"""
+    base = build_module()
+    ours = build_module()
+    theirs = build_module()
+    theirs.blocks["c2"].parameters["WIDTH"].value = "64"
+    c1 = ours.blocks["c1"]
+    c1_hash = c1.content_hash()
+
+    ours.merge3(base, theirs)
+    assert ours.blocks["c1"] is c1
+    assert c1.content_hash() == c1_hash
+    assert ours.content_hash() == theirs.content_hash()
+
+
+def test_merge3_sees_in_place_changes():
+    """Hashes cached before an ext entry is changed in place do not hide the change"""
+    base = build_module()
+    ours = build_module()
+    theirs = build_module()
+    for md in (base, ours, theirs):
+        md.blocks["c1"].ext["vis"] = {"hidden": "no"}
+        md.content_hash()
+    theirs.blocks["c1"].ext["vis"]["hidden"] = "yes"
+
+    ours.merge3(base, theirs)
+    assert ours.blocks["c1"].ext["vis"]["hidden"] == "yes"
@@ -3,8 +3,8 @@
 
 import os
 
-from pynqmetadata import (BitField, Core, Module, Parameter, Port, Register,
-                          Signal, SubordinatePort, Vlnv)
+from pynqmetadata import (BitField, Core, MetadataExtension, Module, Parameter,
+                          Port, Register, Signal, SubordinatePort, Vlnv)
 from pynqmetadata.errors import MergeConflict
 from pynqmetadata.frontends import HwhFrontend
 
@@ -110,3 +110,72 @@ def test_module_merge_conflict():
         pass
     except:
         raise RuntimeError("Test failed! unexpected error")
+
+
+def _merge_module(range: int, width: int, value: str) -> Module:
+    m = Module(name="m")
+    c = Core(name="c1", vlnv=Vlnv(vendor="a", library="b", name="c1", version=(1, 0)))
+    sp = SubordinatePort(name="sp1", baseaddr=0xDEADBEEF, range=range)
+    sp.add(Signal(name="data", width=width, driver=False))
+    c.add(sp)
+    c.parameters.add_value("DEPTH", value)
+    m.add(c)
+    return m
+
+
+def test_module_merge_collect_conflicts():
+    m1 = _merge_module(range=65535, width=8, value="16")
+    m2 = _merge_module(range=65536, width=16, value="32")
+    m2.add(
+        Core(name="c2", vlnv=Vlnv(vendor="a", library="b", name="c2", version=(1, 0)))
+    )
+    try:
+        m1.merge(m2, collect_conflicts=True)
+        raise RuntimeError("Test failed! expected a MergeConflict")
+    except MergeConflict as e:
+        assert len(e.errors) == 3
+        assert all(isinstance(c, MergeConflict) for c in e.errors)
+        assert any("m:c1[block]:sp1[port]:data[signal]" in str(c) for c in e.errors)
+
+    # The conflicting fields keep their value and the rest is merged
+    c1 = m1.blocks["c1"]
+    assert c1.ports["sp1"].range == 65535
+    assert c1.ports["sp1"].signals["data"].width == 8
+    assert c1.parameters.value("DEPTH") == "16"
+    assert "c2" in m1.blocks
+    assert "_merge_conflicts" not in m1.__dict__
+
+
+def test_module_merge_skips_identical():
+    m1 = _merge_module(range=65535, width=8, value="16")
+    m2 = _merge_module(range=65535, width=8, value="16")
+    m2.add(
+        Core(name="c2", vlnv=Vlnv(vendor="a", library="b", name="c2", version=(1, 0)))
+    )
+    m1.merge(m2)
+    assert "c2" in m1.blocks
+    # c1 is the same on both sides and was not merged, it keeps its hash
+    assert m1.__dict__["_hash"] is None
+    assert m1.blocks["c1"].__dict__["_hash"] is not None
+    assert "_fresh_hashes" not in m1.__dict__
+
+
+class _VisExtension(MetadataExtension):
+    hidden: str = "no"
+
+
+def test_module_merge_sees_in_place_changes():
+    """Hashes cached before an extension object is changed in place do not hide the change"""
+    m1 = _merge_module(range=65535, width=8, value="16")
+    m2 = _merge_module(range=65535, width=8, value="16")
+    m1.blocks["c1"].ext["vis"] = _VisExtension()
+    m2.blocks["c1"].ext["vis"] = _VisExtension()
+    m1.content_hash()
+    m2.content_hash()
+    m2.blocks["c1"].ext["vis"].hidden = "yes"
+    try:
+        m1.merge(m2)
+        raise RuntimeError("Test failed! expected a MergeConflict")
+    except MergeConflict as e:
+        assert "vis" in str(e)
+    assert m1.blocks["c1"].ext["vis"].hidden == "no"
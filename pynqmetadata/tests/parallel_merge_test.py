@@ -0,0 +1,93 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from functools import partial
+
+from pynqmetadata import Core, Module, Parameter, Port, Signal, Vlnv
+from pynqmetadata.errors import MergeConflict
+
+
+def _container(name: str, width: int = 1) -> Module:
+    """A module block holding one core, as a BDC container or the BDC itself"""
+    mod = Module(name=name)
+    c = Core(name="ip", vlnv=Vlnv(vendor="c", library="i", name="p", version=(1, 0)))
+    p = Port(name="p1")
+    p.add(Signal(name="s", width=width, driver=True))
+    c.add(p)
+    mod.add(c)
+    return mod
+
+
+def _bdc(name: str, cores: int = 3) -> Module:
+    mod = _container(name)
+    for i in range(cores):
+        c = Core(
+            name=f"core_{i}",
+            vlnv=Vlnv(vendor="c", library="i", name="q", version=(1, 0)),
+        )
+        c.add(Parameter(name="WIDTH", value="32"))
+        mod.add(c)
+    return mod
+
+
+def _design() -> Module:
+    md = Module(name="top")
+    for name in ("bdc_0", "bdc_1", "bdc_2"):
+        md.add(_container(name))
+    md.refresh()
+    return md
+
+
+def test_merge_blocks():
+    """Models and loaders are merged into their blocks, the design is refreshed"""
+    md = _design()
+    old_hash = md.content_hash()
+    md.merge_blocks(
+        {"bdc_0": _bdc("bdc_0"), "bdc_1": partial(_bdc, "bdc_1", 5)}, workers=2
+    )
+    assert len(md.blocks["bdc_0"].blocks) == 4
+    assert len(md.blocks["bdc_1"].blocks) == 6
+    assert len(md.blocks["bdc_2"].blocks) == 1
+    core = md.blocks["bdc_1"].blocks["core_4"]
+    assert core.ref == "top:bdc_1[block]:core_4[block]"
+    assert md.blocks["bdc_1"]._parent is md
+    assert md.content_hash() != old_hash
+
+
+def test_merge_blocks_matches_merge():
+    """The same design as merging into each block and refreshing it in turn"""
+    names = ("bdc_0", "bdc_1", "bdc_2")
+    ref = _design()
+    for n in names:
+        ref.blocks[n].merge(_bdc(n))
+        ref.blocks[n].refresh()
+    md = _design()
+    md.merge_blocks({n: partial(_bdc, n) for n in names})
+    assert md.json() == ref.json()
+
+
+def test_merge_blocks_processes():
+    """Loaders can run in worker processes"""
+    md = _design()
+    md.merge_blocks(
+        {n: partial(_bdc, n) for n in ("bdc_0", "bdc_1", "bdc_2")},
+        processes=True,
+        workers=2,
+    )
+    for b in md.blocks.values():
+        assert len(b.blocks) == 4
+        assert b.blocks["core_0"]._parent is b
+
+
+def test_merge_blocks_conflicts():
+    """A merge that conflicts does not stop the others"""
+    md = _design()
+    bad = _container("bdc_1", width=2)
+    try:
+        md.merge_blocks({"bdc_0": _bdc("bdc_0"), "bdc_1": bad})
+    except MergeConflict as e:
+        assert len(e.errors) == 1
+        assert str(e.errors[0]).startswith("top:bdc_1[block]")
+    else:
+        raise RuntimeError("Test failed. expected a MergeConflict")
+    assert len(md.blocks["bdc_0"].blocks) == 4
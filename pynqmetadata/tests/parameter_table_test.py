@@ -0,0 +1,130 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+
+import pytest
+
+from pynqmetadata import IPCore, Module, Parameter, UltrascaleProcSysCore, Vlnv
+from pynqmetadata.errors import MergeConflict
+from pynqmetadata.models.parameter import typed_value
+from pynqmetadata.frontends import JsonFrontend
+
+
+def _ps() -> UltrascaleProcSysCore:
+    vlnv = Vlnv(
+        vendor="xilinx.com", library="ip", name="zynq_ultra_ps_e", version=(3, 4)
+    )
+    ps = UltrascaleProcSysCore(name="ps", vlnv=vlnv)
+    for i in range(4):
+        ps.parameters.add_value(f"PSU__FPGA_PL{i}_ENABLE", "1" if i < 2 else "0")
+        for j in range(2):
+            ps.parameters.add_value(
+                f"PSU__CRL_APB__PL{i}_REF_CTRL__DIVISOR{j}", str(i + j + 1)
+            )
+    return ps
+
+
+def test_parameters_are_created_on_demand():
+    ps = _ps()
+    assert len(ps.parameters) == 12
+    assert ps.parameters._materialised() == []
+    assert ps.find_clock_enable(1) and not ps.find_clock_enable(2)
+    assert ps.find_clock_divisor(3, 1) == 5
+    assert ps.parameters._materialised() == []
+
+    mod = Module(name="mod")
+    mod.add(ps)
+    param = mod.lookup("mod:ps[block]:PSU__FPGA_PL0_ENABLE[parameter]")
+    assert isinstance(param, Parameter)
+    assert param is ps.parameters["PSU__FPGA_PL0_ENABLE"]
+    assert param.parent() is ps
+    assert param.ref == "mod:ps[block]:PSU__FPGA_PL0_ENABLE[parameter]"
+    assert len(ps.parameters._materialised()) == 1
+
+
+def test_raw_parameters_render_and_hash_like_objects():
+    """A raw parameter is indistinguishable from a Parameter object"""
+    lazy = _ps()
+    eager = _ps()
+    for name in eager.parameters:
+        eager.parameters[name]
+    assert lazy.dict() == eager.dict()
+    assert lazy.content_hash() == eager.content_hash()
+    assert lazy.parameters._dict_items()["PSU__FPGA_PL0_ENABLE"] == (
+        eager.parameters["PSU__FPGA_PL0_ENABLE"].dict()
+    )
+
+
+def test_parameter_edits_invalidate_hash():
+    ps = _ps()
+    before = ps.content_hash()
+    ps.parameters["PSU__FPGA_PL3_ENABLE"].value = "1"
+    assert ps.find_clock_enable(3)
+    assert ps.content_hash() != before
+    ps.parameters.add_value("EXTRA", "x")
+    assert ps.parameters.value("EXTRA") == "x"
+    assert ("EXTRA", "x") in ps.parameters.raw_items()
+
+
+def test_parameter_merge():
+    a = _ps()
+    b = _ps()
+    b.parameters.add_value("ONLY_B", "b")
+    a.merge(b)
+    assert a.parameters.value("ONLY_B") == "b"
+
+    c = _ps()
+    c.parameters["PSU__FPGA_PL0_ENABLE"].value = "0"
+    with pytest.raises(MergeConflict):
+        a.merge(c)
+
+
+def test_parameters_copied_with_block():
+    ps = _ps()
+    ps.parameters["PSU__FPGA_PL0_ENABLE"]
+    for cp in [copy.deepcopy(ps), ps.copy(cow=True)]:
+        cp.parameters["PSU__FPGA_PL0_ENABLE"].value = "0"
+        cp.parameters["PSU__FPGA_PL1_ENABLE"].value = "0"
+        assert not cp.find_clock_enable(0) and not cp.find_clock_enable(1)
+        assert ps.find_clock_enable(0) and ps.find_clock_enable(1)
+        assert cp.parameters["PSU__FPGA_PL1_ENABLE"].parent() is cp
+
+
+def test_parameters_json_round_trip():
+    mod = Module(name="mod")
+    core = IPCore(
+        name="c", vlnv=Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    )
+    core.parameters.add_value("A", "1")
+    core.parameters.add_value("B", None)
+    mod.add(core)
+    md = JsonFrontend(mod.json())
+    assert md.blocks["c"].parameters.raw_items() == [("A", "1"), ("B", None)]
+    assert md.json() == mod.json()
+
+
+def test_typed_values():
+    assert typed_value(None) is None
+    assert typed_value("TRUE") is True and typed_value("false") is False
+    assert typed_value("0xA0000000") == 0xA0000000
+    assert typed_value("-12") == -12
+    assert typed_value("1.5") == 1.5
+    assert typed_value("AXI4LITE") == "AXI4LITE"
+
+
+def test_typed_values_cached_and_invalidated():
+    ps = _ps()
+    ps.parameters.add_value("C_BASEADDR", "0x80000000")
+    assert ps.parameters.typed("C_BASEADDR") == 0x80000000
+    assert ps.parameters.typed("PSU__FPGA_PL0_ENABLE") == 1
+    assert ps.parameters.typed_items()["PSU__CRL_APB__PL1_REF_CTRL__DIVISOR1"] == 3
+
+    param = ps.parameters["C_BASEADDR"]
+    assert param.typed == 0x80000000
+    param.value = "0x40000000"
+    assert param.typed == 0x40000000
+    assert ps.parameters.typed("C_BASEADDR") == 0x40000000
+
+    ps.parameters["PSU__CRL_APB__PL0_REF_CTRL__DIVISOR0"].value = "15"
+    assert ps.find_clock_divisor(0, 0) == 15
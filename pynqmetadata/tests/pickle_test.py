@@ -0,0 +1,58 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pickle
+import sys
+
+from conftest import chain_module
+from pynqmetadata import Module, Vlnv
+
+
+def _chain(n: int) -> Module:
+    """A module of n cores, each driving the next"""
+    names = [f"c{i}" for i in range(n)]
+    vlnv = Vlnv.intern("c", "i", "p", (1, 0))
+    md = chain_module(names, name="chain", params={}, vlnv=vlnv)
+    for i, name in enumerate(names):
+        md.blocks[name].parameters.add_value("INDEX", str(i))
+    return md
+
+
+def test_pickle_round_trip():
+    md = _chain(10)
+    md.blocks["c3"].parameters["INDEX"]
+    loaded = pickle.loads(pickle.dumps(md))
+    assert loaded == md
+    assert loaded.json() == md.json()
+    assert list(loaded.busses.keys()) == list(md.busses.keys())
+
+    c0 = loaded.blocks["c0"]
+    assert c0.parent() is loaded
+    assert c0.ref == "chain:c0[block]"
+    sig = c0.ports["p_out"].signals["data"]
+    assert sig.ref == "chain:c0[block]:p_out[port]:data[signal]"
+    dst = loaded.blocks["c1"].ports["p_in"].signals["data"]
+    assert list(sig._connections.values()) == [dst]
+    assert list(sig._connections.values())[0] is dst
+    assert loaded.blocks["c3"].parameters["INDEX"].parent() is loaded.blocks["c3"]
+
+    # The loaded design can be edited like the original
+    loaded.blocks["c5"].remove()
+    assert "c5" not in loaded.blocks
+    assert "c5" in md.blocks
+
+
+def test_pickle_is_not_limited_by_recursion():
+    n = sys.getrecursionlimit()
+    md = _chain(n)
+    loaded = pickle.loads(pickle.dumps(md))
+    assert len(loaded.blocks) == n
+    assert len(loaded.busses) == n - 1
+
+
+def test_pickle_block_of_module():
+    md = _chain(4)
+    block = pickle.loads(pickle.dumps(md.blocks["c2"]))
+    assert block.ref == "chain:c2[block]"
+    assert block.parent().blocks["c2"] is block
+    assert block == md.blocks["c2"]
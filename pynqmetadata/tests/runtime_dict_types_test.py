@@ -0,0 +1,64 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import Core, Module, Port, Signal, Vlnv, ZynqProcSysCore
+from pynqmetadata.views.runtime.clock_dict_view import ClockDictView
+from pynqmetadata.views.runtime.gpio_dict_view import GpioDictView
+
+
+def _design() -> Module:
+    """A Zynq PS with a clock and one GPIO pin sliced out by an xlslice"""
+    mod = Module(name="mod")
+    ps = ZynqProcSysCore(
+        name="ps7",
+        vlnv=Vlnv(
+            vendor="xilinx.com", library="ip", name="processing_system7", version=(5, 5)
+        ),
+        hierarchy_name="ps7",
+    )
+    gpio = Port(name="GPIO_0")
+    gpio.add(Signal(name="GPIO_O", width=8, driver=True))
+    ps.add(gpio)
+    for i in range(4):
+        ps.parameters.add_value(f"PCW_FPGA_FCLK{i}_ENABLE", "1" if i == 0 else "0")
+        for j in range(2):
+            ps.parameters.add_value(f"PCW_FCLK{i}_PERIPHERAL_DIVISOR{j}", "5")
+    mod.add(ps)
+
+    xlslice = Core(
+        name="slice_0",
+        vlnv=Vlnv(vendor="xilinx.com", library="ip", name="xlslice", version=(1, 0)),
+        hierarchy_name="slice_0",
+    )
+    for name, driver in [("Din", False), ("Dout", True)]:
+        p = Port(name=name)
+        p.add(Signal(name=name, width=1, driver=driver))
+        xlslice.add(p)
+    xlslice.parameters.add_value("DIN_FROM", "3")
+    mod.add(xlslice)
+    din = mod.lookup("mod:slice_0[block]:Din[port]:Din[signal]")
+    gpio_o = mod.lookup("mod:ps7[block]:GPIO_0[port]:GPIO_O[signal]")
+    din.connect(gpio_o)
+    gpio_o.connect(din)
+    mod.refresh()
+    return mod
+
+
+def test_gpio_value_types():
+    """The gpio index is a str on the PS model and an int in the gpio_dict"""
+    mod = _design()
+    assert mod.blocks["ps7"].gpio["slice_0"]["index"] == "3"
+    gpio_dict = GpioDictView(mod).view
+    assert gpio_dict == {
+        "slice_0": {"state": None, "pins": {"slice_0/Dout"}, "index": 3}
+    }
+    assert type(gpio_dict["slice_0"]["index"]) is int
+
+
+def test_clock_value_types():
+    """Every clock_dict value is an int"""
+    clock_dict = ClockDictView(_design()).clock_dict
+    assert clock_dict[0] == {"enable": 1, "divisor0": 5, "divisor1": 5}
+    assert clock_dict[1]["enable"] == 0
+    for clock in clock_dict.values():
+        assert all(type(v) is int for v in clock.values())
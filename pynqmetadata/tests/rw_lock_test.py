@@ -0,0 +1,144 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import threading
+import time
+from typing import List
+
+import pytest
+
+from conftest import make_core
+from pynqmetadata import Module
+from pynqmetadata.models.rw_lock import RWLock
+
+
+def _add_pair(mod: Module, i: int) -> None:
+    """Adds the cores a<i> and b<i> with a<i>.p_out driving b<i>.p_in"""
+    mod.add(make_core(f"a{i}"))
+    mod.add(make_core(f"b{i}"))
+    src = mod.lookup(f"mod:a{i}[block]:p_out[port]:data[signal]")
+    src.connect(mod.lookup(f"mod:b{i}[block]:p_in[port]:data[signal]"))
+
+
+def _check(mod: Module) -> int:
+    """Every core has its partner and every pair has its bus, returns the pair count"""
+    names = list(mod.blocks.keys())
+    assert len(names) % 2 == 0
+    pairs = [n[1:] for n in names if n.startswith("a")]
+    for i in pairs:
+        assert f"b{i}" in mod.blocks
+    busses = list(mod.bus_map().keys())
+    assert len(busses) == len(pairs)
+    for i in pairs:
+        assert f"mod:a{i}[block]:p_out[port]->mod:b{i}[block]:p_in[port]" in busses
+    return len(pairs)
+
+
+def test_rw_lock_excludes_writers():
+    lock = RWLock()
+    events: List[str] = []
+    reading = threading.Event()
+
+    def reader() -> None:
+        with lock.read():
+            reading.set()
+            time.sleep(0.05)
+            events.append("read done")
+
+    t = threading.Thread(target=reader)
+    t.start()
+    reading.wait()
+    with lock.write():
+        events.append("write")
+    t.join()
+    assert events == ["read done", "write"]
+    assert lock.seq == 2
+
+
+def test_rw_lock_reentrant():
+    lock = RWLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+        assert lock.seq % 2 == 1
+    assert lock.seq % 2 == 0
+    with lock.read():
+        with lock.read():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+
+def test_rw_lock_read_outlives_write():
+    """A read taken under the write lock and released after it"""
+    lock = RWLock()
+    lock.acquire_write()
+    lock.acquire_read()
+    lock.release_write()
+    assert lock._readers == 1
+
+    # The thread is still reading so a writer has to wait for it
+    events: List[str] = []
+
+    def writer() -> None:
+        with lock.write():
+            events.append("write")
+
+    t = threading.Thread(target=writer)
+    t.start()
+    time.sleep(0.05)
+    events.append("read done")
+    lock.release_read()
+    t.join(timeout=5)
+    assert events == ["read done", "write"]
+    assert lock._readers == 0
+
+
+def test_locking_stress():
+    """Many reader threads and one writer on the same module"""
+    mod = Module(name="mod")
+    for i in range(10):
+        _add_pair(mod, i)
+    mod.enable_locking()
+
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    reads = [0]
+
+    def reader(optimistic: bool) -> None:
+        try:
+            while not stop.is_set():
+                if optimistic:
+                    mod.read(_check)
+                else:
+                    with mod.reading():
+                        _check(mod)
+                reads[0] += 1
+        except BaseException as e:
+            errors.append(e)
+
+    def writer() -> None:
+        try:
+            for i in range(10, 60):
+                with mod.writing():
+                    _add_pair(mod, i)
+                if i % 3 == 0:
+                    with mod.batch():
+                        mod.blocks[f"a{i - 10}"].remove()
+                        mod.blocks[f"b{i - 10}"].remove()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    threads = [threading.Thread(target=reader, args=(i % 2 == 0,)) for i in range(8)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert reads[0] > 0
+    assert _check(mod) == 60 - len(range(12, 60, 3))
@@ -0,0 +1,74 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from conftest import make_core, make_vlnv
+from pynqmetadata import Core, Module, ProcSysCore
+
+
+def _core(cls, name: str, vname: str, version=(1, 0), **params) -> Core:
+    vlnv = make_vlnv(vname, version, vendor="xilinx.com", library="ip")
+    return make_core(name, signals=(), params=params, cls=cls, vlnv=vlnv)
+
+
+def _build_module() -> Module:
+    mod = Module(name="mod")
+    mod.add(_core(ProcSysCore, "ps", "zynq_ultra_ps_e", (3, 4)))
+    mod.add(_core(Core, "dma0", "axi_dma", (7, 1), c_include_sg="1"))
+    mod.add(_core(Core, "dma1", "axi_dma", (7, 2), c_include_sg="0"))
+    mod.add(_core(Core, "gpio", "axi_gpio", (2, 0), c_gpio_width="8"))
+    return mod
+
+
+def test_select_by_class_and_type():
+    mod = _build_module()
+    assert list(mod.select(cls=ProcSysCore)) == ["ps"]
+    assert list(mod.select(cls=Core)) == ["ps", "dma0", "dma1", "gpio"]
+    assert list(mod.select(type="core")) == ["dma0", "dma1", "gpio"]
+    assert list(mod.select()) == ["ps", "dma0", "dma1", "gpio"]
+    assert mod.get_processing_systems() == {"ps": mod.blocks["ps"]}
+
+
+def test_select_by_vlnv():
+    mod = _build_module()
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:7.1")) == ["dma0"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma")) == ["dma0", "dma1"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma0", "dma1"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_*")) == ["dma0", "dma1", "gpio"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_*:7.2")) == ["dma1"]
+    assert mod.select(vlnv="xilinx.com:ip:axi_iic") == {}
+
+
+def test_select_by_parameters():
+    mod = _build_module()
+    assert list(mod.select(parameters={"c_include_sg": None})) == ["dma0", "dma1"]
+    assert list(mod.select(parameters={"c_include_sg": "1"})) == ["dma0"]
+    mod.blocks["dma1"].parameters["c_include_sg"].value = "1"
+    assert list(mod.select(parameters={"c_include_sg": "1"})) == ["dma0", "dma1"]
+    sel = mod.select(
+        cls=Core, vlnv="xilinx.com:ip:axi_gpio:*", parameters={"c_gpio_width": "8"}
+    )
+    assert list(sel) == ["gpio"]
+
+
+def test_select_follows_structure():
+    mod = _build_module()
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma0", "dma1"]
+    mod.blocks["dma0"].remove()
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma1"]
+    mod.add(_core(Core, "dma2", "axi_dma", (7, 1)))
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma1", "dma2"]
+    mod.add(_core(ProcSysCore, "ps1", "processing_system7", (5, 5)))
+    assert list(mod.select(cls=ProcSysCore)) == ["ps", "ps1"]
+
+
+def test_select_follows_vlnv_and_type():
+    """Assigning a new VLNV or type to a block is seen by the next select"""
+    mod = _build_module()
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma0", "dma1"]
+    mod.blocks["dma0"].vlnv = make_vlnv("axi_cdma", (4, 1), "xilinx.com", "ip")
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_dma:*")) == ["dma1"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_cdma:4.1")) == ["dma0"]
+    assert list(mod.select(vlnv="xilinx.com:ip:axi_cdma:*")) == ["dma0"]
+    mod.blocks["gpio"].type = "gpio-ip"
+    assert list(mod.select(type="gpio-ip")) == ["gpio"]
+    assert list(mod.select(type="core")) == ["dma0", "dma1"]
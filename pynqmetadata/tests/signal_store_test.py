@@ -0,0 +1,139 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import pickle
+
+from conftest import make_loop_core
+from pynqmetadata import Module, Signal
+
+
+def _build_module() -> Module:
+    """Two cores with a single port each, c1.p1.s_in is driven by c2.p1.s_out"""
+    mod = Module(name="mod")
+    for name in ["c1", "c2"]:
+        mod.add(make_loop_core(name, in_width=4, out_width=8))
+
+    sig1 = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    sig2 = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    sig1.connect(sig2)
+    sig2.connect(sig1)
+    mod.refresh()
+    return mod
+
+
+def test_pack_preserves_model():
+    """Packing the signals should not change the rendered model or the bus connections"""
+    mod = _build_module()
+    ref = mod.json()
+    busses = set(mod.busses.keys())
+
+    store = mod.pack_signals()
+    assert len(store) == 4
+    assert mod.json() == ref
+
+    mod.refresh()
+    assert set(mod.busses.keys()) == busses
+    assert mod.blocks["c1"].ports["p1"].destinations()["p1"].parent().name == "c2"
+
+    mod.unpack_signals()
+    assert isinstance(mod.blocks["c1"].ports["p1"].signals, dict)
+    assert mod.json() == ref
+
+
+def test_packed_signal_views():
+    """Signals in a packed module are still usable as Signal objects"""
+    mod = _build_module()
+    mod.pack_signals()
+
+    s_in = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    s_out = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    assert isinstance(s_in, Signal)
+    assert s_in.ref == "mod:c1[block]:p1[port]:s_in[signal]"
+    assert s_in.width == 4 and not s_in.driver
+    assert s_in.connection_exists(s_out)
+
+    s_in.disconnect(s_out)
+    assert not s_in.connection_exists(s_out)
+    s_in.connect(s_out)
+    assert s_in.connections()[s_out.ref] == s_out
+
+
+def test_vectorised_queries():
+    """Fan-out, width and polarity queries over the whole store"""
+    mod = _build_module()
+    store = mod.pack_signals()
+
+    assert store.total_width() == 24
+    assert store.total_width(driver=True) == 16
+    assert store.width_per_port()["mod:c1[block]:p1[port]"] == 12
+    assert int(store.fan_out().sum()) == 2
+    assert len(store.polarity_violations()) == 0
+
+    s_out1 = mod.lookup("mod:c1[block]:p1[port]:s_out[signal]")
+    s_out2 = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    s_out1._store.connect(s_out1._idx, s_out2)
+    assert len(store.polarity_violations()) == 1
+
+
+def test_packed_remove_and_copy():
+    """Removing blocks, deep copying and pickling a packed module"""
+    mod = _build_module()
+    mod.pack_signals()
+    ref = mod.json()
+
+    assert copy.deepcopy(mod).json() == ref
+    assert pickle.loads(pickle.dumps(mod)).json() == ref
+
+    mod.blocks["c2"].remove()
+    assert "c2" not in mod.blocks
+    s_in = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    assert len(s_in.connections()) == 0
+
+
+def test_append_signals():
+    """Signals added to a packed port grow the arrays without copying them each time"""
+    mod = _build_module()
+    store = mod.pack_signals()
+    port = mod.blocks["c1"].ports["p1"]
+    buffers = [store._width_buf]
+    for i in range(100):
+        port.add(Signal(name=f"d{i}", width=i + 1, driver=True))
+        if store._width_buf is not buffers[-1]:
+            buffers.append(store._width_buf)
+    assert len(buffers) < 10
+    assert len(store) == 104 and len(store.width) == 104
+    assert len(store.indptr) == 105
+    assert store.total_width(driver=True) == 16 + 5050
+    assert port.signals["d99"].width == 100
+    assert port.signals["d99"].ref == "mod:c1[block]:p1[port]:d99[signal]"
+    assert int(store.fan_out().sum()) == 2
+
+
+def test_sources_follow_edits():
+    """The incoming index matches the connections through connects, disconnects and removals"""
+    mod = _build_module()
+    store = mod.pack_signals()
+
+    def check() -> None:
+        expected = {}
+        for idx in range(len(store.names)):
+            for dst in store.row(idx):
+                expected.setdefault(dst, set()).add(store.ref(idx))
+        for idx in range(len(store.names)):
+            assert set(store.sources(idx)) == expected.get(idx, set())
+
+    check()
+    s_in1 = mod.lookup("mod:c1[block]:p1[port]:s_in[signal]")
+    s_out1 = mod.lookup("mod:c1[block]:p1[port]:s_out[signal]")
+    s_out2 = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    s_out1._store.connect(s_out1._idx, s_in1)
+    check()
+    assert list(s_in1._incoming) == [s_out1.ref, s_out2.ref]
+    store.compact()
+    check()
+    s_out1._remove_con_ref(s_in1.ref)
+    check()
+    mod.blocks["c2"].remove()
+    check()
+    assert len(s_in1._incoming) == 0
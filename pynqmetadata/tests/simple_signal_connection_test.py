@@ -32,3 +32,72 @@ def test_simple_connection():
         sig1.connect(sig2)
     else:
         raise RuntimeError(f"Test failed: sig1 and sig2 are not both Signals")
+
+
+def test_remove_connected_core():
+    """
+    Removing a core disconnects every signal connected to it, tracked
+    through the incoming connections of each signal
+    """
+    mod = Module(name="mod")
+    cvlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    for name in ["c1", "c2", "c3"]:
+        c = Core(name=name, vlnv=cvlnv)
+        p = Port(name="p1")
+        p.add(Signal(name="s_in", width=1, driver=False))
+        p.add(Signal(name="s_out", width=1, driver=True))
+        c.add(p)
+        mod.add(c)
+    ext = Port(name="ext", external=True)
+    ext.add(Signal(name="ext", width=1, driver=True, external=True))
+    mod.add(ext)
+
+    s_out = mod.lookup("mod:c2[block]:p1[port]:s_out[signal]")
+    for name in ["c1", "c3"]:
+        mod.lookup(f"mod:{name}[block]:p1[port]:s_in[signal]").connect(s_out)
+    mod.refresh()
+
+    incoming = s_out.incoming()
+    if set(incoming.keys()) != {
+        "mod:c1[block]:p1[port]:s_in[signal]",
+        "mod:c3[block]:p1[port]:s_in[signal]",
+    }:
+        raise RuntimeError(f"Unexpected incoming connections {incoming.keys()}")
+
+    mod.blocks["c2"].remove()
+    for name in ["c1", "c3"]:
+        sig = mod.lookup(f"mod:{name}[block]:p1[port]:s_in[signal]")
+        if len(sig.connections()) != 0 or len(sig.con_refs) != 0:
+            raise RuntimeError(f"{sig.ref} is still connected to the removed core")
+
+
+def test_destinations_follow_connections():
+    """
+    The cached port-level destinations are updated when signals
+    are connected, disconnected and removed
+    """
+    mod = Module(name="mod")
+    cvlnv = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    for name in ["c1", "c2", "c3"]:
+        c = Core(name=name, vlnv=cvlnv)
+        p = Port(name=f"{name}_p")
+        p.add(Signal(name="s_in", width=1, driver=False))
+        p.add(Signal(name="s_out", width=1, driver=True))
+        c.add(p)
+        mod.add(c)
+
+    c1p = mod.lookup("mod:c1[block]:c1_p[port]")
+    s_in = mod.lookup("mod:c1[block]:c1_p[port]:s_in[signal]")
+    assert c1p.destinations() == {}
+
+    s_in.connect(mod.lookup("mod:c2[block]:c2_p[port]:s_out[signal]"))
+    assert list(c1p.destinations().keys()) == ["c2_p"]
+
+    s_in.connect(mod.lookup("mod:c3[block]:c3_p[port]:s_out[signal]"))
+    assert sorted(c1p.destinations().keys()) == ["c2_p", "c3_p"]
+
+    s_in.disconnect(mod.lookup("mod:c2[block]:c2_p[port]:s_out[signal]"))
+    assert list(c1p.destinations().keys()) == ["c3_p"]
+
+    mod.blocks["c3"].remove()
+    assert c1p.destinations() == {}
@@ -0,0 +1,38 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import pickle
+
+import pytest
+
+from pynqmetadata import Core, Vlnv
+from pynqmetadata.frontends.hwh_frontend import vlnv_creator
+
+
+def test_vlnv_interned():
+    """Equal VLNVs from any of the constructors share one instance"""
+    a = vlnv_creator("xilinx.com:interface:aximm:1.0")
+    b = Vlnv.intern("xilinx.com", "interface", "aximm", (1, 0))
+    c = Vlnv.from_str("xilinx.com:interface:aximm:1.0")
+    assert a is b and b is c
+    assert a.str == "xilinx.com:interface:aximm:1.0"
+    assert Vlnv.from_str("xilinx.com:interface:axis:1.0") is not a
+
+
+def test_vlnv_immutable():
+    v = Vlnv(vendor="c", library="i", name="p", version=(1, 0))
+    assert v == Vlnv.intern("c", "i", "p", (1, 0))
+    assert hash(v) == hash("c:i:p:1.0")
+    assert v != Vlnv(vendor="c", library="i", name="p", version=(1, 1))
+    with pytest.raises(AttributeError):
+        v.version = (2, 0)
+    assert v.copy() is v
+    assert copy.deepcopy(v) is v
+
+
+def test_vlnv_pickle_reinterns():
+    v = Vlnv.intern("c", "i", "p", (2, 1))
+    core = Core(name="c", vlnv=v)
+    assert pickle.loads(pickle.dumps(core)).vlnv is v
+    assert v.dict() == {"vendor": "c", "library": "i", "name": "p", "version": (2, 1)}
@@ -29,13 +29,12 @@ class ClockDictView:
     def clock_dict(self) -> Dict:
         repr_dict = {}
 
-        for core in self._md.blocks.values():
-            if isinstance(core, ProcSysCore):
-                for i in range(4):
-                    repr_dict[i] = {}
-                    repr_dict[i]["enable"] = int(core.find_clock_enable(i))
-                    for j in range(2):
-                        repr_dict[i][f"divisor{j}"] = core.find_clock_divisor(i, j)
+        for core in self._md.select(cls=ProcSysCore).values():
+            for i in range(4):
+                repr_dict[i] = {}
+                repr_dict[i]["enable"] = int(core.find_clock_enable(i))
+                for j in range(2):
+                    repr_dict[i][f"divisor{j}"] = core.find_clock_divisor(i, j)
 
         return repr_dict
 
@@ -0,0 +1,89 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from pynqmetadata.models.copy_on_write import CopyOnReadDict
+
+# Values that are never modified in place, these are not copied
+_IMMUTABLE = (str, int, float, bool, type(None), type)
+
+
+def _copy(
+    memo: Optional[Dict[int, Tuple[Dict, "CowDictView"]]], value: object
+) -> object:
+    """The copy of a value read through a CowDictView sharing the views in memo"""
+    if isinstance(value, _IMMUTABLE):
+        return value
+    if type(value) is not dict:
+        return copy.deepcopy(value)
+    if memo is None:
+        return CowDictView(value)
+    entry = memo.get(id(value))
+    if entry is None:
+        entry = (value, CowDictView(value, _memo=memo))
+        memo[id(value)] = entry
+    return entry[1]
+
+
+class CowDictView(CopyOnReadDict):
+    """
+    A runtime dictionary over the dict produced by a MetadataView.
+
+    The views build a new dict each time they are read, so the runtime can
+    keep that dict rather than a deep copy of it. A value is only copied
+    the first time it is read through this dict, as the runtime may then
+    modify it. A dict value is copied by wrapping it in a CowDictView of
+    its own, so only the parts of an entry that are read get copied:
+    setting ip_dict[ip]["gpio"][pin] copies the entry and its gpio dict but
+    not its registers. Other values (lists, objects) are deep copied.
+
+    When shared is True the views of the dicts reached through this dict
+    are memoised, so a dict reached through two paths (the sub-hierarchies
+    of hierarchy_dict are also entries of their own) is the same view
+    either way, as it would be after a deep copy of the whole dict.
+
+    Like a deep copy, modifying a value read through this dict never
+    changes the source dict, which can be passed on to other views with
+    _snapshot().
+    """
+
+    def __init__(
+        self,
+        src: Dict,
+        shared: bool = False,
+        _memo: Optional[Dict[int, Tuple[Dict, "CowDictView"]]] = None,
+    ) -> None:
+        # id() of each source dict -> (the source, kept alive so that its id
+        # is not reused, and its view)
+        memo = {} if shared and _memo is None else _memo
+        super().__init__(src, partial(_copy, memo))
+
+    def _snapshot(self, memo: Optional[Dict] = None) -> Dict:
+        """
+        Returns the current content of this dict as plain dicts. Values
+        that have not been read yet are the (unmodified) source values and
+        are shared with the snapshot, the others are copied as they may
+        have been modified since.
+        """
+        memo = {} if memo is None else memo
+        if id(self) in memo:
+            return memo[id(self)]
+        ret = memo[id(self)] = {}
+        for key, value in dict.items(self):
+            if key in self._shared:
+                ret[key] = value
+            elif isinstance(value, CowDictView):
+                ret[key] = value._snapshot(memo)
+            else:
+                ret[key] = copy.deepcopy(value, memo)
+        return ret
+
+    def __deepcopy__(self, memo: Dict) -> Dict:
+        """A plain dict, values that were not read are copied from the source"""
+        ret = memo[id(self)] = {}
+        for key, value in dict.items(self):
+            ret[key] = copy.deepcopy(value, memo)
+        return ret
@@ -27,21 +27,20 @@ class GpioDictView(MetadataView):
     def view(self) -> Dict:
         repr_dict = {}
 
-        for core in self._md.blocks.values():
-            if isinstance(core, ProcSysCore):
-                gpio = core.gpio
-                for n, i in gpio.items():
-                    repr_dict[n] = {}
-                    if n in self._state:
-                        repr_dict[n]["state"] = self._state[n]
-                    else:
-                        repr_dict[n]["state"] = None
-                    pins = set()
-                    for p in i["pins"]:
-                        ref: str = f"{p.parent().parent().hierarchy_name}/{p.name}"
-                        pins.add(ref)
-                    repr_dict[n]["pins"] = pins
-                    repr_dict[n]["index"] = int(i["index"])
+        for core in self._md.select(cls=ProcSysCore).values():
+            gpio = core.gpio
+            for n, i in gpio.items():
+                repr_dict[n] = {}
+                if n in self._state:
+                    repr_dict[n]["state"] = self._state[n]
+                else:
+                    repr_dict[n]["state"] = None
+                pins = set()
+                for p in i["pins"]:
+                    ref: str = f"{p.parent().parent().hierarchy_name}/{p.name}"
+                    pins.add(ref)
+                repr_dict[n]["pins"] = pins
+                repr_dict[n]["index"] = int(i["index"])
 
         return repr_dict
 
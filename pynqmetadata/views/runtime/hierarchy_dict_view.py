@@ -55,6 +55,12 @@ class HierarchyDictView(MetadataView):
         self._device = device
         self._overlay = overlay
 
+    def set_sources(self, ip_dict:Dict, mem_dict:Dict)->None:
+        """ Sets the ip_dict and mem_dict whose entries the hierarchies
+        are built from, used by the next read of the view """
+        self._ip_dict = ip_dict
+        self._mem_dict = mem_dict
+
     def _hierarchy_walker(self, r:Dict, h:Hierarchy)->None:
         """ recursive walk down the hierarchy h, adding IP
         that is a match in ip_dict or mem_dict to the hierarchies
@@ -35,9 +35,8 @@ class IpDictView(MetadataView):
 
     def get_ps(self) -> ProcSysCore:
         """Gets a reference to the PS core for this design"""
-        for core in self._md.blocks.values():
-            if isinstance(core, ProcSysCore):
-                return core
+        for core in self._md.select(cls=ProcSysCore).values():
+            return core
         raise CoreNotFound(
             f"Could not find a processing system for the design when getting the ip_dict_view"
         )
@@ -65,11 +64,13 @@ class IpDictView(MetadataView):
                     # check if we are traversing across a BDC and jump in to grab the block if we are
                     dcore = None
                     dst_port = None
+                    hier_name = None
 
                     # This is an ordinary core
                     if isinstance(dparent, Core):
                         dcore = dparent
                         dst_port = target_port
+                        hier_name = dcore.hierarchy_name
 
                     # This is a module (BDC/Hierarchy)
                     elif isinstance(dparent, Module):
@@ -77,6 +78,7 @@ class IpDictView(MetadataView):
                             # We require a BDC stub interface (used in the composable)
                             dcore = dparent
                             dst_port = target_port
+                            hier_name = dcore.hierarchy_name
                         else:
                             # We flatten the hierarchy as there are blocks within this module
                             dcore = None
@@ -85,109 +87,107 @@ class IpDictView(MetadataView):
                                     for d in p.destinations().values():
                                         if target_port.ref == d.ref:
                                             dcore = b
-                                            dcore.hierarchy_name = (
+                                            hier_name = (
                                                 f"{dparent.hierarchy_name}/{b.name}"
                                             )
                                             dst_port = p
 
                     if dcore is not None:
-                        repr_dict[dcore.hierarchy_name] = {}
+                        repr_dict[hier_name] = {}
 
                         # Special case the vlvn for empty BDC modules
                         if hasattr(dcore, "vlnv"):
-                            repr_dict[dcore.hierarchy_name]["type"] = dcore.vlnv.str
+                            repr_dict[hier_name]["type"] = dcore.vlnv.str
                         else:
-                            repr_dict[dcore.hierarchy_name][
+                            repr_dict[hier_name][
                                 "type"
                             ] = "xilinx.com:bdc:bdc:1.0"
 
-                        repr_dict[dcore.hierarchy_name]["mem_id"] = dst_port.name
-                        repr_dict[dcore.hierarchy_name]["memtype"] = "REGISTER"
-                        repr_dict[dcore.hierarchy_name]["gpio"] = {}
-                        repr_dict[dcore.hierarchy_name]["interrupts"] = {}
+                        repr_dict[hier_name]["mem_id"] = dst_port.name
+                        repr_dict[hier_name]["memtype"] = "REGISTER"
+                        repr_dict[hier_name]["gpio"] = {}
+                        repr_dict[hier_name]["interrupts"] = {}
 
                         for itr_sig in self._search_for_interrupts(dcore):
-                            repr_dict[dcore.hierarchy_name]["interrupts"][
+                            repr_dict[hier_name]["interrupts"][
                                 itr_sig.name
                             ] = {}
-                            repr_dict[dcore.hierarchy_name]["interrupts"][itr_sig.name][
+                            repr_dict[hier_name]["interrupts"][itr_sig.name][
                                 "controller"
                             ] = itr_sig.ext["interrupt_index"].controller
-                            repr_dict[dcore.hierarchy_name]["interrupts"][itr_sig.name][
+                            repr_dict[hier_name]["interrupts"][itr_sig.name][
                                 "index"
                             ] = itr_sig.ext["interrupt_index"].index
-                            repr_dict[dcore.hierarchy_name]["interrupts"][itr_sig.name][
+                            repr_dict[hier_name]["interrupts"][itr_sig.name][
                                 "fullpath"
-                            ] = f"{itr_sig.parent().parent().hierarchy_name}/{itr_sig.name}"
+                            ] = f"{hier_name}/{itr_sig.name}"
 
-                        repr_dict[dcore.hierarchy_name]["parameters"] = {}
-                        for param in dcore.parameters.values():
-                            repr_dict[dcore.hierarchy_name]["parameters"][
-                                param.name
-                            ] = param.value
-                        repr_dict[dcore.hierarchy_name]["registers"] = {}
+                        repr_dict[hier_name]["parameters"] = {}
+                        for name, value in dcore.parameters.raw_items():
+                            repr_dict[hier_name]["parameters"][name] = value
+                        repr_dict[hier_name]["registers"] = {}
 
-                        repr_dict[dcore.hierarchy_name]["driver"] = None
-                        repr_dict[dcore.hierarchy_name]["device"] = None
+                        repr_dict[hier_name]["driver"] = None
+                        repr_dict[hier_name]["device"] = None
                         if "driver" in dst_port.ext and isinstance(
                             dst_port.ext["driver"], DriverExtension
                         ):
-                            repr_dict[dcore.hierarchy_name]["driver"] = dst_port.ext[
+                            repr_dict[hier_name]["driver"] = dst_port.ext[
                                 "driver"
                             ].driver
-                            repr_dict[dcore.hierarchy_name]["device"] = dst_port.ext[
+                            repr_dict[hier_name]["device"] = dst_port.ext[
                                 "driver"
                             ].device
 
                         if not isinstance(dst_port.parent(), ProcSysCore):
                             for reg in dst_port.registers.values():
-                                repr_dict[dcore.hierarchy_name]["registers"][
+                                repr_dict[hier_name]["registers"][
                                     reg.name
                                 ] = {}
-                                repr_dict[dcore.hierarchy_name]["registers"][reg.name][
+                                repr_dict[hier_name]["registers"][reg.name][
                                     "address_offset"
                                 ] = reg.offset
-                                repr_dict[dcore.hierarchy_name]["registers"][reg.name][
+                                repr_dict[hier_name]["registers"][reg.name][
                                     "size"
                                 ] = reg.width
-                                repr_dict[dcore.hierarchy_name]["registers"][reg.name][
+                                repr_dict[hier_name]["registers"][reg.name][
                                     "access"
                                 ] = reg.access
-                                repr_dict[dcore.hierarchy_name]["registers"][reg.name][
+                                repr_dict[hier_name]["registers"][reg.name][
                                     "description"
                                 ] = reg.description
-                                repr_dict[dcore.hierarchy_name]["registers"][reg.name][
+                                repr_dict[hier_name]["registers"][reg.name][
                                     "fields"
                                 ] = {}
                                 for f in reg.bitfields.values():
-                                    repr_dict[dcore.hierarchy_name]["registers"][
+                                    repr_dict[hier_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name] = {}
-                                    repr_dict[dcore.hierarchy_name]["registers"][
+                                    repr_dict[hier_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name]["bit_offset"] = f.LSB
-                                    repr_dict[dcore.hierarchy_name]["registers"][
+                                    repr_dict[hier_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name]["bit_width"] = (
                                         f.MSB - f.LSB
                                     ) + 1
-                                    repr_dict[dcore.hierarchy_name]["registers"][
+                                    repr_dict[hier_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name]["access"] = f.access
-                                    repr_dict[dcore.hierarchy_name]["registers"][
+                                    repr_dict[hier_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name]["description"] = f.description
-                            repr_dict[dcore.hierarchy_name]["state"] = None
-                            repr_dict[dcore.hierarchy_name]["bdtype"] = None
-                            repr_dict[dcore.hierarchy_name][
+                            repr_dict[hier_name]["state"] = None
+                            repr_dict[hier_name]["bdtype"] = None
+                            repr_dict[hier_name][
                                 "phys_addr"
                             ] = dst_port.baseaddr
-                            repr_dict[dcore.hierarchy_name][
+                            repr_dict[hier_name][
                                 "addr_range"
                             ] = dst_port.range
-                            repr_dict[dcore.hierarchy_name][
+                            repr_dict[hier_name][
                                 "fullpath"
-                            ] = dcore.hierarchy_name
+                            ] = hier_name
 
         repr_dict[ps.hierarchy_name] = {}
         repr_dict[ps.hierarchy_name]["type"] = ps.vlnv.str
@@ -200,7 +200,7 @@ class IpDictView(MetadataView):
             repr_dict[ps.hierarchy_name]["driver"] = ps.ext["driver"].driver
             repr_dict[ps.hierarchy_name]["device"] = ps.ext["driver"].device
 
-        for param in ps.parameters.values():
-            repr_dict[ps.hierarchy_name]["parameters"][param.name] = param.value
+        for name, value in ps.parameters.raw_items():
+            repr_dict[ps.hierarchy_name]["parameters"][name] = value
 
         return repr_dict
@@ -34,9 +34,8 @@ class MemDictView(MetadataView):
         repr_dict = {}
 
         ps_core = None
-        for core in self._md.blocks.values():
-            if isinstance(core, ProcSysCore):
-                ps_core = core
+        for core in self._md.select(cls=ProcSysCore).values():
+            ps_core = core
 
         if ps_core is None:
             raise MetadataObjectNotFound(f"Unable to find a PS in {self._md.ref}")
@@ -68,10 +67,10 @@ class MemDictView(MetadataView):
                             repr_dict[dst_core.hierarchy_name]["gpio"] = {}
                             repr_dict[dst_core.hierarchy_name]["interrupts"] = {}
                             repr_dict[dst_core.hierarchy_name]["parameters"] = {}
-                            for param in dst_core.parameters.values():
+                            for name, value in dst_core.parameters.raw_items():
                                 repr_dict[dst_core.hierarchy_name]["parameters"][
-                                    param.name
-                                ] = param.value
+                                    name
+                                ] = value
                             repr_dict[dst_core.hierarchy_name]["registers"] = {}
                             for reg in subord_port.registers.values():
                                 repr_dict[dst_core.hierarchy_name]["registers"][
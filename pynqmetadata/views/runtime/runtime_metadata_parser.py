@@ -1,12 +1,12 @@
 # Copyright (C) 2022 Xilinx, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 
-import copy
 from typing import Dict
 
 from pynqmetadata import Module
 
 from .clock_dict_view import ClockDictView
+from .cow_dict_view import CowDictView
 from .gpio_dict_view import GpioDictView
 from .hierarchy_dict_view import HierarchyDictView
 from .interrupt_controllers_view import InterruptControllersView
@@ -31,7 +31,8 @@ class RuntimeMetadataParser:
     
     Views are dynamically updated as the underlying metadata is changed.
     However, this is not currently fully supported in the latest release of PYNQ, so one time
-    deep copies of these dictionaries are made. 
+    copies of these dictionaries are made. The copies are CowDictViews, each value is only
+    copied the first time it is read.
     """
 
     def __init__(self, md: Module) -> None:
@@ -54,22 +55,22 @@ class RuntimeMetadataParser:
         self.family_ps = self.ps.ps_name
 
         self.interrupt_controllers_view = InterruptControllersView(self.md)
-        self.interrupt_controllers = copy.deepcopy(self.interrupt_controllers_view.view)
+        self.interrupt_controllers = CowDictView(self.interrupt_controllers_view.view)
 
         self.interrupt_pins_view = InterruptPinsView(self.md, self.interrupt_controllers)
-        self.interrupt_pins = copy.deepcopy(self.interrupt_pins_view.view)
+        self.interrupt_pins = CowDictView(self.interrupt_pins_view.view)
 
         self.ip_dict_view = IpDictView(self.md)
-        self.ip_dict = copy.deepcopy(self.ip_dict_view.view)
+        self.ip_dict = CowDictView(self.ip_dict_view.view)
 
         self.gpio_dict_view = GpioDictView(self.md)
-        self.gpio_dict = copy.deepcopy(self.gpio_dict_view.view)
+        self.gpio_dict = CowDictView(self.gpio_dict_view.view)
 
         self.clock_dict_view = ClockDictView(self.md)
-        self.clock_dict = copy.deepcopy(self.clock_dict_view.clock_dict)
+        self.clock_dict = CowDictView(self.clock_dict_view.clock_dict)
 
         self.mem_dict_view = MemDictView(self.md)
-        self.mem_dict = copy.deepcopy(self.mem_dict_view.view)
+        self.mem_dict = CowDictView(self.mem_dict_view.view)
 
         self.hierarchy_dict_view = HierarchyDictView(
             module=self.md,
@@ -88,7 +89,13 @@ class RuntimeMetadataParser:
                 del self.ip_dict[item]
 
     def refresh_hierarchy_dict(self) -> None:
-        self.hierarchy_dict = copy.deepcopy(self.hierarchy_dict_view.view)
+        # The view embeds the entries of ip_dict and mem_dict, it is given
+        # snapshots of them so that the entries are copied along with the
+        # hierarchies that hold them rather than on every refresh
+        self.hierarchy_dict_view.set_sources(
+            self.ip_dict._snapshot(), self.mem_dict._snapshot()
+        )
+        self.hierarchy_dict = CowDictView(self.hierarchy_dict_view.view, shared=True)
         self.assign_gpio_to_ip()
         self.assign_interrupts_to_ip()
 
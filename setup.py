@@ -84,6 +84,7 @@ setup(  name='pynqmetadata',
         author_email='pynq_support@xilinx.com',
         packages=find_packages(),
         install_requires=required,
+        extras_require={"store": ["numpy"], "graph": ["numpy", "scipy"]},
         python_requires='>=3.8',
         package_data = {
             'pynqmetadata': pynq_metadata_files,